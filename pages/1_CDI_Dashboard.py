@@ -1,8 +1,13 @@
 import streamlit as st
 import pandas as pd
-from sklearn.decomposition import PCA
-from sklearn.preprocessing import StandardScaler
 import plotly.graph_objects as go
+from shared.bootstrap import bootstrap_pca_scores, percentile_bands
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.index_series import CDI_FEATURES, evaluate_index
+from shared.scenarios import scenario_panel
+from shared.charting import show_trend
+from shared.fragments import emit
+from shared.panel import STATE_CDI_FILE, latest_by_region, panel_available, region_cdi
 
 # === Streamlit Setup ===
 st.set_page_config(layout="wide")
@@ -11,79 +16,26 @@ st.title("Consumer Demand Index (CDI)")
 st.markdown('<p style="font-style: italic;">The Consumer Demand Index captures shifts in real-time consumer activity, helping forecast economic momentum through trends in spending, mobility, and energy use.</p>', unsafe_allow_html=True)
 
 # === Custom CSS for KPI Cards ===
-st.markdown("""
-<style>
-.kpi-container {
-    display: flex;
-    gap: 1rem;
-    flex-wrap: wrap;
-    margin-bottom: 1rem;
-}
-.kpi-card {
-    flex: 1;
-    padding: 1rem;
-    border-radius: 16px;
-    background: rgba(255, 255, 255, 0.08);
-    backdrop-filter: blur(12px);
-    -webkit-backdrop-filter: blur(12px);
-    color: white;
-    min-width: 200px;
-    border: 1px solid rgba(255, 255, 255, 0.15);
-    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
-}
-.kpi-title {
-    font-size: 1rem;
-    font-weight: 600;
-    margin-bottom: 0.3rem;
-    color: #ddd;
-}
-.kpi-value {
-    font-size: 1.8rem;
-    font-weight: bold;
-}
-.kpi-delta {
-    font-size: 1.2rem;
-    margin-top: 0.2rem;
-    font-weight: bold;
-}
-.bg-1 {
-    background: linear-gradient(#320019, #480024, #74003A);
-}
-.bg-2 {
-    background: linear-gradient(#D600D6, #920092, #760076);
-}
-.bg-3 {
-    background: linear-gradient(#6021DF, #7944E4, #A17CEC);
-}
-</style>
-""", unsafe_allow_html=True)
+emit("kpi_styles", bg1="#320019, #480024, #74003A", bg2="#D600D6, #920092, #760076", bg3="#6021DF, #7944E4, #A17CEC")
+
+# === Index Model ===
+model_choice = st.radio("Index Model", ['PCA (complete months)', 'Dynamic Factor (handles missing months)'], horizontal=True)
+use_dfm = model_choice.startswith('Dynamic')
 
-# === Load Data ===
-DEFAULT_DATA_PATH = "data/Consumer_Demand_Index.csv"
+# === Load Data & Compute Index ===
+# PCA on complete months; the dynamic factor (Kalman-filtered) also scores months with only some features published
+features = CDI_FEATURES
 try:
-    df = pd.read_csv(DEFAULT_DATA_PATH)
+    cdi = evaluate_index("Consumer Demand Index (CDI)", method="dfm" if use_dfm else "pca")
 except Exception as e:
     st.error(f"Error loading data: {e}")
     st.stop()
 
-df.columns = df.columns.str.strip()
-df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-df = df.dropna(subset=['Date'])
-
-features = ['UPI Transactions', 'GST Revenue', 'Vehicle Sales', 'Housing Sales', 'Power Consumption']
-if any(col not in df.columns for col in features):
-    st.error("Missing required feature columns.")
-    st.stop()
-
-df = df.dropna(subset=features)
-
-# === Compute PCA ===
-scaler_std = StandardScaler()
-scaled_features = scaler_std.fit_transform(df[features])
-pca = PCA(n_components=1)
-pca_components = pca.fit_transform(scaled_features)
+df = cdi["frame"].rename(columns={'Index': 'CDI_Real'})
+scaler_std, pca, dfm_result = cdi["model"]["scaler"], cdi["model"]["pca"], cdi["model"]["dfm"]
 
-df['CDI_Real'] = pca_components[:, 0]
+# Missing features contribute nothing to a month's breakdown
+scaled_features = pd.DataFrame(scaler_std.transform(df[features]), index=df.index, columns=features).fillna(0)
 df['CDI_Scaled'] = df['CDI_Real'].clip(-5, 5)
 df['Month'] = df['Date'].dt.strftime('%b-%Y')
 
@@ -97,6 +49,22 @@ def get_fiscal_quarter(date):
 
 df['Fiscal_Quarter'] = df['Date'].apply(get_fiscal_quarter)
 
+# === Bootstrap Confidence Bands ===
+# Cached on the feature matrix itself, so the resampling reruns only when the data changes
+@st.cache_data
+def load_cdi_bands(X, reference, quarters):
+    samples = bootstrap_pca_scores(X, reference)
+    return percentile_bands(samples), percentile_bands(samples, groups=quarters)
+
+if use_dfm:
+    # The state-space model carries its own uncertainty: 90% band from the smoothed variance
+    half_width = 1.645 * dfm_result['Smoothed_Std'].to_numpy()
+    cdi_bands = pd.DataFrame({'lower': df['CDI_Real'] - half_width, 'upper': df['CDI_Real'] + half_width}, index=df.index)
+    cdi_quarter_bands = cdi_bands.groupby(df['Fiscal_Quarter'], sort=False).mean()
+else:
+    cdi_bands, cdi_quarter_bands = load_cdi_bands(df[features].to_numpy(), pca.components_[0], df['Fiscal_Quarter'].to_numpy())
+    cdi_bands.index = df.index
+
 # === KPI-themed colors ===
 kpi_theme_colors = [
     'rgba(160, 102, 255, 0.9)',
@@ -148,6 +116,7 @@ if mode == 'Monthly':
     label_period = selected_month
     line_x = df_sorted['Date']
     line_y = df_sorted['CDI_Real']
+    line_band = cdi_bands.loc[df_sorted.index]
     line_title = "CDI Trend - Monthly"
     xaxis_title = "Month"
     xaxis_type = "date"
@@ -156,6 +125,7 @@ if mode == 'Monthly':
     # ✅ Add these two lines:
     selected_real = df_filtered['CDI_Real'].values[0]
     selected_scaled = df_filtered['CDI_Scaled'].values[0]
+    selected_band = cdi_bands.loc[selected_idx]
 
 else:
     quarters = sorted(df['Fiscal_Quarter'].unique())
@@ -167,6 +137,7 @@ else:
     label_period = selected_quarter
     line_x = quarter_df['Fiscal_Quarter']
     line_y = quarter_df['CDI_Real']
+    line_band = cdi_quarter_bands.loc[quarter_df['Fiscal_Quarter']]
     line_title = "CDI Trend - Quarterly"
     xaxis_title = "Fiscal Quarter"
     xaxis_type = "category"
@@ -175,6 +146,7 @@ else:
     # ✅ Add these two lines:
     selected_real = quarter_df[quarter_df['Fiscal_Quarter'] == selected_quarter]['CDI_Real'].values[0]
     selected_scaled = quarter_df[quarter_df['Fiscal_Quarter'] == selected_quarter]['CDI_Scaled'].values[0]
+    selected_band = cdi_quarter_bands.loc[selected_quarter]
 
 # === CDI Speedometer Gauge ===
 gauge_fig = go.Figure(go.Indicator(
@@ -182,7 +154,7 @@ gauge_fig = go.Figure(go.Indicator(
     value=selected_real,
     delta={'reference': 0, 'increasing': {'color': "green"}, 'decreasing': {'color': "red"}},
     number={'suffix': "", 'font': {'size': 36}},
-    title={'text': f"<b>Consumer Demand Index</b><br>{label_period}", 'font': {'size': 18}},
+    title={'text': f"<b>Consumer Demand Index</b><br>{label_period}<br><span style='font-size:12px'>90% band: {selected_band['lower']:.2f} to {selected_band['upper']:.2f}</span>", 'font': {'size': 18}},
     gauge={
         'axis': {'range': [-5, 5], 'tickwidth': 1, 'tickcolor': "darkgray"},
         'bar': {'color': "black", 'thickness': 0.3},
@@ -199,7 +171,8 @@ gauge_fig = go.Figure(go.Indicator(
             {'range': [1, 2], 'color': "#F795D1"},
             {'range': [2, 3], 'color': "#F062B8"},
             {'range': [3, 4], 'color': "#E0369F"},
-            {"range": [ 4,  5], "color": "#C3006A"}
+            {"range": [ 4,  5], "color": "#C3006A"},
+            {'range': [selected_band['lower'], selected_band['upper']], 'color': "rgba(255, 255, 255, 0.6)", 'thickness': 0.25}
         ],
         'threshold': {
             'line': {'color': "black", 'width': 4},
@@ -241,6 +214,23 @@ col1, col2 = st.columns(2)
 
 with col1:
     line_fig = go.Figure()
+    line_fig.add_trace(go.Scatter(
+        x=line_x,
+        y=line_band['upper'],
+        mode='lines',
+        line=dict(width=0),
+        hoverinfo='skip',
+        showlegend=False,
+    ))
+    line_fig.add_trace(go.Scatter(
+        x=line_x,
+        y=line_band['lower'],
+        mode='lines',
+        line=dict(width=0),
+        fill='tonexty',
+        fillcolor='rgba(160, 102, 255, 0.2)',
+        name='90% band',
+    ))
     line_fig.add_trace(go.Scatter(
         x=line_x,
         y=line_y,
@@ -248,6 +238,8 @@ with col1:
         name='CDI',
         line=dict(color=kpi_theme_colors[0], width=3),
     ))
+    if mode == 'Monthly':
+        add_forecast_traces(line_fig, load_forecasts("Consumer Demand Index (CDI)"), color=kpi_theme_colors[1])
     line_fig.update_layout(
         title=line_title,
         xaxis_title=xaxis_title,
@@ -257,21 +249,21 @@ with col1:
         height=400,
         margin=dict(l=40, r=40, t=50, b=40)
     )
-    st.plotly_chart(line_fig, use_container_width=True)
+    show_trend(line_fig, key="cdi-trend")
 
 with col2:
     st.markdown("### Contribution Breakdown")
     pca_weights = pca.components_[0]
 
     if mode == 'Monthly':
-        scaled_row = scaled_features[selected_idx]
+        scaled_row = scaled_features.loc[selected_idx].to_numpy()
         contrib_df = pd.DataFrame({
             'Feature': features,
             'Contribution': scaled_row * pca_weights
         })
     else:
         indices = df[df['Fiscal_Quarter'] == selected_quarter].index
-        avg_scaled = scaled_features[indices].mean(axis=0)
+        avg_scaled = scaled_features.loc[indices].mean(axis=0).to_numpy()
         contrib_df = pd.DataFrame({
             'Feature': features,
             'Contribution': avg_scaled * pca_weights
@@ -302,6 +294,42 @@ with col2:
 
     st.plotly_chart(pie_fig, use_container_width=True)
 
+# === State-level CDI ===
+st.markdown("### State-level CDI")
+if not panel_available():
+    st.info(f"State-level CDI needs a state panel at `{STATE_CDI_FILE}`: the CDI columns plus a State column, one row per state and month.")
+else:
+    state_table = latest_by_region()
+    st.dataframe(state_table.round(2), use_container_width=True)
+    state = st.selectbox("Drill down to state", state_table.index, key="cdi-state")
+    state_df = region_cdi(state)
+    if state_df.empty:
+        st.warning(f"{state} has too few complete months to score.")
+    else:
+        state_col1, state_col2 = st.columns(2)
+        with state_col1:
+            state_fig = go.Figure(go.Scatter(x=state_df['Date'], y=state_df['Index'], mode='lines',
+                                             name=state, line=dict(color=kpi_theme_colors[2], width=3)))
+            state_fig.update_layout(title=f"CDI Trend - {state}", xaxis_title="Month", yaxis_title="CDI",
+                                    height=400, margin=dict(l=40, r=40, t=50, b=40))
+            show_trend(state_fig, key="cdi-state-trend")
+        with state_col2:
+            state_month = st.selectbox("Month", state_df['Date'].dt.strftime('%b-%Y')[::-1], key="cdi-state-month")
+            state_row = state_df[state_df['Date'].dt.strftime('%b-%Y') == state_month].iloc[0]
+            state_pie = go.Figure(go.Pie(
+                labels=features, values=state_row[features].abs().to_numpy(dtype=float), hole=0.45,
+                textinfo='label+percent', marker=dict(colors=kpi_theme_colors, line=dict(color='black', width=0.8)),
+            ))
+            state_pie.update_traces(textposition='inside', textfont_size=14)
+            state_pie.update_layout(height=400, title_text=f"Contribution Breakdown: {state}, {state_month}",
+                                    margin=dict(l=30, r=30, t=40, b=30))
+            st.plotly_chart(state_pie, use_container_width=True)
+    st.caption("Each state is standardised and weighted on its own complete months, so state CDIs show each state against its own history.")
+
+# === What-if Scenarios ===
+with st.expander("🧪 What-if Scenarios"):
+    scenario_panel("Consumer Demand Index (CDI)", key="cdi-scenarios")
+
 # === Raw Data ===
 if st.checkbox("\U0001F50D Show raw data with CDI"):
     st.dataframe(df[['Date', 'Month', 'Fiscal_Quarter', 'CDI_Real', 'CDI_Scaled'] + features])
\ No newline at end of file
@@ -2,55 +2,30 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import streamlit.components.v1 as components
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.index_series import EV_FEATURES, evaluate_index
+from shared.charting import show_trend
+from shared.fragments import emit
+from shared.ev_index import EV_SEGMENTS, NATIONAL, ev_regions, load_penetration
 
 st.set_page_config(layout="wide")
 
 # === Load Data ===
-df = pd.read_csv("data/EV_Adoption.csv")
-df.columns = df.columns.str.strip()
-
-# === Parse Date ===
-df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
-df = df.dropna(subset=['Date'])
+df = evaluate_index("EV Market Adoption Rate")["frame"].rename(columns={'Index': 'EV Adoption Rate'})
 df['Month'] = df['Date'].dt.strftime('%b-%y')
 
-# === Clean & Convert Numeric Columns ===
-ev_cols = ['EV Four-wheeler Sales', 'EV Two-wheeler Sales', 'EV Three-wheeler Sales']
-for col in ev_cols:
-    df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
-
+ev_cols = EV_FEATURES
 vehicle_sales_cols = ["Passenger Vehicle Sales", "Two-wheeler Sales", "Three-wheeler Sales", "Commercial Vehicle Sales"]
-for col in vehicle_sales_cols:
-    df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
-
-df['Total Vehicle Sales'] = pd.to_numeric(df['Total Vehicle Sales'].astype(str).str.replace(',', ''), errors='coerce')
-df['Auto Loan Rate'] = df['Auto Loan Rate'].astype(str).str.replace('%', '').astype(float)
 
 # === Add Calculated Columns ===
 df['EV Total Sales'] = df['EV Four-wheeler Sales'] + df['EV Two-wheeler Sales'] + df['EV Three-wheeler Sales']
-df['EV Adoption Rate'] = df['EV Total Sales'] / df['Total Vehicle Sales']
 
 # === Header ===
 st.title("EV Market Adoption Rate")
 st.markdown("*The EV Market Adoption Rate represents the share of electric vehicles in total vehicle sales, indicating the extent of EV presence in the automotive market.*")
 
 # === KPI Styles ===
-kpi_style = """
-<style>
-.card {
-    padding: 1rem;
-    border-radius: 16px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    color: white;
-    font-weight: bold;
-    text-align: center;
-}
-.green-card { background: linear-gradient(#003300, #006600, #339933); }
-.grey-card { background: linear-gradient(#009900, #669900, #99CC00); }
-.red-card { background: linear-gradient(#CCCC00, #CC9900, #996600); }
-</style>
-"""
-st.markdown(kpi_style, unsafe_allow_html=True)
+emit("card_styles", green="#003300, #006600, #339933", grey="#009900, #669900, #99CC00", red="#CCCC00, #CC9900, #996600")
 
 # === KPIs ===
 latest_row = df.sort_values("Date").iloc[-1]
@@ -98,7 +73,7 @@ selected_total_sales = selected_row[vehicle_sales_cols]
 def wrapped_chart(title, figure):
     with st.container(border=True):
         st.markdown(f"**{title}**")
-        st.plotly_chart(figure, use_container_width=True)
+        show_trend(figure, key=title)
 
 # === Donut - Gauge - Donut Charts ===
 donut_left, gauge_col, donut_right = st.columns([2, 2.5, 2])
@@ -226,6 +201,8 @@ line_fig.add_trace(go.Scatter(
     name="EV Adoption Rate",
     hovertemplate="Date: %{x|%b %Y}<br>Rate: " + hover_format + "<extra></extra>"
 ))
+add_forecast_traces(line_fig, load_forecasts("EV Market Adoption Rate"),
+                    scale=100 if display_format == "Percentage" else 1.0, color="#99CC00")
 line_fig.update_layout(
     xaxis_title="Date",
     yaxis_title=y_title,
@@ -238,6 +215,51 @@ line_fig.update_layout(
 )
 wrapped_chart("EV Adoption Rate Over Time", line_fig)
 
+# === Penetration by Segment ===
+regions = ev_regions()
+region = st.selectbox("Region", regions, key="ev-region") if len(regions) > 1 else NATIONAL
+scale = 100 if display_format == "Percentage" else 1.0
+segment_df = load_penetration(region)
+
+seg_line_col, seg_bar_col = st.columns([3, 2])
+with seg_line_col:
+    segment_fig = go.Figure()
+    for segment, color in zip(EV_SEGMENTS, ["green", "#CCFF99", "#99FF33", "#66CC00"]):
+        rows = segment_df[segment_df["Segment"] == segment]
+        segment_fig.add_trace(go.Scatter(
+            x=rows["Date"], y=rows["Penetration"] * scale, mode="lines", name=segment, line=dict(color=color),
+            hovertemplate=segment + ": " + hover_format + "<extra></extra>",
+        ))
+    segment_fig.update_layout(
+        yaxis_title=y_title,
+        height=400,
+        margin=dict(l=50, r=30, t=40, b=30),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend=dict(orientation="h", y=-0.2, x=0.5, xanchor="center")
+    )
+    wrapped_chart(f"EV Penetration by Segment - {region}", segment_fig)
+with seg_bar_col:
+    month_df = load_penetration(region, date=selected_row["Date"])
+    bar_fig = go.Figure(go.Bar(
+        x=month_df["Segment"], y=month_df["Penetration"] * scale,
+        marker_color=["green", "#CCFF99", "#99FF33", "#66CC00"][:len(month_df)],
+        hovertemplate="%{x}: " + hover_format + "<extra></extra>",
+    ))
+    bar_fig.update_layout(
+        yaxis_title=y_title,
+        height=400,
+        margin=dict(l=50, r=30, t=40, b=30),
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+    )
+    with st.container(border=True):
+        st.markdown(f"**EV Penetration by Segment - {selected_month}**")
+        st.plotly_chart(bar_fig, use_container_width=True)
+st.caption("Each segment's EV sales over that segment's total sales: four-wheelers over passenger vehicles, "
+           "two- and three-wheelers over their own categories. EV three-wheelers include e-rickshaws, which "
+           "three-wheeler sales do not, so that share can exceed 100%.")
+
 # === Raw Data Toggle ===
 if st.checkbox("\U0001F9FE Show Raw Data"):
     st.dataframe(df[['Date', 'Month', 'EV Total Sales', 'Total Vehicle Sales', 'EV Adoption Rate']].sort_values("Date", ascending=False))
\ No newline at end of file
@@ -3,19 +3,25 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.imputation import imputed_summary
+from shared.feature_store import data_version
+from shared.index_series import evaluate_index
+from shared.housing_stress import N_PATHS, start_housing_stress
+from shared.charting import show_trend
+from shared.fragments import emit
 
 st.set_page_config(page_title="Housing Affordability Index", layout="wide")
 st.title("Housing Affordability Index Dashboard")
 st.markdown("*The Housing Affordability Index reflects how affordable residential property is for an average individual, using per capita income and property prices.*")
 
 # --- Load Data ---
+# Keyed on the data version, so a changed file is picked up without a restart
 @st.cache_data
-def load_data():
-    df = pd.read_csv("data/Housing_Affordability.csv")
-    df.columns = df.columns.str.strip()
-
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    df.dropna(subset=['Date'], inplace=True)
+def load_data(version):
+    housing = evaluate_index("Housing Affordability Stress Index")
+    df = housing["frame"].rename(columns={'Index': 'Affordability Index'})
+    df['Imputed'] = imputed_summary(housing["mask"])
 
     df['Month'] = df['Date'].dt.strftime('%b-%y')
 
@@ -25,22 +31,18 @@ def load_data():
         return f"{q} {fy}-{str(fy + 1)[-2:]}"
     df['QuarterFormatted'] = df.apply(format_quarter, axis=1)
 
-    df['Property Price Index'] = pd.to_numeric(df['Property Price Index'], errors='coerce')
-    df['Per Capita NNI'] = pd.to_numeric(df['Per Capita NNI'], errors='coerce')
-
-    LOAN_FACTOR = 0.003
-    df['Affordability Index'] = (df['Per Capita NNI'] / df['Property Price Index']) * LOAN_FACTOR
-
-    df.dropna(inplace=True)
     df = df.sort_values('Date')
     return df
 
-df = load_data()
+df = load_data(data_version("data/*.csv"))
 
 if df is None or df.empty:
     st.warning("⚠️ No valid data available. Please check your CSV.")
     st.stop()
 
+# Stress simulation runs in the background while the rest of the page renders
+stress_job = start_housing_stress(st.session_state.get("rate-shock", 0.0))
+
 # --- Latest KPIs ---
 latest_row = df.iloc[-1]
 latest_month = latest_row['Month']
@@ -48,22 +50,7 @@ latest_quarter = latest_row['QuarterFormatted']
 latest_index = latest_row['Affordability Index']
 latest_price = latest_row['Property Price Index']
 
-kpi_style = """
-<style>
-.card {
-    padding: 1rem;
-    border-radius: 16px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    color: white;
-    font-weight: bold;
-    text-align: center;
-}
-.green-card { background: linear-gradient(#7A0000, #960000, #B40000); }
-.grey-card { background: linear-gradient(#DA0000, #EE0000, #F23212); }
-.red-card { background: linear-gradient(#F34629, #F55E45, #F6725C); }
-</style>
-"""
-st.markdown(kpi_style, unsafe_allow_html=True)
+emit("card_styles", green="#7A0000, #960000, #B40000", grey="#DA0000, #EE0000, #F23212", red="#F34629, #F55E45, #F6725C")
 
 col1, col2, col3 = st.columns(3)
 
@@ -91,6 +78,9 @@ with col3:
         </div>
     """, unsafe_allow_html=True)
 
+if latest_row['Imputed']:
+    st.caption(f"Latest month uses imputed values for: {latest_row['Imputed']}")
+
 # --- Preview Type ---
 preview_type = st.selectbox("Preview Type", ["Monthly", "Quarterly"])
 period_list = df['Month'].unique().tolist() if preview_type == "Monthly" else df['QuarterFormatted'].unique().tolist()
@@ -161,14 +151,47 @@ st.markdown(f"""
 st.subheader("Affordability Index Over Time")
 fig_line = px.line(df, x='Month', y='Affordability Index', markers=False,
                    line_shape='linear', color_discrete_sequence=['#FF5733'])
+housing_forecast = load_forecasts("Housing Affordability Stress Index")
+add_forecast_traces(fig_line, housing_forecast, x=housing_forecast['Date'].dt.strftime('%b-%y'), color='#F6725C')
 fig_line.update_layout(
     paper_bgcolor='rgba(0,0,0,0)',
     plot_bgcolor='rgba(0,0,0,0)',
     font_color='white',
     height=450
 )
-st.plotly_chart(fig_line, use_container_width=True)
+show_trend(fig_line, key="housing-trend")
+
+# --- Stress Test Fan Chart ---
+st.subheader("Affordability Stress Test")
+st.slider("Loan rate shock (percentage points)", -2.0, 3.0, 0.0, 0.25, key="rate-shock")
+with st.spinner("Simulating affordability paths..."):
+    fan = stress_job.result()
+
+recent = df[df['Date'] > df['Date'].max() - pd.DateOffset(months=36)]
+fig_fan = go.Figure()
+fig_fan.add_trace(go.Scatter(x=recent['Date'], y=recent['Affordability Index'], mode='lines',
+                             name='Affordability Index', line=dict(color='#FF5733')))
+for lo, hi, alpha in [('P5', 'P95', 0.15), ('P25', 'P75', 0.3)]:
+    fig_fan.add_trace(go.Scatter(x=fan['Date'], y=fan[hi], mode='lines', line=dict(width=0),
+                                 showlegend=False, hoverinfo='skip'))
+    fig_fan.add_trace(go.Scatter(x=fan['Date'], y=fan[lo], mode='lines', line=dict(width=0),
+                                 fill='tonexty', fillcolor=f'rgba(246, 114, 92, {alpha})',
+                                 name=f"{lo[1:]}–{hi[1:]}% of paths"))
+fig_fan.add_trace(go.Scatter(x=fan['Date'], y=fan['P50'], mode='lines', name='Median path',
+                             line=dict(color='#F6725C', dash='dash')))
+fig_fan.update_layout(
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font_color='white',
+    height=450
+)
+st.plotly_chart(fig_fan, use_container_width=True)
+st.caption(
+    f"{N_PATHS:,} simulated paths of income, property prices and the housing loan rate, resampled in blocks "
+    f"from history. In {fan['Date'].iloc[-1].strftime('%b-%y')}, {fan['Below Today (%)'].iloc[-1]:.0f}% of paths "
+    f"end less affordable than {latest_month}."
+)
 
 # --- Data Table ---
 with st.expander("🔍 View Underlying Data Table"):
-    st.dataframe(df[['Month', 'QuarterFormatted', 'Affordability Index', 'Property Price Index', 'Per Capita NNI']])
\ No newline at end of file
+    st.dataframe(df[['Month', 'QuarterFormatted', 'Affordability Index', 'Property Price Index', 'Per Capita NNI', 'Imputed']])
\ No newline at end of file
@@ -3,36 +3,32 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit.components.v1 as components
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.index_series import RENEWABLE_CONSTANTS, evaluate_index
+from shared.sensitivity import load_renewable_sensitivity
+from shared.charting import show_trend
+from shared.fragments import emit
 
 st.set_page_config(page_title="Renewable Readiness Score", layout="wide")
 st.title("Renewable Transition Readiness Score")
 st.markdown("*The Renewable Transition Readiness Score is a composite index measuring how prepared India is for clean energy adoption, based on MNRE investment and the share of renewables in total power consumption.*")
 
+# --- Assumptions ---
+# Overrides only recompute the generation, share and score columns downstream of them
+with st.expander("⚙️ Capacity Factor Assumptions"):
+    cf_cols = st.columns(3)
+    overrides = {
+        key: cf_col.number_input(label, 0.05, 0.95, RENEWABLE_CONSTANTS[key], 0.01, key=key)
+        for cf_col, (key, label) in zip(cf_cols, [("CF_SOLAR", "Solar CF"), ("CF_WIND", "Wind CF"), ("CF_HYDRO", "Hydro CF")])
+    }
+
 # --- Load Data ---
-@st.cache_data
-def load_data():
+def load_data(overrides):
     try:
-        df = pd.read_csv("data/Renewable_Energy.csv")
+        df = evaluate_index("Renewable Transition Readiness Score", **overrides)["frame"]
     except FileNotFoundError:
         st.error("❌ Could not find 'data/Renewable_Energy.csv'. Make sure it's in the correct folder.")
         return None
-    df.columns = df.columns.str.strip()
-
-    expected_cols = [
-        'Date',
-        'Solar power plants Installed capacity',
-        'Wind power plants Installed capacity',
-        'Hydro power plants Installed capacity',
-        'Budgetary allocation for MNRE sector',
-        'Power Consumption'
-    ]
-    for col in expected_cols:
-        if col not in df.columns:
-            st.error(f"❌ Missing column: `{col}`")
-            return None
-
-    df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
-    df.dropna(subset=['Date'], inplace=True)
 
     df['Month'] = df['Date'].dt.strftime('%b-%y')
 
@@ -42,42 +38,10 @@ def load_data():
         return f"{q} {fy}-{str(fy + 1)[-2:]}"
     df['QuarterFormatted'] = df.apply(format_quarter, axis=1)
 
-    for col in expected_cols[1:]:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-    df.dropna(inplace=True)
-
-    # --- Calculate Actual Renewable Generation using Capacity Factors ---
-    HOURS_PER_MONTH = 720
-    CF_SOLAR = 0.2
-    CF_WIND = 0.3
-    CF_HYDRO = 0.4
-
-    df['Solar Generation (GWh)'] = df['Solar power plants Installed capacity'] * CF_SOLAR * HOURS_PER_MONTH / 1000
-    df['Wind Generation (GWh)'] = df['Wind power plants Installed capacity'] * CF_WIND * HOURS_PER_MONTH / 1000
-    df['Hydro Generation (GWh)'] = df['Hydro power plants Installed capacity'] * CF_HYDRO * HOURS_PER_MONTH / 1000
-
-    df['Total Renewable Generation (GWh)'] = (
-        df['Solar Generation (GWh)'] +
-        df['Wind Generation (GWh)'] +
-        df['Hydro Generation (GWh)']
-    )
-
-    df['Power Consumption (GWh)'] = df['Power Consumption'] * 1000
-
-    df['Renewable Share (%)'] = (df['Total Renewable Generation (GWh)'] / df['Power Consumption (GWh)']) * 100
-
-    df['Norm_Budget'] = (df['Budgetary allocation for MNRE sector'] - df['Budgetary allocation for MNRE sector'].min()) / (
-        df['Budgetary allocation for MNRE sector'].max() - df['Budgetary allocation for MNRE sector'].min()
-    )
-    df['Norm_Share'] = (df['Renewable Share (%)'] - df['Renewable Share (%)'].min()) / (
-        df['Renewable Share (%)'].max() - df['Renewable Share (%)'].min()
-    )
-    df['Readiness Score'] = 0.5 * df['Norm_Budget'] + 0.5 * df['Norm_Share']
-
     df = df.sort_values('Date')
     return df
 
-df = load_data()
+df = load_data(overrides)
 if df is None or df.empty:
     st.warning("⚠️ No valid data available. Please check your CSV.")
     st.stop()
@@ -90,22 +54,7 @@ latest_score = latest_row['Readiness Score']
 latest_consumption = latest_row['Power Consumption']
 
 # --- KPI Cards with HTML ---
-kpi_style = """
-<style>
-.card {
-    padding: 1rem;
-    border-radius: 16px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    color: white;
-    font-weight: bold;
-    text-align: center;
-}
-.green-card { background: linear-gradient(#024643, #035955, #047E78); }
-.grey-card { background: linear-gradient(#059F98, #06BAB1, #08EEE3); }
-.red-card { background: linear-gradient(#08EEE3, #66D7FA, #9AE5FC); }
-</style>
-"""
-st.markdown(kpi_style, unsafe_allow_html=True)
+emit("card_styles", green="#024643, #035955, #047E78", grey="#059F98, #06BAB1, #08EEE3", red="#08EEE3, #66D7FA, #9AE5FC")
 
 col1, col2, col3 = st.columns(3)
 
@@ -225,16 +174,58 @@ st.markdown(f"""
 
 # === Line Chart ===
 st.subheader("Readiness Score Over Time")
+sampling = st.radio("Assumption sampling", ["Latin hypercube", "Grid"], horizontal=True)
+sensitivity = load_renewable_sensitivity("grid" if sampling == "Grid" else "lhs")
+bands = sensitivity["bands"]
+
 fig_score = px.line(df, x='Month', y='Readiness Score', markers=False,
                     line_shape='linear',
                     color_discrete_sequence=['#047E78'])
+# 5th-95th percentile of the score across the sampled capacity factors and blend weights
+band_x = bands['Date'].dt.strftime('%b-%y')
+fig_score.add_trace(go.Scatter(x=band_x, y=bands['upper'], mode='lines', line=dict(width=0),
+                               showlegend=False, hoverinfo='skip'))
+fig_score.add_trace(go.Scatter(x=band_x, y=bands['lower'], mode='lines', line=dict(width=0),
+                               fill='tonexty', fillcolor='rgba(8, 238, 227, 0.15)',
+                               name='Assumption range (5–95%)'))
+renewable_forecast = load_forecasts("Renewable Transition Readiness Score")
+add_forecast_traces(fig_score, renewable_forecast, x=renewable_forecast['Date'].dt.strftime('%b-%y'), color='#08EEE3')
 fig_score.update_layout(
     paper_bgcolor='rgba(0,0,0,0)',
     plot_bgcolor='rgba(0,0,0,0)',
     font_color='white',
     height=450
 )
-st.plotly_chart(fig_score, use_container_width=True)
+show_trend(fig_score, key="renewable-trend")
+
+# === Tornado Chart ===
+st.subheader("Assumption Sensitivity")
+swing = sensitivity["tornado"]
+base_score = swing['Base Score'].iloc[0]
+fig_tornado = go.Figure([
+    go.Bar(y=swing['Parameter'], x=swing['Low Score'] - base_score, base=base_score, orientation='h',
+           name='Low end of range', marker_color='#66D7FA',
+           customdata=swing[['Low', 'Low Score']].to_numpy(),
+           hovertemplate='%{y} = %{customdata[0]}<br>Score %{customdata[1]:.3f}<extra></extra>'),
+    go.Bar(y=swing['Parameter'], x=swing['High Score'] - base_score, base=base_score, orientation='h',
+           name='High end of range', marker_color='#047E78',
+           customdata=swing[['High', 'High Score']].to_numpy(),
+           hovertemplate='%{y} = %{customdata[0]}<br>Score %{customdata[1]:.3f}<extra></extra>'),
+])
+fig_tornado.update_layout(
+    barmode='overlay',
+    xaxis_title=f"Readiness Score ({latest_month})",
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font_color='white',
+    height=350
+)
+st.plotly_chart(fig_tornado, use_container_width=True)
+st.caption(
+    f"Each bar moves one assumption across its range with the others at their defaults. "
+    f"Bands use {sensitivity['n_samples']:,} parameter combinations. Generation uses the actual "
+    f"hours in each month."
+)
 
 # === Data Table ===
 with st.expander("🔍 View Underlying Data Table"):
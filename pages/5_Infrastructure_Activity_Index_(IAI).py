@@ -3,71 +3,37 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit.components.v1 as components
-import os
-from sklearn.linear_model import LinearRegression
-from sklearn.preprocessing import MinMaxScaler
+from shared.bootstrap import bootstrap_regression_scores, percentile_bands
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.imputation import imputed_summary
+from shared.feature_store import data_version
+from shared.index_series import IAI_FEATURES, IAI_TARGET, evaluate_index
+from shared.charting import show_trend
+from shared.fragments import emit
 
 st.set_page_config(page_title="Infrastructure Activity Index (IAI)", layout="wide")
 st.title("Infrastructure Activity Index (IAI)")
 st.markdown("*The Infrastructure Activity Index (IAI) tracks the pace of India’s infrastructure development by synthesizing key construction and investment trends.*")
+# Regression-Based Weights
+idv_cols = IAI_FEATURES
+target_col = IAI_TARGET
+
 # --- Load Data ---
+# Keyed on the data version, so a changed file is picked up without a restart
 @st.cache_data
-def load_data():
-    file_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'Infrastructure_Activity.csv')
-
+def load_data(version):
     try:
-        df = pd.read_csv(file_path)
+        iai = evaluate_index("Infrastructure Activity Index (IAI)")
     except FileNotFoundError:
         st.error("❌ Could not find the CSV file. Check the path: data/Infrastructure_Activity.csv")
         return None
 
-    df.columns = df.columns.str.strip()
-
-    expected_cols = [
-        "Date",
-        "Highway construction actual",
-        "Railway line construction actual",
-        "Power T&D line constr (220KV plus)",
-        "Cement price",
-        "GVA: construction (Basic Price)",
-        "Budgetary allocation for infrastructure sector"
-    ]
-
-    for col in expected_cols:
-        if col not in df.columns:
-            st.error(f"❌ Missing column: `{col}`")
-            return None
-
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    df.dropna(subset=['Date'], inplace=True)
+    # Regression weights are fitted on fully observed months only; imputed months are scored with them
+    df = iai["frame"].rename(columns={'Index': 'IAI'})
+    df['Imputed'] = imputed_summary(iai["mask"])
+    df['Fit Row'] = iai["model"]["fit_rows"]
     df['Month'] = df['Date'].dt.strftime('%b-%y')
 
-    for col in expected_cols[1:]:
-        df[col] = pd.to_numeric(df[col], errors='coerce')
-
-    df.dropna(inplace=True)
-
-    # Regression-Based Weights
-    idv_cols = [
-        "Highway construction actual",
-        "Railway line construction actual",
-        "Power T&D line constr (220KV plus)",
-        "Cement price",
-        "Budgetary allocation for infrastructure sector"
-    ]
-    target_col = "GVA: construction (Basic Price)"
-
-    scaler = MinMaxScaler()
-    X_scaled = scaler.fit_transform(df[idv_cols])
-    X = pd.DataFrame(X_scaled, columns=idv_cols)
-    y = df[target_col].values
-
-    model = LinearRegression()
-    model.fit(X, y)
-    weights = model.coef_ / model.coef_.sum()
-
-    df['IAI'] = X.dot(weights)
-
     def get_fiscal_quarter_label(date):
         month = date.month
         year = date.year
@@ -92,33 +58,31 @@ def load_data():
     return df
 
 # --- Load Data ---
-df = load_data()
+df = load_data(data_version("data/*.csv"))
 if df is None or df.empty:
     st.warning("⚠️ No valid data available. Please check your CSV file.")
     st.stop()
 
+# --- Bootstrap Confidence Bands ---
+@st.cache_data
+def load_iai_bands(X, y, X_score, months, quarters):
+    samples = bootstrap_regression_scores(X, y, X_score=X_score)
+    return percentile_bands(samples, groups=months), percentile_bands(samples, groups=quarters)
+
+fit_df = df[df['Fit Row']]
+iai_month_bands, iai_quarter_bands = load_iai_bands(
+    fit_df[idv_cols].to_numpy(), fit_df[target_col].to_numpy(), df[idv_cols].to_numpy(),
+    df['Month'].to_numpy(), df['Fiscal Quarter'].to_numpy()
+)
+
 # --- KPI Display ---
 latest_row = df.iloc[-1]
 latest_month = latest_row['Month']
 latest_score = latest_row['IAI']
-latest_gva = latest_row['GVA: construction (Basic Price)']
+# GVA is the regression target and is never imputed; show the latest published value
+latest_gva = df[target_col].dropna().iloc[-1]
 
-kpi_style = """
-<style>
-.card {
-    padding: 1rem;
-    border-radius: 16px;
-    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
-    color: white;
-    font-weight: bold;
-    text-align: center;
-}
-.green-card { background: linear-gradient(#453717, #624E20, #82672A); }
-.grey-card { background: linear-gradient(#A78437, #C49E4D, #D4AF37); }
-.red-card { background: linear-gradient(#DD9E4B, #D9B84F, #E0C56E); }
-</style>
-"""
-st.markdown(kpi_style, unsafe_allow_html=True)
+emit("card_styles", green="#453717, #624E20, #82672A", grey="#A78437, #C49E4D, #D4AF37", red="#DD9E4B, #D9B84F, #E0C56E")
 
 col1, col2, col3 = st.columns(3)
 with col1:
@@ -143,6 +107,9 @@ with col3:
         </div>
     """, unsafe_allow_html=True)
 
+if latest_row['Imputed']:
+    st.caption(f"Latest month uses imputed values for: {latest_row['Imputed']}")
+
 # --- View Selector ---
 st.markdown("---")
 st.subheader("View Mode")
@@ -155,6 +122,7 @@ if view_type == "Monthly":
     selected_month = st.selectbox("Select Month", month_options, index=month_options.index(default_month))
     filtered = df[df['Month'] == selected_month]
     display_label = selected_month
+    selected_band = iai_month_bands.loc[selected_month]
 else:
     quarter_options = df['Fiscal Quarter'].unique().tolist()
     default_quarter = df['Fiscal Quarter'].iloc[-1]
@@ -162,6 +130,7 @@ else:
     filtered = df[df['Fiscal Quarter'] == selected_quarter]
     filtered = filtered.mean(numeric_only=True).to_frame().T
     display_label = selected_quarter
+    selected_band = iai_quarter_bands.loc[selected_quarter]
 
 if filtered.empty:
     st.warning("⚠️ No data found for selected time period.")
@@ -190,11 +159,12 @@ with col1:
                 {'range': [0.4, 0.6], 'color': "#82672A"},
                 {'range': [0.6, 0.8], 'color': "#624E20"},
                 {'range': [0.8, 1.0], 'color': "#453717"},
+                {'range': [selected_band['lower'], selected_band['upper']], 'color': "rgba(255, 255, 255, 0.6)", 'thickness': 0.25},
             ]
         }
     ))
     fig_gauge.update_layout(height=400, paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)')
-    wrapped_chart(f"IAI Gauge – {display_label}", fig_gauge)
+    wrapped_chart(f"IAI Gauge – {display_label} (90% band: {selected_band['lower']:.2f} to {selected_band['upper']:.2f})", fig_gauge)
 
 # Chart #3 – Scatter: IAI vs GVA
 with col2:
@@ -239,17 +209,26 @@ st.markdown(f"""
 st.subheader("IAI Over Time")
 if view_type == "Monthly":
     fig_line = px.line(df, x='Month', y='IAI', markers=False, line_shape='linear', color_discrete_sequence=['#A78437'])
+    band_x, line_band = df['Month'], iai_month_bands.loc[df['Month']]
 else:
     df_q = df.groupby('Fiscal Quarter').mean(numeric_only=True).reset_index()
     fig_line = px.line(df_q, x='Fiscal Quarter', y='IAI', markers=True, line_shape='linear', color_discrete_sequence=['#A78437'])
+    band_x, line_band = df_q['Fiscal Quarter'], iai_quarter_bands.loc[df_q['Fiscal Quarter']]
+
+fig_line.add_trace(go.Scatter(x=band_x, y=line_band['upper'], mode='lines', line=dict(width=0), hoverinfo='skip', showlegend=False))
+fig_line.add_trace(go.Scatter(x=band_x, y=line_band['lower'], mode='lines', line=dict(width=0), fill='tonexty',
+                              fillcolor='rgba(167, 132, 55, 0.25)', name='90% band'))
+if view_type == "Monthly":
+    iai_forecast = load_forecasts("Infrastructure Activity Index (IAI)")
+    add_forecast_traces(fig_line, iai_forecast, x=iai_forecast['Date'].dt.strftime('%b-%y'), color='#E0C56E')
 
 fig_line.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', font_color='white', height=450)
-st.plotly_chart(fig_line, use_container_width=True)
+show_trend(fig_line, key="iai-trend")
 
 # --- Data Table ---
 with st.expander("🔍 View Underlying Data Table"):
     st.dataframe(df[[ 
         'Month', 'Highway construction actual', 'Railway line construction actual',
         'Power T&D line constr (220KV plus)', 'Cement price',
-        'GVA: construction (Basic Price)', 'Budgetary allocation for infrastructure sector', 'IAI'
+        'GVA: construction (Basic Price)', 'Budgetary allocation for infrastructure sector', 'IAI', 'Imputed'
     ]])
\ No newline at end of file
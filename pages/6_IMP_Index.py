@@ -2,45 +2,14 @@ import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
 import os
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.charting import show_trend
+from shared.fragments import emit
 
 st.set_page_config(layout="wide")
 
 # === KPI Styling ===
-st.markdown("""
-<style>
-.kpi-container {
-    display: flex;
-    gap: 1rem;
-    flex-wrap: wrap;
-    margin-bottom: 1rem;
-}
-.kpi-card {
-    flex: 1;
-    padding: 1rem;
-    border-radius: 16px;
-    background: rgba(255, 255, 255, 0.08);
-    backdrop-filter: blur(12px);
-    -webkit-backdrop-filter: blur(12px);
-    color: white;
-    min-width: 200px;
-    border: 1px solid rgba(255, 255, 255, 0.15);
-    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
-}
-.kpi-title {
-    font-size: 1rem;
-    font-weight: 600;
-    margin-bottom: 0.3rem;
-    color: #ddd;
-}
-.kpi-value {
-    font-size: 1.8rem;
-    font-weight: bold;
-}
-.bg-1 { background: linear-gradient(#1C2740, #2E416C, #6D87C1); }
-.bg-2 { background: linear-gradient(135deg, #0f2027, #203a43, #2c5364); }
-.bg-3 { background: linear-gradient(135deg, #134E5E, #71B280); }
-</style>
-""", unsafe_allow_html=True)
+emit("kpi_styles", bg1="#1C2740, #2E416C, #6D87C1", bg2="135deg, #0f2027, #203a43, #2c5364", bg3="135deg, #134E5E, #71B280")
 
 st.title("IMP Index Dashboard")
 st.markdown("*India’s Macroeconomic Performance (IMP) Index measures India's overall economic well-being based on multiple macro indicators.*")
@@ -140,7 +109,7 @@ else:
 def chart_wrapper(fig, title=None):
     if title:
         st.markdown(f"#### {title}")
-    st.plotly_chart(fig, use_container_width=True)
+    show_trend(fig, key=title or "imp-chart")
 
 # === Gauge Chart ===
 gauge_fig = go.Figure(go.Indicator(
@@ -254,6 +223,8 @@ line_fig = go.Figure(go.Scatter(
     hovertemplate="Date: %{x}<br>IMP Index: %{y:.2f}<extra></extra>",
     showlegend=False
 ))
+if mode == "Monthly":
+    add_forecast_traces(line_fig, load_forecasts("IMP Index"), color="#AED9E0")
 line_fig.update_layout(
     height=400,
     xaxis_title="Date",
@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from sklearn.preprocessing import StandardScaler
-from sklearn.decomposition import PCA
 import numpy as np
+from shared.bootstrap import bootstrap_pca_scores, percentile_bands
+from shared.charting import show_trend
+from shared.forecasting import load_forecasts, add_forecast_traces
+from shared.imputation import imputed_summary
+from shared.index_series import RETAIL_FEATURES, RETAIL_TRAINING_END, evaluate_index
+from shared.scenarios import scenario_panel
 
 # === Set up page ===
 st.set_page_config(layout="wide")
@@ -11,11 +15,12 @@ st.title("Retail Health Index Dashboard")
 st.markdown("*The Retail Health Index reflects the overall economic environment influencing retail activity, combining key macro-financial indicators that impact retail performance.*")
 
 # === Load and Clean Data ===
-df = pd.read_csv("data/Retail_Health.csv")
-df.columns = df.columns.str.strip()
-df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-df = df.dropna(subset=['Date'])
-df['Month'] = df['Date'].dt.strftime('%b-%y')
+# Sign flips for inflation and repo rate, gap-filling and the PCA fit are declared in INDEX_REGISTRY
+numeric_cols = RETAIL_FEATURES
+retail = evaluate_index("Retail Health Index")
+df_clean = retail["frame"].rename(columns={'Index': 'Retail Index'})
+df_clean['Imputed'] = imputed_summary(retail["mask"])
+df_clean['Month'] = df_clean['Date'].dt.strftime('%b-%y')
 
 # --- Create Indian Fiscal Quarters ---
 def get_fiscal_quarter(date):
@@ -35,33 +40,30 @@ def get_fiscal_quarter(date):
         fy = f"{year - 1}-{str(year)[-2:]}"
     return f"{qtr} {fy}"
 
-df['Quarter'] = df['Date'].apply(get_fiscal_quarter)
+df_clean['Quarter'] = df_clean['Date'].apply(get_fiscal_quarter)
 
-# Clean numeric columns
-numeric_cols = ['CCI', 'Inflation', 'Private Consumption', 'UPI Transactions', 'Repo Rate', 'Per Capita NNI']
-for col in numeric_cols:
-    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-# Adjust directionality for negative indicators
-df['Inflation'] = -df['Inflation']
-df['Repo Rate'] = -df['Repo Rate']
-
-df_clean = df.dropna(subset=numeric_cols).copy()
-
-# === PCA Index Calculation ===
-training_end = pd.to_datetime("2024-03-01")
+# === PCA Index ===
+training_end = RETAIL_TRAINING_END
 df_train = df_clean[df_clean['Date'] <= training_end].copy()
-
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(df_train[numeric_cols])
-pca = PCA(n_components=1)
-train_index = pca.fit_transform(X_train_scaled)
-
-X_all_scaled = scaler.transform(df_clean[numeric_cols])
-df_clean['Retail Index Raw'] = pca.transform(X_all_scaled)
-min_val, max_val = train_index.min(), train_index.max()
-df_clean['Retail Index'] = (df_clean['Retail Index Raw'] - min_val) / (max_val - min_val)
-df_clean['Retail Index'] = df_clean['Retail Index'].clip(0, 1)
+pca = retail["model"]["pca"]
+
+# === Bootstrap Confidence Bands ===
+# Each replicate refits on resampled training months and is rescaled against its own training range
+@st.cache_data
+def load_retail_bands(X_train, X_all, reference, train_mask):
+    raw = bootstrap_pca_scores(X_train, reference, X_score=X_all)
+    train_raw = raw[:, train_mask]
+    lo = train_raw.min(axis=1, keepdims=True)
+    hi = train_raw.max(axis=1, keepdims=True)
+    return percentile_bands(np.clip((raw - lo) / (hi - lo), 0, 1))
+
+retail_bands = load_retail_bands(
+    df_train[numeric_cols].to_numpy(),
+    df_clean[numeric_cols].to_numpy(),
+    pca.components_[0],
+    (df_clean['Date'] <= training_end).to_numpy()
+)
+retail_bands.index = df_clean.index
 
 # === KPI Cards (Latest Overall) ===
 latest = df_clean.sort_values("Date").iloc[-1]
@@ -77,6 +79,9 @@ with col3:
     with st.container(border=True):
         st.metric("Quarter", latest["Quarter"])
 
+if latest['Imputed']:
+    st.caption(f"Latest month uses imputed values for: {latest['Imputed']}")
+
 # === View Selection ===
 view_option = st.radio("View Mode", ["Monthly", "Quarterly"], horizontal=True)
 
@@ -95,6 +100,7 @@ if filtered_df.empty:
     st.stop()
 
 selected_latest = filtered_df.sort_values("Date").iloc[-1]
+selected_band = retail_bands.loc[selected_latest.name] * 100
 
 # === Chart Wrapper ===
 def chart_wrapper(title, figure):
@@ -117,9 +123,10 @@ with col_gauge:
                 {'range': [0, 40], 'color': "crimson"},
                 {'range': [40, 70], 'color': "gold"},
                 {'range': [70, 100], 'color': "lightgreen"},
+                {'range': [selected_band['lower'], selected_band['upper']], 'color': "rgba(255, 255, 255, 0.6)", 'thickness': 0.25},
             ],
         },
-        title={'text': f"Retail Index - {selected_period}"}
+        title={'text': f"Retail Index - {selected_period}<br><span style='font-size:12px'>90% band: {selected_band['lower']:.1f}% to {selected_band['upper']:.1f}%</span>"}
     ))
     gauge.update_layout(height=350)
     chart_wrapper("Retail Index Gauge", gauge)
@@ -168,6 +175,23 @@ st.markdown(f"""
 # === Trend Line ===
 st.markdown("### Index Over Time")
 trend = go.Figure()
+trend.add_trace(go.Scatter(
+    x=df_clean['Date'],
+    y=retail_bands['upper'],
+    mode='lines',
+    line=dict(width=0),
+    hoverinfo='skip',
+    showlegend=False
+))
+trend.add_trace(go.Scatter(
+    x=df_clean['Date'],
+    y=retail_bands['lower'],
+    mode='lines',
+    line=dict(width=0),
+    fill='tonexty',
+    fillcolor='rgba(0, 191, 255, 0.2)',
+    name='90% band'
+))
 trend.add_trace(go.Scatter(
     x=df_clean['Date'],
     y=df_clean['Retail Index'],
@@ -175,14 +199,19 @@ trend.add_trace(go.Scatter(
     name='Retail Index',
     line=dict(color='deepskyblue')
 ))
+add_forecast_traces(trend, load_forecasts("Retail Health Index"), color='lightgreen')
 trend.update_layout(
     xaxis_title='Date',
     yaxis_title='Retail Index (0–1)',
     template='plotly_white',
     height=400
 )
-st.plotly_chart(trend, use_container_width=True)
+show_trend(trend, key="retail-trend")
+
+# === What-if Scenarios ===
+with st.expander("🧪 What-if Scenarios"):
+    scenario_panel("Retail Health Index", key="retail-scenarios", scale=100, suffix="%")
 
 # === Raw Data (Optional) ===
 with st.expander("🔍 Show Raw Data"):
-    st.dataframe(df_clean[['Date', 'Month', 'Quarter'] + numeric_cols + ['Retail Index']])
\ No newline at end of file
+    st.dataframe(df_clean[['Date', 'Month', 'Quarter'] + numeric_cols + ['Retail Index', 'Imputed']])
\ No newline at end of file
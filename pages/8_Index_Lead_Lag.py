@@ -0,0 +1,77 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from shared.lead_lag import MAX_LAG, MIN_OVERLAP, load_lead_lag
+
+st.set_page_config(layout="wide")
+
+st.title("Index Lead-Lag Comparison")
+st.markdown("*Which indices move first, and by how many months.*")
+
+max_lag = st.slider("Maximum lag (months)", min_value=3, max_value=MAX_LAG, value=MAX_LAG, key="max-lag")
+result = load_lead_lag(max_lag)
+names, lags, corr = result["names"], result["lags"], result["corr"]
+
+# === Pair Explorer ===
+st.subheader("Cross-correlation by Lag")
+col_a, col_b = st.columns(2)
+series_a = col_a.selectbox("Series A", names, index=0, key="lead-a")
+series_b = col_b.selectbox("Series B", [n for n in names if n != series_a], key="lead-b")
+curve = corr[names.index(series_a), names.index(series_b)]
+
+fig = go.Figure(go.Bar(
+    x=lags, y=curve,
+    marker_color=np.where(lags > 0, '#007381', np.where(lags < 0, '#E85412', '#888')),
+    hovertemplate="Lag %{x} months<br>Correlation %{y:.2f}<extra></extra>",
+))
+fig.update_layout(
+    xaxis_title=f"Lag (months) — positive: {series_a} leads",
+    yaxis_title="Correlation",
+    yaxis_range=[-1, 1],
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font_color='white',
+    height=400,
+)
+st.plotly_chart(fig, use_container_width=True)
+
+if np.isnan(curve).all():
+    st.info(f"These two series share fewer than {MIN_OVERLAP} months at every lag.")
+else:
+    best = np.nanargmax(np.abs(curve))
+    if lags[best] == 0:
+        st.markdown(f"Strongest relationship is same-month: correlation **{curve[best]:.2f}**.")
+    else:
+        leader, follower = (series_a, series_b) if lags[best] > 0 else (series_b, series_a)
+        st.markdown(f"**{leader}** leads **{follower}** by **{abs(lags[best])} months** "
+                    f"(correlation {curve[best]:.2f}).")
+
+# === Peak Correlation Matrix ===
+st.subheader("Peak Correlation Matrix")
+filled = np.where(np.isnan(corr), -np.inf, np.abs(corr))
+best = filled.argmax(axis=-1)
+peak = np.take_along_axis(corr, best[..., None], axis=-1)[..., 0]
+text = np.array([[f"{p:.2f} @ {lags[b]:+d}" if not np.isnan(p) else "" for p, b in zip(row_p, row_b)]
+                 for row_p, row_b in zip(peak, best)], dtype=object)
+np.fill_diagonal(peak, np.nan)
+np.fill_diagonal(text, "")
+
+fig = go.Figure(go.Heatmap(
+    z=peak, x=names, y=names, text=text, texttemplate="%{text}",
+    colorscale='RdBu', zmid=0, zmin=-1, zmax=1,
+    hovertemplate="%{y} → %{x}<br>%{text}<extra></extra>",
+))
+fig.update_layout(
+    yaxis=dict(autorange='reversed'),
+    paper_bgcolor='rgba(0,0,0,0)',
+    plot_bgcolor='rgba(0,0,0,0)',
+    font_color='white',
+    height=600,
+)
+st.plotly_chart(fig, use_container_width=True)
+st.caption(f"Each cell is the strongest correlation over lags ±{max_lag} and its lag in months; a positive lag "
+           f"means the row series leads the column series. Lags with fewer than {MIN_OVERLAP} shared months are skipped.")
+
+# === Lead-Lag Table ===
+st.subheader("Lead-Lag Pairs")
+st.dataframe(result["table"].round(2), hide_index=True, use_container_width=True)
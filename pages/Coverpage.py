@@ -1,18 +1,17 @@
 import streamlit as st
 import pandas as pd
+from shared.fragments import flag_html, render
+from shared.macro_store import FLAGS, load_macro_store, macro_countries, macro_months
 
 st.set_page_config(layout="wide")
 st.markdown("<h2 style='text-align:center;'>Macroeconomic Briefing: India and United Kingdom</h2>", unsafe_allow_html=True)
 st.markdown("<h3 style='text-align:center; color: teal;'>October 2025</h3>", unsafe_allow_html=True)
-# Load data
-df = pd.read_excel("data/Macro_MoM_Comparison.xlsx")
-df.columns = df.columns.str.strip()
 
-# Define reverse logic parameters
-reverse_logic_params = ["Unemployment Rate", "Inflation Rate", "Merchandise Imports"]
-
-# % fields to format
-percent_params = ["Repo Rate", "Inflation Rate", "Unemployment Rate"]
+months, countries = macro_months(), macro_countries()
+pick_month, pick_countries = st.columns([1, 2])
+month = pick_month.selectbox("Briefing", months, index=len(months) - 1, key="cover-month")
+selected = pick_countries.multiselect("Countries", countries, default=countries, key="cover-countries")
+df = load_macro_store(month, selected)
 
 # Parameter display mapping
 display_names = {
@@ -25,77 +24,21 @@ display_names = {
     "Merchandise Exports": "Merchandise Exports"
 }
 
-# Flags
-flags = {
-    "India": "https://flagcdn.com/in.svg",
-    "UK": "https://flagcdn.com/gb.svg"
-}
-
-# Function to assign color based on logic
-def get_color(change, is_reverse=False):
-    change_str = str(change)
-    if "+" in change_str:
-        return "red" if is_reverse else "green"
-    elif "-" in change_str:
-        return "green" if is_reverse else "red"
-    else:
-        return "grey"
-
-# Build data
+# Build data: {parameter: {country: card fields}}, formatted and coloured by the store
+cards = df.assign(
+    label=df["Parameter"].map(display_names).fillna(df["Parameter"]),
+    value=df["Display Value"],
+    date=df["Date"].dt.strftime("%b-%y").fillna(""),
+    change=df["Change"],
+    color=df["Color"],
+)
 data = {}
-for _, row in df.iterrows():
-    param = row["Parameter"].strip()
-    display_label = display_names.get(param, param)
-    is_reverse = param in reverse_logic_params
-
-    # Format values
-    value_india = str(row["India"]).strip()
-    value_uk = str(row["UK"]).strip()
-
-    if param in percent_params:
-        if isinstance(row["India"], (int, float)):
-            value_india = f"{row['India'] * 100:.2f}%"
-        elif not value_india.endswith("%"):
-            value_india += "%"
-        
-        if isinstance(row["UK"], (int, float)):
-            value_uk = f"{row['UK'] * 100:.2f}%"
-        elif not value_uk.endswith("%"):
-            value_uk += "%"
-
-    # Format dates
-    india_date = row["India Date"].strftime("%b-%y") if pd.notnull(row["India Date"]) else ""
-    uk_date = row["UK Date"].strftime("%b-%y") if pd.notnull(row["UK Date"]) else ""
-
-    # Format color using logic
-    india_color = get_color(row["India MoM Change"], is_reverse)
-    uk_color = get_color(row["UK MoM Change"], is_reverse)
-
-    data[display_label] = {
-        "India": {
-            "value": value_india,
-            "date": india_date,
-            "change": str(row["India MoM Change"]),
-            "color": india_color
-        },
-        "UK": {
-            "value": value_uk,
-            "date": uk_date,
-            "change": str(row["UK MoM Change"]),
-            "color": uk_color
-        }
-    }
+for (label, country), fields in cards.set_index(["label", "Country"])[["value", "date", "change", "color"]].to_dict("index").items():
+    data.setdefault(label, {})[country] = fields
 
 # Card rendering
 def card(country, details):
-    return f"""
-    <div style="text-align: center; background-color: #111; padding: 15px; border-radius: 10px; border: 1px solid #333;">
-        <img src='{flags[country]}' width='32'><br>
-        <span style='font-size: 20px; font-weight: bold;'>{details["value"]}</span><br>
-        <span style='font-size: 13px; color: grey;'>{details["date"]}</span><br>
-        <span style='color: {details["color"]}; font-size: 13px;'>{details["change"]}</span>
-    </div>
-    """
+    return render("country_card", flag=flag_html(country, FLAGS), **details)
 
 # Render layout
 param_names = list(data.keys())
@@ -106,11 +49,10 @@ for pair in param_pairs:
     for i, param in enumerate(pair):
         with col_block[i]:
             st.markdown(f"<h3 style='text-align: center;'>{param}</h3>", unsafe_allow_html=True)
-            subcols = st.columns(2)
-            with subcols[0]:
-                st.markdown(card("India", data[param]["India"]), unsafe_allow_html=True)
-            with subcols[1]:
-                st.markdown(card("UK", data[param]["UK"]), unsafe_allow_html=True)
+            subcols = st.columns(max(len(data[param]), 1))
+            for subcol, (country, details) in zip(subcols, data[param].items()):
+                with subcol:
+                    st.markdown(card(country, details), unsafe_allow_html=True)
 
 st.markdown("""
 <div style='font-size: 12px; font-style: italic; color: grey; margin-top: 30px;'>
@@ -1,13 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from shared.forecast_models import FORECAST_WORKBOOKS, load_forecast_table
 
 st.markdown("### Quarterly Renewable Capacity Addition (MW): Actual vs Predicted")
 st.markdown("---")
 
-# File and sheet setup
-excel_path = "data/Solar&Wind_Model.xlsx"
-sheets = ["Solar", "Wind"]
+# Sheet setup
+sheets = FORECAST_WORKBOOKS["Renewable Capacity Addition"]["sheets"]
 
 colors = {
     "Actual": "#007381",
@@ -17,10 +17,7 @@ colors = {
 for sheet in sheets:
     st.markdown(f"#### {sheet} (MW)")
 
-    df = pd.read_excel(excel_path, sheet_name=sheet)
-    df.columns = [col.strip() for col in df.columns]
-    df['Actual'] = pd.to_numeric(df['Actual'], errors='coerce')
-    df['Predicted'] = pd.to_numeric(df['Predicted'], errors='coerce')
+    df = load_forecast_table("Renewable Capacity Addition", sheet)
 
     for _, row in df.iterrows():
         quarter = row['Quarter']
@@ -1,16 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from shared.forecast_models import load_forecast_table
 
 st.markdown("### Quarterly Potash Demand (MMT): Actual vs Predicted")
 st.markdown("---")
 
-# Load Excel
-df = pd.read_excel("data/Agri_Model.xlsx")
-df.columns = [c.strip() for c in df.columns]
-
-df['Actual'] = pd.to_numeric(df['Actual'], errors='coerce')
-df['Predicted'] = pd.to_numeric(df['Predicted'], errors='coerce')
+# Load forecasts
+df = load_forecast_table("Fertiliser Demand")
 
 # Always use both categories to reserve height
 categories = ["Actual", "Predicted"]
@@ -1,20 +1,13 @@
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
+from shared.forecast_models import FORECAST_WORKBOOKS, load_forecast_table
 
 st.markdown("### Quarterly Vehicle Production: Actual vs Predicted")
 st.markdown("---")
 
-# Load Excel file with multiple sheets
-excel_path = "data/Auto_Model.xlsx"
-sheets = [
-    "Passenger Vehicles",
-    "Light Commercial Vehicles",
-    "Medium Commercial Vehicles",
-    "Heavy Commercial Vehicles",
-    "Three Wheelers and Quadricycles",
-    "Two Wheelers"
-]
+# One forecast table per vehicle category
+sheets = FORECAST_WORKBOOKS["Vehicle Production"]["sheets"]
 
 colors = {
     "Actual": "#007381",
@@ -24,10 +17,7 @@ colors = {
 for sheet in sheets:
     st.markdown(f"#### {sheet}")
 
-    df = pd.read_excel(excel_path, sheet_name=sheet)
-    df.columns = [col.strip() for col in df.columns]
-    df['Actual'] = pd.to_numeric(df['Actual'], errors='coerce')
-    df['Predicted'] = pd.to_numeric(df['Predicted'], errors='coerce')
+    df = load_forecast_table("Vehicle Production", sheet)
 
     # Display one chart per quarter
     for _, row in df.iterrows():
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+def block_bootstrap_indices(n_obs, n_boot, block_size=None, seed=0):
+    """Moving-block bootstrap row indices, shape (n_boot, n_obs)."""
+    if block_size is None:
+        block_size = max(2, int(round(n_obs ** (1 / 3))))
+    block_size = min(block_size, n_obs)
+    n_blocks = int(np.ceil(n_obs / block_size))
+    rng = np.random.default_rng(seed)
+    starts = rng.integers(0, n_obs - block_size + 1, size=(n_boot, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_size)).reshape(n_boot, -1)
+    return idx[:, :n_obs]
+
+
+def _standardize(batch):
+    # Same convention as StandardScaler: population std, constant columns left unscaled
+    mean = batch.mean(axis=1)
+    std = batch.std(axis=1)
+    std[std == 0] = 1.0
+    return mean, std
+
+
+def _pca_chunk(X, reference, X_score, idx):
+    batch = X[idx]
+    mean, std = _standardize(batch)
+    z = (batch - mean[:, None, :]) / std[:, None, :]
+    z -= z.mean(axis=1, keepdims=True)
+    _, _, vt = np.linalg.svd(z, full_matrices=False)
+    loadings = vt[:, 0, :]
+
+    # PCA signs are arbitrary; align every replicate with the point estimate
+    sign = np.sign(loadings @ reference)
+    sign[sign == 0] = 1.0
+    loadings *= sign[:, None]
+
+    z_score = (X_score[None, :, :] - mean[:, None, :]) / std[:, None, :]
+    return np.einsum('bmk,bk->bm', z_score, loadings)
+
+
+def _regression_chunk(X, y, X_score, idx):
+    batch = X[idx]
+    lo, hi = batch.min(axis=1), batch.max(axis=1)
+    span = hi - lo
+    span[span == 0] = 1.0
+    xs = (batch - lo[:, None, :]) / span[:, None, :]
+    design = np.concatenate([np.ones(xs.shape[:2] + (1,)), xs], axis=2)
+    coef = np.einsum('bkn,bn->bk', np.linalg.pinv(design), y[idx])[:, 1:]
+    weights = coef / coef.sum(axis=1, keepdims=True)
+
+    xs_score = (X_score[None, :, :] - lo[:, None, :]) / span[:, None, :]
+    return np.einsum('bmk,bk->bm', xs_score, weights)
+
+
+def run_chunks(func, idx, n_jobs, chunk_size):
+    chunks = [idx[i:i + chunk_size] for i in range(0, len(idx), chunk_size)]
+    if n_jobs is None or n_jobs <= 1 or len(chunks) == 1:
+        return np.vstack([func(c) for c in chunks])
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return np.vstack(list(pool.map(func, chunks)))
+
+
+def bootstrap_pca_scores(X, reference, X_score=None, n_boot=2000, block_size=None,
+                         seed=0, n_jobs=1, chunk_size=250):
+    """Refit standardisation + first principal component on block-resampled months.
+
+    Returns an (n_boot, len(X_score)) array of index values, one row per replicate.
+    """
+    X = np.asarray(X, dtype=float)
+    X_score = X if X_score is None else np.asarray(X_score, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    idx = block_bootstrap_indices(len(X), n_boot, block_size, seed)
+    return run_chunks(partial(_pca_chunk, X, reference, X_score), idx, n_jobs, chunk_size)
+
+
+def bootstrap_regression_scores(X, y, X_score=None, n_boot=2000, block_size=None,
+                                seed=0, n_jobs=1, chunk_size=250):
+    """Refit min-max scaling + normalised regression weights on block-resampled months."""
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float)
+    X_score = X if X_score is None else np.asarray(X_score, dtype=float)
+    idx = block_bootstrap_indices(len(X), n_boot, block_size, seed)
+    return run_chunks(partial(_regression_chunk, X, y, X_score), idx, n_jobs, chunk_size)
+
+
+def percentile_bands(samples, groups=None, levels=(5, 95)):
+    """Lower/upper percentile per column of `samples`, optionally averaged within `groups` first."""
+    samples = np.asarray(samples, dtype=float)
+    if groups is not None:
+        grouped = pd.DataFrame(samples.T).groupby(np.asarray(groups), sort=False).mean()
+        keys, samples = grouped.index, grouped.to_numpy().T
+    else:
+        keys = pd.RangeIndex(samples.shape[1])
+    lower, upper = np.nanpercentile(samples, levels, axis=0)
+    return pd.DataFrame({'lower': lower, 'upper': upper}, index=keys)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version
+from shared.index_series import INDEX_REGISTRY, all_index_series
+from shared.mapped_store import mapped_frame
+
+# Look-back in months per change horizon; adding one here adds a column everywhere
+CHANGE_HORIZONS = {"MoM": 1, "QoQ": 3, "YoY": 12}
+SINCE_PEAK = "Since Peak"
+
+
+def change_matrix(series, scales, horizons=CHANGE_HORIZONS):
+    """Percent change of every index, month and horizon, plus the drawdown from its running peak.
+
+    Levels are put on a shared monthly calendar and normalised to each index's display scale
+    (so indices that cross zero still give meaningful percentages), then every horizon is
+    gathered from one padded (months, indices) array. Returns a tidy frame with one row per
+    observed (Date, Index): the raw Level and one column per horizon.
+    """
+    levels = pd.DataFrame(series)
+    calendar = pd.date_range(levels.index.min(), levels.index.max(), freq='MS', name='Date')
+    levels = levels.reindex(calendar)
+    lo, hi = np.array([scales[name] for name in levels.columns], dtype=float).T
+    norm = (levels.to_numpy(dtype=float) - lo) / (hi - lo)
+
+    lags = np.array(list(horizons.values()))
+    padded = np.vstack([np.full((lags.max(), norm.shape[1]), np.nan), norm])
+    # prior[h, t] is the normalised level lags[h] months before t
+    prior = padded[lags.max() - lags[:, None] + np.arange(len(norm))]
+    prior = np.concatenate([prior, np.fmax.accumulate(norm, axis=0)[None]])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pct = np.where(prior == 0, np.nan, (norm - prior) / prior * 100)
+
+    names = [*horizons, SINCE_PEAK]
+    matrix = pd.DataFrame(
+        pct.transpose(1, 2, 0).reshape(-1, len(names)),
+        index=pd.MultiIndex.from_product([calendar, levels.columns], names=['Date', 'Index']),
+        columns=names,
+    )
+    matrix.insert(0, 'Level', levels.to_numpy().ravel())
+    return matrix[matrix['Level'].notna()].reset_index()
+
+
+def latest_changes(matrix):
+    """Most recent row of each index, indexed by name."""
+    return matrix.groupby('Index', sort=False).tail(1).set_index('Index')
+
+
+@st.cache_data
+def _cached_changes(version):
+    scales = {name: spec["scale"] for name, spec in INDEX_REGISTRY.items()}
+    return change_matrix(all_index_series(), scales)
+
+
+def load_change_matrix():
+    """Change matrix for all indices, from the shared store or cached per data version."""
+    shared = mapped_frame("changes")
+    return shared if shared is not None else _cached_changes(data_version("data/*.csv"))
@@ -0,0 +1,115 @@
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.derived import content_key
+
+# Downsampling for line charts. Traces with more points than the chart has horizontal
+# pixels are reduced before they are sent to the browser: lines with largest-triangle-
+# three-buckets (LTTB), which keeps the visual shape, and filled bands with a min/max per
+# bucket, which keeps the envelope. Reductions are cached per (series, x range, width).
+
+MAX_POINTS = 1200  # about one point per pixel of a full-width chart
+MAX_CACHED_DECIMATIONS = 256
+_DECIMATION_CACHE = OrderedDict()
+
+
+def lttb(x, y, n_out):
+    """Indices of the n_out points chosen by largest-triangle-three-buckets."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # Interior points split into n_out - 2 buckets; the first and last points are always kept
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    # Average of each bucket, used as the third vertex for the bucket before it
+    sums_x, sums_y = np.add.reduceat(x[1:n - 1], edges[:-1] - 1), np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    chosen = np.empty(n_out, dtype=int)
+    chosen[0], chosen[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs((x[prev] - avg_x[b + 1]) * (y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi]) * (avg_y[b + 1] - y[prev]))
+        prev = lo + int(np.argmax(area))
+        chosen[b + 1] = prev
+    return chosen
+
+
+def minmax_buckets(x, y, n_out):
+    """Indices of the lowest and highest point in each of n_out / 2 equal-width buckets."""
+    n = len(x)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # Sorting by (bucket, y) puts each bucket's min first and its max last
+    by_value = np.lexsort((y, bucket))
+    return np.unique(np.concatenate([by_value[edges[:-1]], by_value[edges[1:] - 1]]))
+
+
+DOWNSAMPLERS = {"lttb": lttb, "minmax": minmax_buckets}
+
+
+def _as_numeric(x):
+    x = pd.Index(x)
+    if pd.api.types.is_datetime64_any_dtype(x):
+        return x.as_unit("ns").asi8.astype(float)
+    return x.to_numpy(dtype=float)
+
+
+def decimate(x, y, x_range=None, width=MAX_POINTS, method="lttb"):
+    """Indices of the points of (x, y) to draw inside `x_range` at `width` pixels."""
+    x_num, y = _as_numeric(x), np.asarray(y, dtype=float)
+    key = (content_key(x_num), content_key(y), x_range, width, method)
+    if key in _DECIMATION_CACHE:
+        _DECIMATION_CACHE.move_to_end(key)
+        return _DECIMATION_CACHE[key]
+
+    keep = np.isfinite(y)
+    if x_range is not None:
+        keep &= (x_num >= x_range[0]) & (x_num <= x_range[1])
+    idx = np.flatnonzero(keep)
+    if len(idx) > width:
+        idx = idx[DOWNSAMPLERS[method](x_num[idx], y[idx], width)]
+
+    _DECIMATION_CACHE[key] = idx
+    if len(_DECIMATION_CACHE) > MAX_CACHED_DECIMATIONS:
+        _DECIMATION_CACHE.popitem(last=False)
+    return idx
+
+
+def show_trend(fig, key, width=MAX_POINTS, container=st):
+    """st.plotly_chart with every dense line trace downsampled.
+
+    When a dense trace is on a date axis, a range slider under the chart zooms it and the
+    traces are re-reduced for the visible range, so detail grows as the range narrows.
+    Traces on a category axis are reduced by position.
+    """
+    dense = [t for t in fig.data if t.type == 'scatter' and t.x is not None and len(t.x) > width]
+    xs = [pd.Index(t.x) for t in dense]
+    dates = [x for x in xs if pd.api.types.is_datetime64_any_dtype(x)]
+    x_range = None
+    if dates:
+        lo = min(x.min() for x in dates).to_pydatetime()
+        hi = max(x.max() for x in dates).to_pydatetime()
+        start, end = container.slider("Zoom range", min_value=lo, max_value=hi, value=(lo, hi), key=f"{key}-zoom")
+        x_range = (float(pd.Timestamp(start).as_unit("ns").value), float(pd.Timestamp(end).as_unit("ns").value))
+        fig.update_xaxes(range=[start, end])
+
+    for trace, x in zip(dense, xs):
+        is_date = pd.api.types.is_datetime64_any_dtype(x)
+        idx = decimate(x if is_date else np.arange(len(x)), trace.y, x_range if is_date else None,
+                       width, "minmax" if trace.fill else "lttb")
+        n = len(x)
+        updates = {"x": x[idx], "y": np.asarray(trace.y)[idx]}
+        for attr in ("customdata", "text", "hovertext"):
+            value = getattr(trace, attr)
+            if value is not None and not isinstance(value, str) and len(value) == n:
+                updates[attr] = np.asarray(value)[idx]
+        trace.update(updates)
+    container.plotly_chart(fig, use_container_width=True)
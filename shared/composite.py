@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.changes import change_matrix
+from shared.feature_store import data_version
+from shared.index_series import all_index_series
+from shared.mapped_store import mapped_frame
+
+# Macro composite: the equal-weighted mean of every index's expanding (real-time) z-score.
+# Each month is standardised with only the history up to that month, so published values
+# never move; a new month only extends each index's running count, mean and sum of squares.
+
+COMPOSITE_NAME = "Macro Composite Index"
+COMPOSITE_SCALE = (-3, 3)
+MIN_HISTORY = 12
+MIN_CONTRIBUTORS = 3
+
+# Running moments per index, reused across reruns so a new month only costs its own update
+_COMPOSITE_STATE = {}
+
+
+def expanding_zscores(values, state=None):
+    """z-score of each value against all values up to and including it.
+
+    If `state` covers a prefix of `values`, only the new values are processed; the moments
+    of the new chunk are merged with the stored ones (Chan et al.) in one vectorised step.
+    Returns the z-scores and the state for the next call.
+    """
+    values = np.asarray(values, dtype=float)
+    resume = (state is not None and len(state["values"]) <= len(values)
+              and np.array_equal(state["values"], values[:len(state["values"])]))
+    if not resume:
+        state = {"values": values[:0], "z": values[:0], "count": 0, "mean": 0.0, "m2": 0.0}
+
+    new = values[len(state["values"]):]
+    k = np.arange(1, len(new) + 1)
+    chunk_mean = np.cumsum(new) / k
+    chunk_m2 = np.cumsum(new ** 2) - np.cumsum(new) ** 2 / k
+    count = state["count"] + k
+    delta = chunk_mean - state["mean"]
+    mean = state["mean"] + delta * k / count
+    m2 = state["m2"] + chunk_m2 + delta ** 2 * state["count"] * k / count
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = (new - mean) / np.sqrt(m2 / (count - 1))
+    z = np.where(count >= MIN_HISTORY, z, np.nan)
+    if len(new):
+        state = {"values": values, "z": np.concatenate([state["z"], z]),
+                 "count": count[-1], "mean": mean[-1], "m2": m2[-1]}
+    return state["z"], state
+
+
+def composite_index(series, state=None):
+    """Composite Series (months with at least MIN_CONTRIBUTORS scored indices) and updated state."""
+    state = {} if state is None else state
+    new_state, scores = {}, {}
+    for name, s in series.items():
+        z, new_state[name] = expanding_zscores(s.to_numpy(), state.get(name))
+        scores[name] = pd.Series(z, index=s.index)
+    scores = pd.DataFrame(scores).sort_index()
+    composite = scores.mean(axis=1).where(scores.notna().sum(axis=1) >= MIN_CONTRIBUTORS).dropna()
+    return composite.rename(COMPOSITE_NAME), new_state
+
+
+@st.cache_data
+def _cached_composite(version):
+    composite, new_state = composite_index(all_index_series(), _COMPOSITE_STATE)
+    _COMPOSITE_STATE.update(new_state)
+    return {"series": composite, "changes": change_matrix({COMPOSITE_NAME: composite}, {COMPOSITE_NAME: COMPOSITE_SCALE})}
+
+
+def load_composite():
+    """Composite series and its change matrix, from the shared store or cached per data version."""
+    series, changes = mapped_frame(f"series/{COMPOSITE_NAME}"), mapped_frame("composite changes")
+    if series is None or changes is None:
+        return _cached_composite(data_version("data/*.csv"))
+    return {"series": pd.Series(series['Index'].to_numpy(), index=pd.DatetimeIndex(series['Date'], name='Date'),
+                                name=COMPOSITE_NAME),
+            "changes": changes}
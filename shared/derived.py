@@ -0,0 +1,76 @@
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+# Derived columns as a graph of vectorised nodes: {name: (function, [dependency names])}.
+# Dependencies are input columns, named constants or other nodes. A node's cache key hashes
+# its name with its dependencies' keys, and inputs and constants are keyed by content, so a
+# changed input column or overridden constant only recomputes the nodes downstream of it.
+
+MAX_CACHED_NODES = 512
+_NODE_CACHE = OrderedDict()
+
+
+def content_key(value):
+    arr = np.ascontiguousarray(value, dtype=float)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(arr.shape).encode())
+    digest.update(arr.tobytes())
+    return digest.hexdigest()
+
+
+def _node_key(name, dep_keys):
+    return hashlib.blake2b("|".join([name, *dep_keys]).encode(), digest_size=16).hexdigest()
+
+
+def evaluate_graph(graph, inputs, constants=None, targets=None, cache=True):
+    """{node: array} for `targets` (default: every node) and whatever they depend on.
+
+    `inputs` maps column names to arrays, `constants` maps names to scalars (or arrays that
+    broadcast against the inputs). Returns the computed node values and the set of nodes
+    that missed the cache. cache=False skips hashing and storing, for one-off large sweeps.
+    """
+    values = {**inputs, **(constants or {})}
+    keys = {name: content_key(value) for name, value in values.items()} if cache else {}
+    recomputed = set()
+
+    def resolve(name):
+        if name in values:
+            return
+        func, deps = graph[name]
+        for dep in deps:
+            resolve(dep)
+        if not cache:
+            values[name] = func(*(values[dep] for dep in deps))
+            recomputed.add(name)
+            return
+        key = _node_key(name, [keys[dep] for dep in deps])
+        keys[name] = key
+        if key in _NODE_CACHE:
+            _NODE_CACHE.move_to_end(key)
+        else:
+            _NODE_CACHE[key] = func(*(values[dep] for dep in deps))
+            recomputed.add(name)
+            if len(_NODE_CACHE) > MAX_CACHED_NODES:
+                _NODE_CACHE.popitem(last=False)
+        values[name] = _NODE_CACHE[key]
+
+    for name in (graph if targets is None else targets):
+        resolve(name)
+    return {name: values[name] for name in graph if name in values}, recomputed
+
+
+def graph_inputs(graph, constants=()):
+    """Dependencies that are neither nodes nor constants, i.e. the input columns."""
+    return sorted({dep for _, deps in graph.values() for dep in deps} - set(graph) - set(constants))
+
+
+def derive_columns(df, graph, constants=None):
+    """`df` with every node of `graph` added as a column."""
+    inputs = {col: df[col].to_numpy(dtype=float) for col in graph_inputs(graph, constants or {})}
+    nodes, _ = evaluate_graph(graph, inputs, constants)
+    df = df.copy()
+    for name, values in nodes.items():
+        # Copied so edits to the frame cannot reach the node cache
+        df[name] = np.array(values)
+    return df
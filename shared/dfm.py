@@ -0,0 +1,132 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# One-factor dynamic factor model for composite indices with ragged-edge data:
+#   z_t = loadings * f_t + e_t,    e_t ~ N(0, diag(r))
+#   f_t = phi * f_{t-1} + u_t,     u_t ~ N(0, q)
+# z_t are the standardised features. Parameters come from PCA on the complete months, so f_t
+# is on the same scale as the PCA index; months with some features missing are filtered using
+# only the features that were published.
+
+# Per-(index, frequency) filter state, so a new or revised month only refilters from where the
+# data changed. Shared by every session's script thread, so reads and updates hold the lock.
+_FILTER_CACHE = {}
+_FILTER_LOCK = threading.Lock()
+
+
+def fit_dfm(X, reference=None):
+    X = np.asarray(X, dtype=float)
+    complete = X[~np.isnan(X).any(axis=1)]
+    mean = complete.mean(axis=0)
+    std = complete.std(axis=0)
+    std[std == 0] = 1.0
+    z = (complete - mean) / std
+
+    _, s, vt = np.linalg.svd(z - z.mean(axis=0), full_matrices=False)
+    loadings = vt[0]
+    if reference is not None and loadings @ np.asarray(reference, dtype=float) < 0:
+        loadings = -loadings
+    factor = z @ loadings
+
+    phi = np.clip(np.corrcoef(factor[:-1], factor[1:])[0, 1], -0.99, 0.99)
+    variance = s[0] ** 2 / len(z)
+    residual = z - np.outer(factor, loadings)
+    return {
+        "mean": mean,
+        "std": std,
+        "loadings": loadings,
+        "phi": phi,
+        "q": variance * (1 - phi ** 2),
+        "r": np.maximum(residual.var(axis=0), 1e-3),
+        "f0": 0.0,
+        "p0": variance,
+    }
+
+
+def kalman_filter(X, params, f_prev=None, p_prev=None):
+    """Filter the factor through X (rows may contain NaN). O(n) in the number of months.
+
+    Each month's observations collapse to two scalars (information and information-weighted
+    observation), computed for all months at once; the recursion itself is scalar.
+    """
+    z = (np.asarray(X, dtype=float) - params["mean"]) / params["std"]
+    observed = ~np.isnan(z)
+    weights = params["loadings"] / params["r"]
+    info = (observed * (params["loadings"] * weights)).sum(axis=1)
+    score = np.where(observed, z * weights, 0.0).sum(axis=1)
+
+    phi, q = params["phi"], params["q"]
+    if f_prev is None:
+        a, v = params["f0"], params["p0"]
+    else:
+        a, v = phi * f_prev, phi ** 2 * p_prev + q
+    n = len(z)
+    f_pred, p_pred, f_filt, p_filt = (np.empty(n) for _ in range(4))
+    for t in range(n):
+        f_pred[t], p_pred[t] = a, v
+        p = 1.0 / (1.0 / v + info[t])
+        f = p * (a / v + score[t])
+        f_filt[t], p_filt[t] = f, p
+        a, v = phi * f, phi ** 2 * p + q
+    return f_pred, p_pred, f_filt, p_filt
+
+
+def rts_smoother(f_pred, p_pred, f_filt, p_filt, phi):
+    f_smooth, p_smooth = f_filt.copy(), p_filt.copy()
+    for t in range(len(f_filt) - 2, -1, -1):
+        gain = p_filt[t] * phi / p_pred[t + 1]
+        f_smooth[t] = f_filt[t] + gain * (f_smooth[t + 1] - f_pred[t + 1])
+        p_smooth[t] = p_filt[t] + gain ** 2 * (p_smooth[t + 1] - p_pred[t + 1])
+    return f_smooth, p_smooth
+
+
+def _changed_rows(old, new):
+    n = min(len(old), len(new))
+    same = (old[:n] == new[:n]) | (np.isnan(old[:n]) & np.isnan(new[:n]))
+    return ~same.all(axis=1)
+
+
+def dfm_factor(key, X, reference=None):
+    """Smoothed factor, its standard deviation and the filtered factor for each row of X.
+
+    Results are cached under `key`, e.g. (index, frequency). If X extends or revises the
+    cached matrix, parameters are kept and the filter restarts from the first changed
+    month; only a change to a month that was complete in the cached data (or a shorter
+    history) triggers a full refit.
+    """
+    X = np.asarray(X, dtype=float)
+    with _FILTER_LOCK:
+        return _dfm_factor(key, X, reference)
+
+
+def _dfm_factor(key, X, reference):
+    cached = _FILTER_CACHE.get(key)
+    if cached is not None and cached["X"].shape[1] == X.shape[1]:
+        changed = _changed_rows(cached["X"], X)
+        start = int(np.argmax(changed)) if changed.any() else len(changed)
+        was_complete = ~np.isnan(cached["X"][:len(changed)]).any(axis=1)
+        refit = len(X) < len(cached["X"]) or (changed & was_complete).any()
+    else:
+        start, refit = 0, True
+
+    if refit:
+        params = fit_dfm(X, reference)
+        filtered = kalman_filter(X, params)
+    else:
+        params = cached["params"]
+        if start == len(X) == len(cached["X"]):
+            return cached["result"]
+        head = [arr[:start] for arr in cached["filtered"]]
+        prev = (head[2][-1], head[3][-1]) if start else (None, None)
+        tail = kalman_filter(X[start:], params, *prev)
+        filtered = tuple(np.concatenate([h, t]) for h, t in zip(head, tail))
+
+    f_smooth, p_smooth = rts_smoother(*filtered, params["phi"])
+    result = pd.DataFrame({
+        "Smoothed": f_smooth,
+        "Smoothed_Std": np.sqrt(p_smooth),
+        "Filtered": filtered[2],
+    })
+    _FILTER_CACHE[key] = {"X": X, "params": params, "filtered": filtered, "result": result}
+    return result
@@ -1,25 +1,93 @@
+import os
+import numpy as np
 import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version, read_chunks, source_view
+from shared.mapped_store import mapped_frame
 
-def get_latest_ev_adoption():
-    df = pd.read_csv("data/EV_Adoption.csv")
-    df.columns = df.columns.str.strip()
-    df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y', errors='coerce')
-    df = df.dropna(subset=['Date'])
+# EV penetration by segment and region. Each segment's EV sales are divided by that
+# segment's total sales; "All Vehicles" is every EV over total vehicle sales, the national
+# EV Market Adoption Rate. The national series comes from the feature store; a state file
+# laid out like EV_Adoption.csv with a State column adds one region per state.
+
+# segment: (EV sales, all sales of the segment)
+EV_SEGMENTS = {
+    "All Vehicles": ("EV Total Sales", "Total Vehicle Sales"),
+    "Four-wheeler": ("EV Four-wheeler Sales", "Passenger Vehicle Sales"),
+    "Two-wheeler": ("EV Two-wheeler Sales", "Two-wheeler Sales"),
+    "Three-wheeler": ("EV Three-wheeler Sales", "Three-wheeler Sales"),
+}
+EV_SALES = ["EV Four-wheeler Sales", "EV Two-wheeler Sales", "EV Three-wheeler Sales"]
+STATE_EV_FILE = "data/State_EV_Adoption.csv"
+REGION_COLUMN = "State"
+NATIONAL = "India"
+
+
+def ev_frames():
+    """National EV sales from the feature store, plus the state file when there is one."""
+    national = source_view("ev").assign(**{REGION_COLUMN: NATIONAL})
+    if not os.path.exists(STATE_EV_FILE):
+        return national
+    states = pd.concat(read_chunks("ev", STATE_EV_FILE, keys=(REGION_COLUMN,), canonical=True)).reset_index()
+    states[REGION_COLUMN] = states[REGION_COLUMN].astype(str).str.strip()
+    return pd.concat([national, states], ignore_index=True)
+
+
+def penetration_cube(frame):
+    """Long table of every (region, segment, month): Region, Segment, Date, EV Sales, Sales, Penetration.
+
+    Sales are summed per region and month in one groupby, then every segment's ratio is
+    taken at once on a (region x month, segment) array.
+    """
+    frame = frame.assign(**{"EV Total Sales": frame[EV_SALES].sum(axis=1, min_count=len(EV_SALES))})
+    ev_cols = [ev for ev, _ in EV_SEGMENTS.values()]
+    sales_cols = [sales for _, sales in EV_SEGMENTS.values()]
+    totals = frame.groupby([REGION_COLUMN, 'Date'])[list(dict.fromkeys(ev_cols + sales_cols))].sum(min_count=1)
+    ev, sales = totals[ev_cols].to_numpy(), totals[sales_cols].to_numpy()
+    with np.errstate(invalid='ignore', divide='ignore'):
+        share = np.where(sales > 0, ev / sales, np.nan)
 
-    # Clean numeric fields
-    ev_cols = ['EV Four-wheeler Sales', 'EV Two-wheeler Sales', 'EV Three-wheeler Sales']
-    for col in ev_cols:
-        df[col] = pd.to_numeric(df[col].astype(str).str.replace(',', ''), errors='coerce')
+    keys = totals.index.to_frame(index=False)
+    n_segments = len(EV_SEGMENTS)
+    return pd.DataFrame({
+        "Region": np.repeat(keys[REGION_COLUMN].to_numpy(), n_segments),
+        "Segment": np.tile(list(EV_SEGMENTS), len(keys)),
+        "Date": np.repeat(keys['Date'].to_numpy(), n_segments),
+        "EV Sales": ev.ravel(),
+        "Sales": sales.ravel(),
+        "Penetration": share.ravel(),
+    })
 
-    df['Total Vehicle Sales'] = pd.to_numeric(df['Total Vehicle Sales'].astype(str).str.replace(',', ''), errors='coerce')
 
-    df['EV Total Sales'] = df[ev_cols].sum(axis=1)
-    df['EV Adoption Rate'] = df['EV Total Sales'] / df['Total Vehicle Sales']
-    df['Month'] = df['Date'].dt.strftime('%b-%y')
+@st.cache_data
+def _cached_cube(version):
+    return penetration_cube(ev_frames())
 
-    latest = df.sort_values("Date").iloc[-1]
+
+def load_penetration(region=None, segment=None, date=None):
+    """Penetration cube for the current data version, optionally sliced by region, segment or month."""
+    cube = mapped_frame("ev penetration")
+    if cube is None:
+        cube = _cached_cube(data_version("data/*.csv"))
+    if region is not None:
+        cube = cube[cube["Region"] == region]
+    if segment is not None:
+        cube = cube[cube["Segment"] == segment]
+    if date is not None:
+        cube = cube[cube["Date"] == pd.Timestamp(date)]
+    return cube.reset_index(drop=True)
+
+
+def ev_regions():
+    """The national series first, then the states in alphabetical order."""
+    regions = load_penetration()["Region"].unique()
+    return [NATIONAL] + sorted(r for r in regions if r != NATIONAL)
+
+
+def get_latest_ev_adoption():
+    latest = load_penetration(NATIONAL, "All Vehicles").dropna(subset=["Penetration"]).iloc[-1]
     return {
-        "rate": latest["EV Adoption Rate"],
-        "month": latest["Month"],
-        "ev_units": int(latest["EV Total Sales"]),
-    }
\ No newline at end of file
+        "rate": latest["Penetration"],
+        "month": latest["Date"].strftime('%b-%y'),
+        "ev_units": int(latest["EV Sales"]),
+    }
@@ -0,0 +1,284 @@
+import os
+import glob
+import hashlib
+import pandas as pd
+import streamlit as st
+
+# Canonical feature store. Several input series are published in more than one data file
+# (UPI in CDI and Retail, NNI in Housing and Retail, power consumption in CDI and Renewable,
+# vehicle sales in CDI and EV, CCI in EV and Retail). Each is held here once, under one name,
+# and every index reads it from the store instead of from its own copy of the file.
+
+SOURCES = {
+    "cdi": "data/Consumer_Demand_Index.csv",
+    "ev": "data/EV_Adoption.csv",
+    "housing": "data/Housing_Affordability.csv",
+    "renewable": "data/Renewable_Energy.csv",
+    "iai": "data/Infrastructure_Activity.csv",
+    "imp": "data/IMP_Index.csv",
+    "retail": "data/Retail_Health.csv",
+}
+
+# name: (unit, [(source, column as published), ...])
+# Sources are in priority order, longest-running publication first; later sources only
+# fill months the earlier ones do not cover. A unit of None means "as published".
+FEATURES = {
+    "UPI Transactions": ("bn transactions", [("retail", "UPI Transactions"), ("cdi", "UPI Transactions")]),
+    "GST Revenue": (None, [("cdi", "GST Revenue")]),
+    "Total Vehicle Sales": ("units", [("ev", "Total Vehicle Sales"), ("cdi", "Vehicle Sales")]),
+    "Housing Sales": ("units", [("cdi", "Housing Sales")]),
+    "Power Consumption": ("BU", [("renewable", "Power Consumption"), ("cdi", "Power Consumption")]),
+    "CCI": ("index", [("retail", "CCI"), ("ev", "CCI")]),
+    "Passenger Vehicle Sales": ("units", [("ev", "Passenger Vehicle Sales")]),
+    "Two-wheeler Sales": ("units", [("ev", "Two-wheeler Sales")]),
+    "Three-wheeler Sales": ("units", [("ev", "Three-wheeler Sales")]),
+    "Commercial Vehicle Sales": ("units", [("ev", "Commercial Vehicle Sales")]),
+    "EV Four-wheeler Sales": ("units", [("ev", "EV Four-wheeler Sales")]),
+    "EV Two-wheeler Sales": ("units", [("ev", "EV Two-wheeler Sales")]),
+    "EV Three-wheeler Sales": ("units", [("ev", "EV Three-wheeler Sales")]),
+    "Crude oil prices in US$ per barrel": ("US$/bbl", [("ev", "Crude oil prices in US$ per barrel")]),
+    "Auto Loan Rate": ("%", [("ev", "Auto Loan Rate")]),
+    "Petrol - Price": ("₹/litre", [("ev", "Petrol - Price")]),
+    "Housing Loan Interest Rate": ("%", [("housing", "Housing Loan Interest Rate")]),
+    "Property Price Index": ("index", [("housing", "Property Price Index")]),
+    "Urbanization Rate": ("%", [("housing", "Urbanization Rate")]),
+    "Per Capita NNI": (None, [("housing", "Per Capita NNI"), ("retail", "Per Capita NNI")]),
+    "Solar power plants Installed capacity": ("MW", [("renewable", "Solar power plants Installed capacity")]),
+    "Wind power plants Installed capacity": ("MW", [("renewable", "Wind power plants Installed capacity")]),
+    "Hydro power plants Installed capacity": ("MW", [("renewable", "Hydro power plants Installed capacity")]),
+    "Budgetary allocation for MNRE sector": ("share", [("renewable", "Budgetary allocation for MNRE sector")]),
+    "Highway construction actual": ("km", [("iai", "Highway construction actual")]),
+    "Railway line construction actual": ("km", [("iai", "Railway line construction actual")]),
+    "Power T&D line constr (220KV plus)": ("ckm", [("iai", "Power T&D line constr (220KV plus)")]),
+    "Cement price": (None, [("iai", "Cement price")]),
+    "GVA: construction (Basic Price)": ("₹ Cr", [("iai", "GVA: construction (Basic Price)")]),
+    "Budgetary allocation for infrastructure sector": ("share", [("iai", "Budgetary allocation for infrastructure sector")]),
+    "IMP Scale": ("index", [("imp", "Scale")]),
+    "Inflation": ("fraction", [("retail", "Inflation")]),
+    "Repo Rate": ("fraction", [("retail", "Repo Rate")]),
+    "Private Consumption": ("₹ Cr", [("retail", "Private Consumption")]),
+}
+
+# How a feature published more often than monthly rolls up to a longer period: flows are
+# summed, stocks (installed capacity) take the period's last value, everything else the mean
+FLOW_FEATURES = [
+    "UPI Transactions", "GST Revenue", "Total Vehicle Sales", "Housing Sales", "Power Consumption",
+    "Passenger Vehicle Sales", "Two-wheeler Sales", "Three-wheeler Sales", "Commercial Vehicle Sales",
+    "EV Four-wheeler Sales", "EV Two-wheeler Sales", "EV Three-wheeler Sales",
+    "Highway construction actual", "Railway line construction actual", "Power T&D line constr (220KV plus)",
+    "GVA: construction (Basic Price)", "Private Consumption",
+]
+STOCK_FEATURES = [
+    "Solar power plants Installed capacity", "Wind power plants Installed capacity",
+    "Hydro power plants Installed capacity",
+]
+# Period grains a view can be built at; "MS" is the store's own monthly calendar
+FREQUENCIES = {"Weekly": "W-MON", "Monthly": "MS", "Fiscal Quarter": "QS-APR"}
+
+
+def data_version(pattern="data/*"):
+    """Cheap fingerprint of the data directory, used as a cache key."""
+    return tuple(sorted((path, os.stat(path).st_mtime_ns, os.stat(path).st_size)
+                        for path in glob.glob(pattern)))
+
+
+_DIGESTS = {}  # path -> (mtime_ns, size, sha1 of the contents)
+
+
+def content_version(pattern="data/*"):
+    """Fingerprint of the data files' contents, so a file touched but not changed keeps its version.
+
+    Files are re-hashed only when their mtime or size changes.
+    """
+    version = []
+    for path in sorted(glob.glob(pattern)):
+        stat = os.stat(path)
+        cached = _DIGESTS.get(path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            digest = hashlib.sha1()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            cached = _DIGESTS[path] = (stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+        version.append((path, cached[2]))
+    return tuple(version)
+
+
+def _parse_dates(source, dates):
+    dates = dates.astype(str).str.strip()
+    if source == "imp":
+        # "18-May" means May 2018
+        return pd.to_datetime("20" + dates.str[:2] + "-" + dates.str[3:], format="%Y-%b", errors="coerce")
+    return pd.to_datetime(dates, format="%m/%d/%Y", errors="coerce")
+
+
+CHUNK_ROWS = 100_000
+ROW_HOURS = "Row Hours"  # working column of stream_rollups: hours each source row covers
+
+
+def _clean_chunk(source, chunk, keys=()):
+    chunk.columns = chunk.columns.str.strip()
+    chunk['Date'] = _parse_dates(source, chunk['Date'])
+    chunk = chunk.dropna(subset=['Date']).set_index('Date')
+    # Thousands separators and percent signs are stripped; rates stay in percentage points
+    values = [c for c in chunk.columns if c not in keys]
+    chunk[values] = chunk[values].apply(
+        lambda col: pd.to_numeric(col.astype(str).str.replace(',', '').str.replace('%', ''), errors='coerce'))
+    return chunk
+
+
+def read_chunks(source, path=None, chunk_rows=CHUNK_ROWS, keys=(), canonical=False):
+    """Cleaned, Date-indexed chunks of a source file (or of another file laid out like it).
+
+    `keys` are text columns (e.g. a region) passed through unconverted; `canonical` renames
+    the file's columns to their feature-store names.
+    """
+    names = _canonical_columns(source)
+    for chunk in pd.read_csv(path or SOURCES[source], chunksize=chunk_rows):
+        chunk = _clean_chunk(source, chunk, keys)
+        yield chunk.rename(columns=names) if canonical else chunk
+
+
+def _with_row_hours(chunks, sample_dates=3):
+    # Chunks are held back until enough dates are seen to infer the file's spacing
+    native, pending = None, []
+    for chunk in chunks:
+        if native is None:
+            pending.append(chunk)
+            held = pd.concat(pending)
+            if held.index.nunique() < sample_dates:
+                continue
+            native, chunk, pending = native_offset(held.index), held, []
+        chunk[ROW_HOURS] = period_hours(chunk.index, native)
+        yield chunk
+    if pending:
+        held = pd.concat(pending)
+        held[ROW_HOURS] = period_hours(held.index, native_offset(held.index))
+        yield held
+
+
+def _merge_partials(acc, chunk, freq):
+    groups = chunk.resample(freq, label='left', closed='left')
+    rows = groups.size()
+    part = {"rows": rows, "sums": groups.sum(), "counts": groups.count(), "last": groups.last()}
+    part = {key: frame[rows > 0] for key, frame in part.items()}
+    if acc is None:
+        return part
+    # Per-period partial aggregates from earlier chunks plus this one; bounded by the number of periods
+    merged = {key: pd.concat([acc[key], part[key]]).groupby(level=0) for key in part}
+    return {"rows": merged["rows"].sum(), "sums": merged["sums"].sum(),
+            "counts": merged["counts"].sum(), "last": merged["last"].last()}
+
+
+def _finish_rollup(acc, freq, names):
+    flows = [c for c in acc["sums"].columns if names.get(c, c) in FLOW_FEATURES]
+    stocks = [c for c in acc["sums"].columns if names.get(c, c) in STOCK_FEATURES]
+    observed = acc["counts"] > 0
+    rolled = (acc["sums"] / acc["counts"]).where(observed)
+    rolled[flows] = acc["sums"][flows].where(observed[flows])
+    rolled[stocks] = acc["last"][stocks]
+    rolled.index.name = 'Date'
+    # Hours of the source periods the rows cover, not of the target period: a monthly row in
+    # a weekly grain still holds a month's flows
+    rolled['Period Hours'] = acc["sums"][ROW_HOURS]
+    return rolled.drop(columns=ROW_HOURS)
+
+
+def stream_rollups(source, freqs=tuple(FREQUENCIES.values()), chunk_rows=CHUNK_ROWS):
+    """{freq: frame} of one source file rolled up to each frequency, read in chunks of rows.
+
+    Chunks are parsed, cleaned and folded into per-period sums, counts and last values, so
+    memory is bounded by the number of periods, not the file's length. Flows are summed,
+    stocks (installed capacity) take the period's last value, everything else the mean.
+    Files are expected in date order for the stock rule. A monthly file rolls up to itself.
+    Period Hours are the summed hours of the file's own periods in each row, at the file's
+    native frequency (inferred from its first few dates).
+    """
+    names = _canonical_columns(source)
+    acc = dict.fromkeys(freqs)
+    for chunk in _with_row_hours(read_chunks(source, chunk_rows=chunk_rows)):
+        for freq in freqs:
+            acc[freq] = _merge_partials(acc[freq], chunk, freq)
+    return {freq: _finish_rollup(acc[freq], freq, names) for freq in freqs}
+
+
+def _canonical_columns(source):
+    return {col: name for name, (_, columns) in FEATURES.items() for s, col in columns if s == source}
+
+
+def native_offset(dates):
+    """The spacing of a file's dates: its inferred frequency, month starts, or the median gap."""
+    dates = pd.DatetimeIndex(dates).unique().sort_values()
+    freq = pd.infer_freq(dates) if len(dates) >= 3 else None
+    if freq is None and len(dates) and dates.is_month_start.all():
+        freq = "MS"
+    if freq is None and len(dates) >= 2:
+        freq = pd.Series(dates).diff().median()
+    return pd.tseries.frequencies.to_offset(freq or "MS")
+
+
+def period_hours(dates, freq="MS"):
+    """Hours in the period starting at each date."""
+    dates = pd.DatetimeIndex(dates)
+    return ((dates + pd.tseries.frequencies.to_offset(freq)) - dates) / pd.Timedelta(hours=1)
+
+
+def build_feature_store():
+    """Read every source file once and assemble the canonical features.
+
+    Returns {"features": {name: {"values", "unit", "provenance"}}, "views": {source: frame},
+    "grains": {source: {freq: frame}}}. `values` holds only the observed months; `provenance`
+    names the source of each of them. Views are each file's monthly calendar with its
+    features taken from the store, so shared series are identical in every index that uses
+    them. Grains are each file's own features rolled up to the other FREQUENCIES.
+    """
+    rollups = {source: stream_rollups(source) for source in SOURCES}
+    frames = {source: rolled["MS"].drop(columns='Period Hours') for source, rolled in rollups.items()}
+    features = {}
+    for name, (unit, columns) in FEATURES.items():
+        values = pd.Series(dtype=float, index=pd.DatetimeIndex([], name='Date'))
+        provenance = pd.Series(dtype=object, index=values.index)
+        for source, col in columns:
+            published = frames[source][col].dropna()
+            new = published.index.difference(values.index)
+            values = pd.concat([values, published[new]]).sort_index()
+            provenance = pd.concat([provenance, pd.Series(source, index=new)]).sort_index()
+        features[name] = {"values": values.rename(name), "unit": unit, "provenance": provenance}
+
+    views = {}
+    for source, frame in frames.items():
+        names = [name for name, (_, columns) in FEATURES.items() if any(s == source for s, _ in columns)]
+        view = pd.DataFrame({name: features[name]["values"].reindex(frame.index) for name in names},
+                            index=frame.index)
+        view['Period Hours'] = rollups[source]["MS"]['Period Hours']
+        views[source] = view.reset_index()
+    # Other grains hold each file's own features, under their canonical names
+    grains = {source: {freq: frame[list(_canonical_columns(source)) + ['Period Hours']]
+                       .rename(columns=_canonical_columns(source)).reset_index()
+                       for freq, frame in rolled.items() if freq != "MS"}
+              for source, rolled in rollups.items()}
+    return {"features": features, "views": views, "grains": grains}
+
+
+@st.cache_data
+def _cached_store(version):
+    return build_feature_store()
+
+
+def load_feature_store():
+    return _cached_store(data_version("data/*.csv"))
+
+
+def source_view(source, features=None, freq="MS"):
+    """Date, Period Hours and the canonical features of `source`, on that file's calendar.
+
+    The default monthly view is the store's. Other FREQUENCIES are the file's own published
+    data rolled up at ingest, so they are only as fine as the file: a weekly view of a
+    monthly file has one row per month.
+    """
+    store = load_feature_store()
+    view = store["views"][source] if freq == "MS" else store["grains"][source][freq]
+    if features is not None:
+        view = view[['Date', 'Period Hours'] + list(features)]
+    return view.copy()
+
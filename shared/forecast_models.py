@@ -0,0 +1,178 @@
+import warnings
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from concurrent.futures import ProcessPoolExecutor
+from xgboost import XGBRegressor
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+from shared.feature_store import data_version
+
+# Quarterly forecast workbooks behind the Sectoral Forecasts cards.
+# sheets=None means a single-sheet workbook, labelled with the workbook name.
+FORECAST_WORKBOOKS = {
+    "Fertiliser Demand": {"file": "data/Agri_Model.xlsx", "sheets": None, "unit": "MMT"},
+    "Houses Construction": {"file": "data/Housing_Model.xlsx", "sheets": None, "unit": "Units"},
+    "Vehicle Production": {
+        "file": "data/Auto_Model.xlsx",
+        "sheets": [
+            "Passenger Vehicles",
+            "Light Commercial Vehicles",
+            "Medium Commercial Vehicles",
+            "Heavy Commercial Vehicles",
+            "Three Wheelers and Quadricycles",
+            "Two Wheelers"
+        ],
+        "unit": "Units",
+    },
+    "Renewable Capacity Addition": {"file": "data/Solar&Wind_Model.xlsx", "sheets": ["Solar", "Wind"], "unit": "MW"},
+}
+
+MIN_TRAIN_QUARTERS = 8
+N_LAGS = 4
+INITIAL_ROUNDS = 200
+WARM_ROUNDS = 20
+
+
+def read_forecast_workbooks():
+    """All forecast sheets as one tidy table: Workbook, Sheet, Quarter, Actual, Predicted, Horizon."""
+    frames = []
+    for workbook, cfg in FORECAST_WORKBOOKS.items():
+        if cfg["sheets"] is None:
+            sheets = {workbook: pd.read_excel(cfg["file"])}
+        else:
+            sheets = pd.read_excel(cfg["file"], sheet_name=cfg["sheets"])
+        for sheet, df in sheets.items():
+            df = df.copy()
+            df.columns = [c.strip() for c in df.columns]
+            frames.append(pd.DataFrame({
+                "Workbook": workbook,
+                "Sheet": sheet,
+                "Quarter": df["Quarter"].astype(str).str.strip(),
+                "Actual": pd.to_numeric(df["Actual"], errors="coerce"),
+                "Predicted": pd.to_numeric(df["Predicted"], errors="coerce"),
+            }))
+    table = pd.concat(frames, ignore_index=True)
+    # Every stored prediction is one quarter ahead of the last actual it was made from
+    table["Horizon"] = 1
+    table["Source"] = "workbook"
+    return table
+
+
+def _lagged(diffs, t):
+    # Features for predicting diffs[t]: previous N_LAGS log-growth rates and quarter of year
+    return np.append(diffs[t - N_LAGS:t], t % 4)
+
+
+def _sarimax(log_values):
+    seasonal = (0, 1, 1, 4) if len(log_values) >= 12 else (0, 0, 0, 0)
+    return SARIMAX(log_values, order=(1, 1, 0), seasonal_order=seasonal).fit(disp=False)
+
+
+def _train_sheet(key, history, state=None):
+    """Walk-forward one-step predictions for quarters MIN_TRAIN_QUARTERS..len(history).
+
+    The gradient-boosted model on lagged log-growth is warm-started with a few extra rounds
+    after each quarter, and the SARIMAX filter is extended with `append` instead of refitting.
+    Both are averaged on the log scale. If `state` covers a prefix of `history`, the walk
+    resumes from where it stopped.
+    """
+    n = len(history)
+    if n < MIN_TRAIN_QUARTERS or np.any(history <= 0):
+        return key, None, None
+
+    log_values = np.log(history)
+    diffs = np.diff(log_values, prepend=np.nan)
+
+    resume = (state is not None and len(state["history"]) <= n
+              and np.array_equal(state["history"], history[:len(state["history"])]))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        if resume:
+            booster, sarimax, preds = state["booster"], state["sarimax"], list(state["preds"])
+            start = len(state["history"])
+            new_obs = []
+        else:
+            start = MIN_TRAIN_QUARTERS
+            rows = range(N_LAGS + 1, start)
+            booster = XGBRegressor(n_estimators=INITIAL_ROUNDS, max_depth=2, learning_rate=0.05)
+            booster.fit(np.array([_lagged(diffs, t) for t in rows]), diffs[list(rows)])
+            sarimax = _sarimax(log_values[:start])
+            preds = []
+            new_obs = []
+
+        for t in range(start, n + 1):
+            if len(new_obs):
+                sarimax = sarimax.append(new_obs, refit=False)
+            xgb_log = log_values[t - 1] + booster.predict(_lagged(diffs, t)[None, :])[0]
+            sarimax_log = sarimax.forecast(1)[0]
+            preds.append(float(np.exp((xgb_log + sarimax_log) / 2)))
+
+            if t < n:
+                rows = list(range(N_LAGS + 1, t + 1))
+                warm = XGBRegressor(n_estimators=WARM_ROUNDS, max_depth=2, learning_rate=0.05)
+                warm.fit(np.array([_lagged(diffs, r) for r in rows]), diffs[rows], xgb_model=booster.get_booster())
+                booster = warm
+                new_obs = log_values[t:t + 1]
+
+    # Both models have now seen every observed quarter; the final (out-of-sample) prediction
+    # is re-derived on resume, so it is not kept in the state
+    state = {"history": history, "booster": booster, "sarimax": sarimax, "preds": preds[:-1]}
+    return key, np.array(preds), state
+
+
+def train_forecast_models(table, state=None, n_jobs=None):
+    """Rebuild the Predicted column from each sheet's Actual history.
+
+    Sheets with fewer than MIN_TRAIN_QUARTERS actuals keep the workbook's values.
+    Returns the updated table and the per-sheet model state for the next refit.
+    """
+    state = {} if state is None else state
+    jobs = []
+    for key, sheet in table.groupby(["Workbook", "Sheet"], sort=False):
+        actual = sheet["Actual"].to_numpy()
+        observed = int(np.argmax(np.isnan(actual))) if np.isnan(actual).any() else len(actual)
+        jobs.append((key, actual[:observed], state.get(key)))
+
+    if n_jobs == 1 or not jobs:
+        results = [_train_sheet(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_train_sheet, *zip(*jobs)))
+
+    table = table.copy()
+    new_state = {}
+    for key, preds, sheet_state in results:
+        if preds is None:
+            continue
+        new_state[key] = sheet_state
+        rows = table.index[(table["Workbook"] == key[0]) & (table["Sheet"] == key[1])]
+        target = rows[MIN_TRAIN_QUARTERS:MIN_TRAIN_QUARTERS + len(preds)]
+        table.loc[target, "Predicted"] = preds[:len(target)]
+        table.loc[target, "Source"] = "model"
+    return table, new_state
+
+
+@st.cache_resource
+def _model_state():
+    # Fitted per-sheet state, reused across reruns so a new quarter only costs one warm-start step
+    return {"sheets": {}, "lock": threading.Lock()}
+
+
+@st.cache_data
+def _cached_forecast_table(version):
+    state = _model_state()
+    with state["lock"]:
+        table, new_state = train_forecast_models(read_forecast_workbooks(), state["sheets"])
+        state["sheets"].update(new_state)
+    return table
+
+
+def load_forecast_table(workbook=None, sheet=None):
+    """The tidy forecast table read by Home's cards and the four forecast pages."""
+    table = _cached_forecast_table(data_version("data/*.xlsx"))
+    if workbook is not None:
+        table = table[table["Workbook"] == workbook]
+    if sheet is not None:
+        table = table[table["Sheet"] == sheet]
+    return table.reset_index(drop=True)
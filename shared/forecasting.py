@@ -0,0 +1,130 @@
+import warnings
+import numpy as np
+import pandas as pd
+import streamlit as st
+import plotly.graph_objects as go
+from concurrent.futures import ProcessPoolExecutor
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+from shared.index_series import all_index_series
+from shared.feature_store import data_version
+from shared.mapped_store import mapped_frame
+
+FORECAST_HORIZON = 6
+INTERVAL_ALPHA = 0.1  # 90% prediction interval
+MIN_HISTORY = 12
+MAX_CACHED_FORECASTS = 4
+_SEEN_VERSION = {"version": None}
+
+# Candidate models, ranked per index by AIC
+CANDIDATES = [
+    ("ARIMA", (1, 0, 0)),
+    ("ARIMA", (2, 0, 0)),
+    ("ARIMA", (1, 0, 1)),
+    ("ARIMA", (0, 1, 1)),
+    ("ARIMA", (1, 1, 0)),
+    ("ARIMA", (1, 1, 1)),
+    ("ETS", None),
+    ("ETS", "add"),
+]
+
+
+def _fit_candidate(name, values, kind, spec, horizon):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            if kind == "ARIMA":
+                result = ARIMA(values, order=spec).fit()
+                frame = result.get_forecast(horizon).summary_frame(alpha=INTERVAL_ALPHA)
+                lower, upper = frame['mean_ci_lower'], frame['mean_ci_upper']
+                label = f"ARIMA{spec}"
+            else:
+                result = ETSModel(values, error="add", trend=spec, damped_trend=spec is not None).fit(disp=False)
+                frame = result.get_prediction(len(values), len(values) + horizon - 1).summary_frame(alpha=INTERVAL_ALPHA)
+                lower, upper = frame['pi_lower'], frame['pi_upper']
+                label = "ETS(A,Ad,N)" if spec else "ETS(A,N,N)"
+        except Exception:
+            return name, np.inf, None
+    if not np.isfinite(result.aic):
+        return name, np.inf, None
+    return name, result.aic, {
+        "model": label,
+        "forecast": np.asarray(frame['mean']),
+        "lower": np.asarray(lower),
+        "upper": np.asarray(upper),
+    }
+
+
+def fit_forecasts(series_by_index, horizon=FORECAST_HORIZON, n_jobs=1):
+    """Fit every candidate for every index and keep the best by AIC.
+
+    Returns a tidy frame: Index, Date, Forecast, Lower, Upper, Model. n_jobs other than 1
+    fits in a process pool (None: one process per CPU); the store builder does, requests do not.
+    """
+    jobs = []
+    for name, series in series_by_index.items():
+        series = series.dropna()
+        if len(series) < MIN_HISTORY:
+            continue
+        values = series.to_numpy(dtype=float)
+        jobs += [(name, values, kind, spec, horizon) for kind, spec in CANDIDATES]
+
+    if n_jobs == 1:
+        results = [_fit_candidate(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(_fit_candidate, *zip(*jobs))) if jobs else []
+
+    best = {}
+    for name, aic, fit in results:
+        if fit is not None and aic < best.get(name, (np.inf, None))[0]:
+            best[name] = (aic, fit)
+
+    frames = []
+    for name, (_, fit) in best.items():
+        last_date = series_by_index[name].dropna().index[-1]
+        frames.append(pd.DataFrame({
+            "Index": name,
+            "Date": pd.date_range(last_date + pd.offsets.MonthBegin(), periods=horizon, freq="MS"),
+            "Forecast": fit["forecast"],
+            "Lower": fit["lower"],
+            "Upper": fit["upper"],
+            "Model": fit["model"],
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["Index", "Date", "Forecast", "Lower", "Upper", "Model"])
+    return pd.concat(frames, ignore_index=True)
+
+
+@st.cache_data(persist="disk", max_entries=MAX_CACHED_FORECASTS, show_spinner="Fitting index forecasts...")
+def _cached_forecasts(version, horizon):
+    return fit_forecasts(all_index_series(), horizon)
+
+
+def load_forecasts(index_name=None, horizon=FORECAST_HORIZON):
+    """Forecasts for all indices (or one), from the shared store or fitted once per data version."""
+    forecasts = mapped_frame("forecasts") if horizon == FORECAST_HORIZON else None
+    if forecasts is None:
+        version = data_version("data/*.csv")
+        if _SEEN_VERSION["version"] not in (None, version):
+            # max_entries only bounds the in-memory copies; files of superseded versions go here
+            _cached_forecasts.clear()
+        _SEEN_VERSION["version"] = version
+        forecasts = _cached_forecasts(version, horizon)
+    if index_name is None:
+        return forecasts
+    return forecasts[forecasts["Index"] == index_name].reset_index(drop=True)
+
+
+def add_forecast_traces(fig, forecast, x=None, scale=1.0, color="rgba(200, 200, 200, 0.9)"):
+    """Overlay a forecast line and its prediction interval on an existing line chart."""
+    if forecast.empty:
+        return fig
+    x = forecast["Date"] if x is None else x
+    fig.add_trace(go.Scatter(x=x, y=forecast["Upper"] * scale, mode="lines", line=dict(width=0),
+                             hoverinfo="skip", showlegend=False))
+    fig.add_trace(go.Scatter(x=x, y=forecast["Lower"] * scale, mode="lines", line=dict(width=0),
+                             fill="tonexty", fillcolor="rgba(200, 200, 200, 0.2)", name="90% forecast interval"))
+    fig.add_trace(go.Scatter(x=x, y=forecast["Forecast"] * scale, mode="lines",
+                             line=dict(color=color, dash="dash"), name=f"Forecast ({forecast['Model'].iloc[0]})"))
+    return fig
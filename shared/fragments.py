@@ -0,0 +1,181 @@
+import string
+from functools import lru_cache
+import streamlit as st
+
+# HTML fragments shared by Home, the cover page and the index pages, kept in one place so
+# every page styles its cards the same way. Templates use string.Template ($name
+# placeholders, so CSS braces need no escaping) and are compiled once at import. Rendered
+# fragments are memoised on their values, so the static style blocks each page emits on
+# every rerun are built once per process.
+
+MAX_FRAGMENTS = 2048
+
+TEMPLATES = {
+    # KPI cards on the CDI and IMP pages; bg1..bg3 are linear-gradient arguments
+    "kpi_styles": """
+<style>
+.kpi-container {
+    display: flex;
+    gap: 1rem;
+    flex-wrap: wrap;
+    margin-bottom: 1rem;
+}
+.kpi-card {
+    flex: 1;
+    padding: 1rem;
+    border-radius: 16px;
+    background: rgba(255, 255, 255, 0.08);
+    backdrop-filter: blur(12px);
+    -webkit-backdrop-filter: blur(12px);
+    color: white;
+    min-width: 200px;
+    border: 1px solid rgba(255, 255, 255, 0.15);
+    box-shadow: 0 4px 20px rgba(0, 0, 0, 0.3);
+}
+.kpi-title {
+    font-size: 1rem;
+    font-weight: 600;
+    margin-bottom: 0.3rem;
+    color: #ddd;
+}
+.kpi-value {
+    font-size: 1.8rem;
+    font-weight: bold;
+}
+.kpi-delta {
+    font-size: 1.2rem;
+    margin-top: 0.2rem;
+    font-weight: bold;
+}
+.bg-1 { background: linear-gradient($bg1); }
+.bg-2 { background: linear-gradient($bg2); }
+.bg-3 { background: linear-gradient($bg3); }
+</style>
+""",
+    # Three-tone cards on the EV, Housing, Renewable and IAI pages
+    "card_styles": """
+<style>
+.card {
+    padding: 1rem;
+    border-radius: 16px;
+    box-shadow: 0 4px 12px rgba(0,0,0,0.1);
+    color: white;
+    font-weight: bold;
+    text-align: center;
+}
+.green-card { background: linear-gradient($green); }
+.grey-card { background: linear-gradient($grey); }
+.red-card { background: linear-gradient($red); }
+</style>
+""",
+    "forecast_card": """
+    <a href='/$link' target='_self' style='text-decoration: none;'>
+        <div style='
+            width: 100%;
+            border-radius: 12px;
+            padding: 16px;
+            background-color: #111;
+            border: 1px solid #333;
+            box-shadow: 1px 2px 6px rgba(0,0,0,0.15);
+            transition: 0.2s ease-in-out;
+        ' onmouseover="this.style.backgroundColor='#1e1e1e'" onmouseout="this.style.backgroundColor='#111'">
+            <div style='font-size: 15px; font-weight: 600; color: #fff;'>
+                $title ($unit) →
+            </div>
+            <div style='font-size: 13px; color: #ccc; padding-top: 4px;'>Quarter: $quarter</div>
+            <div style='font-size: 13px; color: #ccc;'>
+                <span style='color: #007381;'>Actual: $actual</span> &nbsp;|&nbsp;
+                <span style='color: #E85412;'>Predicted: $predicted</span>
+            </div>
+        </div>
+    </a>
+    """,
+    "country_card": """
+    <div style="text-align: center; background-color: #111; padding: 15px; border-radius: 10px; border: 1px solid #333;">
+        $flag<br>
+        <span style='font-size: 20px; font-weight: bold;'>$value</span><br>
+        <span style='font-size: 13px; color: grey;'>$date</span><br>
+        <span style='color: $color; font-size: 13px;'>$change</span>
+    </div>
+    """,
+    "flag": "<img src='$src' width='32' style='vertical-align: middle;'>",
+    "macro_row": "<tr><td>$parameter</td>$cells</tr>",
+    "macro_table": """
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            font-family: 'Segoe UI', sans-serif;
+            background-color: transparent;
+        }
+
+        .wrapper {
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            width: 100%;
+        }
+
+        .macro-table {
+            width: 100%;
+            max-width: 800px;
+            border-collapse: collapse;
+            background-color: #1e1e1e;
+            color: white;
+            border: 1px solid #333;
+            border-radius: 10px;
+            overflow: hidden;
+        }
+
+        .macro-table th, .macro-table td {
+            text-align: center;
+            padding: 16px;
+            font-size: 17px;
+        }
+
+        .macro-table th {
+            background-color: #2e2e2e;
+            font-weight: bold;
+        }
+
+        .macro-table td:first-child {
+            text-align: left;
+            font-weight: 600;
+            color: #ccc;
+            padding-left: 20px;
+        }
+    </style>
+
+    <div class='wrapper'>
+        <table class='macro-table'>
+            <tr>
+                <th>Parameter</th>
+                $headers
+            </tr>
+            $rows
+        </table>
+    </div>
+    """,
+}
+
+
+COMPILED = {name: string.Template(template) for name, template in TEMPLATES.items()}
+
+
+@lru_cache(maxsize=MAX_FRAGMENTS)
+def _render(name, values):
+    return COMPILED[name].substitute(dict(values))
+
+
+def render(name, **values):
+    """Fragment `name` with `values` substituted, memoised on the values' text."""
+    return _render(name, tuple(sorted((key, str(value)) for key, value in values.items())))
+
+
+def flag_html(country, flags):
+    """Flag image for `country`, or its name where no flag is known."""
+    return render("flag", src=flags[country]) if country in flags else country
+
+
+def emit(name, container=st, **values):
+    container.markdown(render(name, **values), unsafe_allow_html=True)
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from shared.bootstrap import block_bootstrap_indices, run_chunks
+from shared.feature_store import data_version
+from shared.index_series import INDEX_REGISTRY, evaluate_index
+
+# Monte Carlo stress test for the Housing Affordability index. Joint monthly changes in
+# income (Per Capita NNI), prices (Property Price Index) and the housing loan rate are
+# block-resampled from history, so their co-movement and persistence carry into the paths.
+# Affordability on a path is the index's NNI / PPI ratio, scaled by how the monthly EMI on a
+# fixed-tenor loan at the path's rate compares with the EMI at today's rate.
+
+HOUSING_INDEX = "Housing Affordability Stress Index"
+STRESS_HORIZON = 24
+N_PATHS = 5000
+LOAN_TENOR_MONTHS = 240
+MIN_RATE = 0.5
+FAN_LEVELS = (5, 25, 50, 75, 95)
+
+_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+
+def emi_factor(rate_pct, months=LOAN_TENOR_MONTHS):
+    """Monthly instalment per unit of loan at an annual rate in percent."""
+    r = np.asarray(rate_pct, dtype=float) / 1200
+    return r / (1 - (1 + r) ** -months)
+
+
+def historical_changes(frame):
+    """(months - 1, 3) array: log-change in NNI, log-change in PPI, change in the loan rate."""
+    return np.column_stack([
+        np.diff(np.log(frame['Per Capita NNI'].to_numpy(dtype=float))),
+        np.diff(np.log(frame['Property Price Index'].to_numpy(dtype=float))),
+        np.diff(frame['Housing Loan Interest Rate'].to_numpy(dtype=float)),
+    ])
+
+
+def _simulate_chunk(changes, start, factor, rate_shock, idx):
+    steps = changes[idx]
+    log_ratio = np.log(start[0] / start[1]) + (steps[..., 0] - steps[..., 1]).cumsum(axis=1)
+    rate = np.maximum(start[2] + rate_shock + steps[..., 2].cumsum(axis=1), MIN_RATE)
+    return np.exp(log_ratio) * factor * emi_factor(start[2]) / emi_factor(rate)
+
+
+def simulate_affordability(changes, start, factor, horizon=STRESS_HORIZON, n_paths=N_PATHS,
+                           rate_shock=0.0, block_size=None, seed=0, n_jobs=1, chunk_size=1000):
+    """(n_paths, horizon) array of simulated affordability, vectorised across paths.
+
+    `start` is today's (NNI, PPI, loan rate); `rate_shock` is a one-off move in the rate,
+    in percentage points, applied from the first simulated month. n_jobs > 1 spreads chunks
+    of paths over a process pool.
+    """
+    if horizon > len(changes):
+        raise ValueError(f"horizon {horizon} exceeds the {len(changes)} months of history")
+    idx = block_bootstrap_indices(len(changes), n_paths, block_size, seed)[:, :horizon]
+    func = partial(_simulate_chunk, changes, np.asarray(start, dtype=float), factor, rate_shock)
+    return run_chunks(func, idx, n_jobs, chunk_size)
+
+
+def fan_table(paths, last_date, current, levels=FAN_LEVELS):
+    """Percentiles of the simulated index per future month, and the share of paths below today."""
+    dates = pd.date_range(last_date + pd.offsets.MonthBegin(1), periods=paths.shape[1], freq='MS')
+    table = pd.DataFrame(np.percentile(paths, levels, axis=0).T, columns=[f"P{q}" for q in levels])
+    table.insert(0, "Date", dates)
+    table["Below Today (%)"] = (paths < current).mean(axis=0) * 100
+    return table
+
+
+def _run_stress(changes, start, factor, last_date, current, rate_shock, n_jobs):
+    paths = simulate_affordability(changes, start, factor, rate_shock=rate_shock, n_jobs=n_jobs)
+    return fan_table(paths, last_date, current)
+
+
+@st.cache_resource
+def _stress_job(version, rate_shock, n_jobs):
+    frame = evaluate_index(HOUSING_INDEX)["frame"].sort_values('Date')
+    frame = frame.dropna(subset=['Per Capita NNI', 'Property Price Index', 'Housing Loan Interest Rate'])
+    last = frame.iloc[-1]
+    start = (last['Per Capita NNI'], last['Property Price Index'], last['Housing Loan Interest Rate'])
+    factor = INDEX_REGISTRY[HOUSING_INDEX]["params"]["factor"]
+    return _EXECUTOR.submit(_run_stress, historical_changes(frame), start, factor,
+                            last['Date'], last['Index'], rate_shock, n_jobs)
+
+
+def start_housing_stress(rate_shock=0.0, n_jobs=1):
+    """Start (or reuse) the simulation for the current data version in a background thread.
+
+    Returns a Future whose result is the fan table; the page can render while it runs. A
+    run that failed is dropped from the cache and started again on the next call.
+    """
+    args = (data_version("data/*.csv"), rate_shock, n_jobs)
+    job = _stress_job(*args)
+    if job.done() and job.exception() is not None:
+        _stress_job.clear(*args)
+        job = _stress_job(*args)
+    return job
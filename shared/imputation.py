@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+# Per-feature gap-filling policies:
+#   "ffill"    carry the last published value forward
+#   "seasonal" interpolate the deseasonalised series, then add the month-of-year profile back
+#   "em_pca"   iterative low-rank (EM-PCA) reconstruction from the other features in the same month
+#   None       leave gaps as they are
+POLICIES = ("ffill", "seasonal", "em_pca", None)
+
+
+def _seasonal_fill(frame, months):
+    trend = frame.rolling(12, center=True, min_periods=6).mean()
+    profile = (frame - trend).groupby(months.to_numpy()).mean()
+    seasonal = profile.reindex(months.to_numpy()).fillna(0).to_numpy()
+    deseasonalised = frame - seasonal
+    # Linear inside gaps; at the ragged edge the last deseasonalised level is carried forward
+    filled = deseasonalised.interpolate(limit_area='inside').ffill().bfill()
+    return filled + seasonal
+
+
+def _em_pca_fill(X, rank=1, n_iter=100, tol=1e-6):
+    X = np.asarray(X, dtype=float)
+    missing = np.isnan(X)
+    if not missing.any():
+        return X
+    mean = np.nanmean(X, axis=0)
+    std = np.nanstd(X, axis=0)
+    std[~(std > 0)] = 1.0
+    Z = np.where(missing, 0.0, (X - mean) / std)
+    for _ in range(n_iter):
+        centre = Z.mean(axis=0)
+        U, s, Vt = np.linalg.svd(Z - centre, full_matrices=False)
+        recon = (U[:, :rank] * s[:rank]) @ Vt[:rank] + centre
+        delta = np.abs(recon[missing] - Z[missing]).max()
+        Z[missing] = recon[missing]
+        if delta < tol:
+            break
+    return Z * std + mean
+
+
+def impute(df, policies, min_observed=0.5, date_col='Date'):
+    """Fill gaps in the columns of `policies` according to each column's policy.
+
+    Rows where fewer than `min_observed` of those columns were published are dropped rather
+    than imputed. Returns (imputed frame sorted by date, boolean mask of imputed cells).
+    """
+    cols = list(policies)
+    df = df.sort_values(date_col)
+    df = df[df[cols].notna().mean(axis=1) >= min_observed].copy()
+    mask = df[cols].isna()
+
+    ffill_cols = [c for c in cols if policies[c] == "ffill"]
+    seasonal_cols = [c for c in cols if policies[c] == "seasonal"]
+    em_cols = [c for c in cols if policies[c] == "em_pca"]
+
+    if ffill_cols:
+        df[ffill_cols] = df[ffill_cols].ffill()
+    if seasonal_cols:
+        df[seasonal_cols] = _seasonal_fill(df[seasonal_cols], df[date_col].dt.month)
+    if em_cols:
+        # Every policy column informs the reconstruction, but only em_pca columns are written back
+        filled = _em_pca_fill(df[cols].to_numpy())
+        for i, col in enumerate(cols):
+            if col in em_cols:
+                df[col] = np.where(mask[col], filled[:, i], df[col])
+    return df, mask
+
+
+def imputed_summary(mask):
+    """Comma-separated list of imputed features per row, for data tables."""
+    cols = np.array(mask.columns)
+    return pd.Series([", ".join(cols[row]) for row in mask.to_numpy()], index=mask.index)
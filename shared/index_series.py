@@ -0,0 +1,335 @@
+import inspect
+import numpy as np
+import pandas as pd
+import streamlit as st
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.linear_model import LinearRegression
+from shared.dfm import dfm_factor
+from shared.imputation import impute
+from shared.feature_store import CHUNK_ROWS, data_version, read_chunks, source_view
+from shared.derived import derive_columns
+from shared.streaming import moments_from_rows, pca_from_moments
+from shared.mapped_store import mapped_frame, mapped_object
+
+# Declarative registry of the dashboard indices. Each entry names its source view and input
+# features (canonical names from shared/feature_store.py), optional sign flips and gap-filling
+# policy, a transform with its parameters, and the display scale. Keys match INDEX_CONFIG in
+# Home.py; an index is only computed when something asks for it.
+
+CDI_FEATURES = ['UPI Transactions', 'GST Revenue', 'Total Vehicle Sales', 'Housing Sales', 'Power Consumption']
+EV_FEATURES = ['EV Four-wheeler Sales', 'EV Two-wheeler Sales', 'EV Three-wheeler Sales']
+IAI_FEATURES = [
+    "Highway construction actual", "Railway line construction actual",
+    "Power T&D line constr (220KV plus)", "Cement price",
+    "Budgetary allocation for infrastructure sector"
+]
+IAI_TARGET = "GVA: construction (Basic Price)"
+RETAIL_FEATURES = ['CCI', 'Inflation', 'Private Consumption', 'UPI Transactions', 'Repo Rate', 'Per Capita NNI']
+RETAIL_TRAINING_END = pd.to_datetime("2024-03-01")
+
+# Gap-filling policy per input feature (see shared/imputation.py)
+HOUSING_IMPUTATION = {'Property Price Index': 'seasonal', 'Per Capita NNI': 'seasonal'}
+IAI_IMPUTATION = {col: 'seasonal' for col in IAI_FEATURES}
+RETAIL_IMPUTATION = {
+    'CCI': 'ffill',
+    'Inflation': 'ffill',
+    'Private Consumption': 'em_pca',
+    'UPI Transactions': 'seasonal',
+    'Repo Rate': 'ffill',
+    'Per Capita NNI': 'em_pca',
+}
+
+# Renewable readiness: installed MW x capacity factor x the hours the row covers gives
+# generation, its share of consumption and the MNRE budget are min-max scaled and blended.
+# Evaluated as a node graph (shared/derived.py); any of the constants can be overridden per
+# evaluation.
+RENEWABLE_CONSTANTS = {
+    "CF_SOLAR": 0.2,
+    "CF_WIND": 0.3,
+    "CF_HYDRO": 0.4,
+    "W_BUDGET": 0.5,
+    "W_SHARE": 0.5,
+}
+
+
+def _generation(capacity, cf, hours):
+    return capacity * cf * hours / 1000
+
+
+def _minmax(values):
+    # Along the last axis, so the same node also scales a (samples, months) parameter sweep
+    lo = np.nanmin(values, axis=-1, keepdims=True)
+    hi = np.nanmax(values, axis=-1, keepdims=True)
+    return (values - lo) / (hi - lo)
+
+
+RENEWABLE_GRAPH = {
+    'Solar Generation (GWh)': (_generation, ['Solar power plants Installed capacity', 'CF_SOLAR', 'Period Hours']),
+    'Wind Generation (GWh)': (_generation, ['Wind power plants Installed capacity', 'CF_WIND', 'Period Hours']),
+    'Hydro Generation (GWh)': (_generation, ['Hydro power plants Installed capacity', 'CF_HYDRO', 'Period Hours']),
+    'Total Renewable Generation (GWh)': (
+        lambda solar, wind, hydro: solar + wind + hydro,
+        ['Solar Generation (GWh)', 'Wind Generation (GWh)', 'Hydro Generation (GWh)'],
+    ),
+    'Power Consumption (GWh)': (lambda bu: bu * 1000, ['Power Consumption']),
+    'Renewable Share (%)': (
+        lambda gen, consumption: gen / consumption * 100,
+        ['Total Renewable Generation (GWh)', 'Power Consumption (GWh)'],
+    ),
+    'Norm_Budget': (_minmax, ['Budgetary allocation for MNRE sector']),
+    'Norm_Share': (_minmax, ['Renewable Share (%)']),
+    'Readiness Score': (
+        lambda budget, share, w_budget, w_share: w_budget * budget + w_share * share,
+        ['Norm_Budget', 'Norm_Share', 'W_BUDGET', 'W_SHARE'],
+    ),
+}
+
+
+# === Transforms ===
+# Each takes the prepared frame, the imputed-cell mask, the index's declared inputs and its
+# parameters, and returns the rows it scores with an 'Index' column added, plus the fitted
+# pieces pages reuse.
+
+def pca_composite(df, mask, inputs, train_end=None, normalise=False, method="pca", key=None):
+    """First principal component of the standardised inputs.
+
+    Fitted on complete months, or on months up to `train_end`, from their running mean and
+    covariance. `normalise` rescales to the training range and clips to [0, 1].
+    method="dfm" keeps months with some inputs missing (Kalman-filtered dynamic factor,
+    cached under `key`).
+    """
+    complete = df.dropna(subset=inputs)
+    train = complete if train_end is None else complete[complete['Date'] <= train_end]
+    # Scaler and loadings come from running moments of the training rows (shared/streaming.py)
+    scaler, pca = pca_from_moments(moments_from_rows(train[inputs]), inputs)
+    train_scores = pca.transform(scaler.transform(train[inputs]))[:, 0]
+    model = {"scaler": scaler, "pca": pca, "dfm": None}
+
+    if method == "dfm":
+        df = df.dropna(subset=inputs, how='all').copy()
+        model["dfm"] = dfm_factor(key, df[inputs].to_numpy(), pca.components_[0])
+        df['Index'] = model["dfm"]['Smoothed'].to_numpy()
+    else:
+        df = complete.copy()
+        df['Index'] = pca.transform(scaler.transform(df[inputs]))[:, 0]
+    if normalise:
+        model["train_range"] = (train_scores.min(), train_scores.max())
+        df['Index'] = ((df['Index'] - train_scores.min()) / (train_scores.max() - train_scores.min())).clip(0, 1)
+    return df, model
+
+
+def regression_weighted(df, mask, inputs, target):
+    """Min-max scaled inputs weighted by their regression coefficients on `target`.
+
+    Weights are fitted on fully observed months only; imputed months are scored with them.
+    """
+    features = [col for col in inputs if col != target]
+    df = df.copy()
+    fit_rows = df[target].notna() & ~mask.any(axis=1)
+    scaler = MinMaxScaler().fit(df.loc[fit_rows, features])
+    model = LinearRegression().fit(scaler.transform(df.loc[fit_rows, features]), df.loc[fit_rows, target])
+    weights = model.coef_ / model.coef_.sum()
+    df['Index'] = scaler.transform(df[features]) @ weights
+    return df, {"scaler": scaler, "regression": model, "weights": weights, "fit_rows": fit_rows}
+
+
+def ratio(df, mask, inputs, denominator, factor=1.0):
+    """Sum of the other inputs over `denominator`, times `factor`."""
+    numerator = [col for col in inputs if col != denominator]
+    df = df.copy()
+    df['Index'] = df[numerator].sum(axis=1) / df[denominator] * factor
+    return df, {}
+
+
+def passthrough(df, mask, inputs, column=None):
+    column = column or inputs[0]
+    df = df.dropna(subset=[column]).copy()
+    df['Index'] = df[column]
+    return df, {}
+
+
+TRANSFORMS = {
+    "pca_composite": pca_composite,
+    "regression_weighted": regression_weighted,
+    "ratio": ratio,
+    "passthrough": passthrough,
+}
+
+INDEX_REGISTRY = {
+    "Consumer Demand Index (CDI)": {
+        "source": "cdi", "inputs": CDI_FEATURES,
+        "transform": "pca_composite", "params": {"key": "cdi"},
+        "scale": (-5, 5),
+    },
+    "EV Market Adoption Rate": {
+        "source": "ev", "inputs": EV_FEATURES + ['Total Vehicle Sales'],
+        "transform": "ratio", "params": {"denominator": 'Total Vehicle Sales'},
+        "scale": (0, 10),
+    },
+    "Housing Affordability Stress Index": {
+        "source": "housing", "inputs": list(HOUSING_IMPUTATION), "imputation": HOUSING_IMPUTATION,
+        "transform": "ratio",
+        "params": {"denominator": 'Property Price Index', "factor": 0.003},
+        "scale": (0, 2.5),
+    },
+    "Renewable Transition Readiness Score": {
+        "source": "renewable",
+        "inputs": ['Solar power plants Installed capacity', 'Wind power plants Installed capacity',
+                   'Hydro power plants Installed capacity', 'Budgetary allocation for MNRE sector',
+                   'Power Consumption'],
+        "derived": RENEWABLE_GRAPH, "constants": RENEWABLE_CONSTANTS,
+        "transform": "passthrough", "params": {"column": 'Readiness Score'},
+        "scale": (0, 5),
+    },
+    "Infrastructure Activity Index (IAI)": {
+        "source": "iai", "inputs": IAI_FEATURES + [IAI_TARGET], "imputation": IAI_IMPUTATION,
+        "transform": "regression_weighted", "params": {"target": IAI_TARGET},
+        "scale": (0, 5),
+    },
+    "IMP Index": {
+        "source": "imp", "inputs": ['IMP Scale'],
+        "transform": "passthrough", "params": {},
+        "scale": (-3, 3),
+    },
+    "Retail Health Index": {
+        "source": "retail", "inputs": RETAIL_FEATURES, "imputation": RETAIL_IMPUTATION,
+        # Higher inflation and policy rates weigh on retail, so they enter with the sign flipped
+        "signs": {'Inflation': -1, 'Repo Rate': -1},
+        "transform": "pca_composite",
+        "params": {"train_end": RETAIL_TRAINING_END, "normalise": True},
+        "scale": (0, 1),
+    },
+}
+
+
+def prepared_view(spec, freq="MS"):
+    """A registry entry's source view with its sign flips and gap-filling applied, and the imputed-cell mask."""
+    df = source_view(spec["source"], freq=freq).sort_values('Date')
+    for col, sign in spec.get("signs", {}).items():
+        df[col] = sign * df[col]
+    if spec.get("imputation"):
+        df, mask = impute(df, spec["imputation"])
+    else:
+        mask = pd.DataFrame(np.zeros((len(df), 0), dtype=bool), index=df.index)
+    return df, mask
+
+
+def compute_index(name, freq="MS", **overrides):
+    """Run one registry entry: {"frame": scored rows with 'Index', "mask": imputed cells, "model": ...}.
+
+    `overrides` replace transform parameters or derived-column constants, e.g. method="dfm"
+    for the CDI or CF_SOLAR=0.22 for the Renewable score. `freq` scores the index on another
+    grain of its source (see FREQUENCIES in shared/feature_store.py).
+    """
+    spec = INDEX_REGISTRY[name]
+    df, mask = prepared_view(spec, freq)
+    constants = spec.get("constants", {})
+    if spec.get("derived"):
+        df = derive_columns(df, spec["derived"], {k: overrides.get(k, v) for k, v in constants.items()})
+
+    params = {**spec["params"], **{k: v for k, v in overrides.items() if k not in constants}}
+    if "key" in params:
+        # Incremental state (the DFM filter) is kept per index and frequency
+        params["key"] = (params["key"], freq)
+    frame, model = TRANSFORMS[spec["transform"]](df, mask, spec["inputs"], **params)
+    return {"frame": frame, "mask": mask.loc[frame.index], "model": model}
+
+
+@st.cache_data
+def _cached_index(name, overrides, freq, version):
+    return compute_index(name, freq, **overrides)
+
+
+def effective_overrides(name, overrides):
+    """The overrides that change the result: those that differ from the entry's own settings."""
+    spec = INDEX_REGISTRY[name]
+    signature = inspect.signature(TRANSFORMS[spec["transform"]]).parameters.values()
+    defaults = {p.name: p.default for p in signature if p.default is not inspect.Parameter.empty}
+    defaults.update(spec["params"])
+    defaults.update(spec.get("constants", {}))
+    return {k: v for k, v in overrides.items() if not (k in defaults and defaults[k] == v)}
+
+
+def stored_result(name):
+    """The default monthly result of `name` from the shared store, or None if none is published."""
+    frame = mapped_frame(f"results/{name}/frame")
+    mask = mapped_frame(f"results/{name}/mask")
+    model = mapped_object(f"results/{name}/model")
+    if frame is None or mask is None or model is None:
+        return None
+    return {"frame": frame, "mask": mask, "model": dict(model)}
+
+
+def evaluate_index(name, freq="MS", **overrides):
+    """`compute_index`, memoised per index, frequency, parameter overrides and data version.
+
+    The default monthly result is read from the shared store when one is published, so a
+    worker neither parses the data nor refits the index.
+    """
+    overrides = effective_overrides(name, overrides)
+    if freq == "MS" and not overrides:
+        stored = stored_result(name)
+        if stored is not None:
+            return stored
+    return _cached_index(name, overrides, freq, data_version("data/*.csv"))
+
+
+def index_series(name, freq="MS", **overrides):
+    """Full history of one index as a Date-indexed Series, monthly by default."""
+    frame = evaluate_index(name, freq, **overrides)["frame"]
+    return pd.Series(frame['Index'].to_numpy(), index=pd.DatetimeIndex(frame['Date'], name='Date'), name=name)
+
+
+def stream_index(name, path=None, chunk_rows=CHUNK_ROWS, keys=()):
+    """Score a PCA index over a file too large to hold in memory, yielding scored chunks.
+
+    The index's source file is read in chunks, or `path`, any file laid out like it (plus
+    `keys`, e.g. a region column). The scaler and first component are fitted from running
+    moments over one pass of the training rows, a second pass finds the training score
+    range when the index is normalised, and the last pass scores chunk by chunk.
+
+    Only rows complete in the file are scored, with their inputs as published: gap-filling
+    works on whole histories and is not applied. On those rows the scores agree with
+    `evaluate_index`, except where the feature store takes an input from a higher-priority
+    file (the CDI's UPI and power consumption), which the file's own copy may not match.
+    """
+    spec = INDEX_REGISTRY[name]
+    if spec["transform"] != "pca_composite":
+        raise ValueError(f"{name} is not a PCA index")
+    inputs, params = spec["inputs"], spec["params"]
+    train_end = params.get("train_end")
+
+    def complete_chunks():
+        for chunk in read_chunks(spec["source"], path, chunk_rows, keys, canonical=True):
+            chunk = chunk.reset_index().dropna(subset=inputs)
+            for col, sign in spec.get("signs", {}).items():
+                chunk[col] = sign * chunk[col]
+            yield chunk
+
+    def training_chunks():
+        for chunk in complete_chunks():
+            yield chunk if train_end is None else chunk[chunk['Date'] <= train_end]
+
+    scaler, pca = pca_from_moments(moments_from_rows(c[inputs].to_numpy() for c in training_chunks()), inputs)
+
+    def scores(chunk):
+        return pca.transform(scaler.transform(chunk[inputs]))[:, 0]
+
+    if params.get("normalise"):
+        lo, hi = np.inf, -np.inf
+        for chunk in training_chunks():
+            if len(chunk):
+                train_scores = scores(chunk)
+                lo, hi = min(lo, train_scores.min()), max(hi, train_scores.max())
+    for chunk in complete_chunks():
+        if not len(chunk):
+            continue
+        chunk['Index'] = scores(chunk)
+        if params.get("normalise"):
+            chunk['Index'] = ((chunk['Index'] - lo) / (hi - lo)).clip(0, 1)
+        yield chunk
+
+
+def all_index_series():
+    return {name: index_series(name) for name in INDEX_REGISTRY}
+
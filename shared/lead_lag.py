@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version, source_view
+from shared.index_series import IAI_TARGET, all_index_series
+
+# Lagged cross-correlation between every pair of indices. Series have different histories,
+# so each lag's Pearson correlation uses only the months both series observe; the six sums
+# it needs (overlap count, sums, sums of squares, cross products) are all correlations of
+# masked arrays and come out of one batched FFT.
+
+MAX_LAG = 24
+MIN_OVERLAP = 12
+# Published series compared alongside the indices: label -> (source, canonical feature)
+COMPANION_SERIES = {"GVA: Construction": ("iai", IAI_TARGET)}
+
+
+def aligned_series(series):
+    """(months, series) frame of the given Date-indexed Series on one monthly calendar."""
+    frame = pd.DataFrame(series)
+    calendar = pd.date_range(frame.index.min(), frame.index.max(), freq='MS', name='Date')
+    return frame.reindex(calendar)
+
+
+def cross_correlation(frame, max_lag=MAX_LAG, min_overlap=MIN_OVERLAP):
+    """(series, series, 2 * max_lag + 1) array of corr(x_i[t], x_j[t + lag]) for lag in -max_lag..max_lag.
+
+    A peak at a positive lag means series i leads series j by that many months. Lags with
+    fewer than `min_overlap` shared months are NaN.
+    """
+    values = frame.to_numpy(dtype=float)
+    mask = ~np.isnan(values)
+    # Centred so the moment sums stay well conditioned
+    x = np.where(mask, values - np.nanmean(values, axis=0), 0.0)
+    n = len(values)
+    nfft = 1 << int(np.ceil(np.log2(2 * n - 1)))
+
+    # Moments 0, 1, 2 of every series: (3, months, series) -> spectra (3, series, nfft)
+    moments = np.stack([mask.astype(float), x, x ** 2])
+    spectra = np.fft.rfft(moments.transpose(0, 2, 1), n=nfft, axis=-1)
+    # sums[a, b, i, j, k] = sum_t moment_a(x_i)[t] * moment_b(x_j)[t + k]
+    sums = np.fft.irfft(np.conj(spectra)[:, None, :, None] * spectra[None, :, None, :], n=nfft, axis=-1)
+    lags = np.arange(-max_lag, max_lag + 1)
+    sums = sums[..., lags % nfft]
+
+    count, sx, sy = sums[0, 0], sums[1, 0], sums[0, 1]
+    sxx, syy, sxy = sums[2, 0], sums[0, 2], sums[1, 1]
+    count = np.round(count)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (count * sxy - sx * sy) / np.sqrt((count * sxx - sx ** 2) * (count * syy - sy ** 2))
+    return np.where(count >= min_overlap, np.clip(corr, -1, 1), np.nan), lags
+
+
+def lead_lag_table(corr, lags, names):
+    """Strongest lagged correlation for every pair, with which series leads."""
+    i, j = np.triu_indices(len(names), k=1)
+    pairs = corr[i, j]
+    best = np.nanargmax(np.where(np.isnan(pairs), -np.inf, np.abs(pairs)), axis=1)
+    peak = pairs[np.arange(len(i)), best]
+    lag = lags[best]
+    table = pd.DataFrame({
+        "Series A": np.asarray(names)[i],
+        "Series B": np.asarray(names)[j],
+        "Peak Lag (months)": lag,
+        "Correlation": peak,
+        "Same-month Correlation": pairs[:, lags == 0][:, 0],
+    })
+    table["Leader"] = np.where(lag > 0, table["Series A"], np.where(lag < 0, table["Series B"], "Coincident"))
+    table = table[~np.isnan(peak)]
+    return table.sort_values("Correlation", key=np.abs, ascending=False).reset_index(drop=True)
+
+
+@st.cache_data
+def _cached_lead_lag(version, max_lag):
+    series = all_index_series()
+    for label, (source, feature) in COMPANION_SERIES.items():
+        view = source_view(source, [feature]).dropna()
+        series[label] = pd.Series(view[feature].to_numpy(), index=pd.DatetimeIndex(view['Date']), name=label)
+    frame = aligned_series(series)
+    corr, lags = cross_correlation(frame, max_lag)
+    names = list(frame.columns)
+    return {"names": names, "lags": lags, "corr": corr, "table": lead_lag_table(corr, lags, names)}
+
+
+def load_lead_lag(max_lag=MAX_LAG):
+    """Cross-correlation cube and lead/lag table for all indices, cached per data version."""
+    return _cached_lead_lag(data_version("data/*.csv"), max_lag)
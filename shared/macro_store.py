@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version
+
+# Tidy store of the macro comparison workbook. Each sheet is one month's briefing with a
+# row per parameter and, per country, a value column "<Country>", "<Country> MoM Change"
+# and "<Country> Date"; any country laid out that way is picked up.
+
+MACRO_FILE = "data/Macro_MoM_Comparison.xlsx"
+# A rise in these is bad news
+REVERSE_PARAMS = ["Unemployment Rate", "Inflation Rate", "Merchandise Imports"]
+# Stored as fractions, shown as percentages
+PERCENT_PARAMS = ["Repo Rate", "Inflation Rate", "Unemployment Rate"]
+NO_CHANGE = ["no change", "0 bps", "0.0%", "0%", "+0 bps", "+0%", "0", "–", "-", "", "na", "n/a", "nan"]
+FLAGS = {"India": "https://flagcdn.com/in.svg", "UK": "https://flagcdn.com/gb.svg"}
+SENTIMENT_COLORS = {1: "green", -1: "red", 0: "grey"}
+
+
+def read_macro_workbook(path=MACRO_FILE):
+    """Every sheet as one long table: Month, Country, Parameter, Value, Change, Date."""
+    frames = []
+    for month, sheet in pd.read_excel(path, sheet_name=None).items():
+        sheet.columns = sheet.columns.str.strip()
+        countries = [c for c in sheet.columns if f"{c} MoM Change" in sheet.columns]
+        for country in countries:
+            frames.append(pd.DataFrame({
+                "Month": month,
+                "Country": country,
+                "Parameter": sheet["Parameter"].astype(str).str.strip(),
+                "Value": pd.to_numeric(sheet[country], errors="coerce"),
+                "Change": sheet[f"{country} MoM Change"].astype(str).str.strip(),
+                "Date": pd.to_datetime(sheet.get(f"{country} Date"), errors="coerce"),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def classify_changes(table):
+    """Direction of each change (+1, -1, 0) and whether it is good news, for the whole table at once."""
+    text = table["Change"].str.lower()
+    direction = np.select(
+        [text.isin(NO_CHANGE), text.str.contains("+", regex=False), text.str.contains(r"[-−]")],
+        [0, 1, -1], default=0,
+    )
+    table = table.copy()
+    table["Direction"] = direction
+    table["Sentiment"] = direction * np.where(table["Parameter"].isin(REVERSE_PARAMS), -1, 1)
+    table["Color"] = table["Sentiment"].map(SENTIMENT_COLORS)
+    table["Arrow"] = np.select([direction > 0, direction < 0], ["▲", "▼"], default="")
+    table["Display Change"] = np.where(direction == 0, "No Change", table["Change"])
+    table["Display Value"] = np.where(
+        table["Parameter"].isin(PERCENT_PARAMS),
+        (table["Value"] * 100).map("{:.2f}%".format),
+        table["Value"].map("{:g}".format),
+    )
+    return table
+
+
+@st.cache_data
+def _cached_macro(version):
+    return classify_changes(read_macro_workbook())
+
+
+def load_macro_store(month=None, countries=None, parameters=None):
+    """Classified macro table for the current workbook version, optionally sliced."""
+    table = _cached_macro(data_version("data/*.xlsx"))
+    if month is not None:
+        table = table[table["Month"] == month]
+    if countries is not None:
+        table = table[table["Country"].isin(countries)]
+    if parameters is not None:
+        table = table[table["Parameter"].isin(parameters)]
+    return table.reset_index(drop=True)
+
+
+def macro_months():
+    """Sheet names in workbook order; the last is the most recent briefing."""
+    return list(dict.fromkeys(load_macro_store()["Month"]))
+
+
+def macro_countries():
+    return list(dict.fromkeys(load_macro_store()["Country"]))
@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import shutil
+import pickle
+import hashlib
+import numpy as np
+import pandas as pd
+from shared.feature_store import content_version
+
+# Memory-mapped store of computed results, shared by every server process on the host.
+# One builder writes a version's frames as .npy files (one per column) into a fresh
+# directory, renames it into place (atomic on one filesystem) and repoints CURRENT; readers
+# map the files read-only, so the pages of every worker are backed by the same physical
+# memory. Small fitted objects (scalers, loadings, regressions) are pickled alongside and
+# unpickled once per process.
+# A version is named after the contents of the data files it was built from. When the data
+# changes, readers keep the last published version while a builder holds the lock (see
+# shared/watcher.py), and otherwise get None and compute in-process.
+
+STORE_ROOT = ".index_store"
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "build.lock"
+KEEP_VERSIONS = 2
+LOCK_TIMEOUT = 600  # seconds after which a builder that never released the lock is presumed dead
+KEY_CHECK_INTERVAL = 1.0  # seconds for which the data files' key is reused on the request path
+_MAPPED = {}  # version key -> mapped store, one mapping per process
+_CURRENT_KEY = {"checked": None, "key": None}
+_LOCK_TOKEN = {}  # root -> contents of the lock file this process holds
+
+
+def store_key(version=None):
+    """Directory name of the store built from `version` (default: the data files as they are now)."""
+    version = content_version("data/*.csv") if version is None else version
+    return hashlib.sha1(repr(version).encode()).hexdigest()[:16]
+
+
+def current_key():
+    """`store_key()` of the data as it is now, re-checked at most every KEY_CHECK_INTERVAL seconds."""
+    now = time.monotonic()
+    if _CURRENT_KEY["checked"] is None or now - _CURRENT_KEY["checked"] >= KEY_CHECK_INTERVAL:
+        _CURRENT_KEY["key"], _CURRENT_KEY["checked"] = store_key(), now
+    return _CURRENT_KEY["key"]
+
+
+# === Writing ===
+
+INDEX_COLUMN = "__index__"
+
+
+def _save_frame(directory, name, frame, files):
+    # A non-default row index (e.g. the rows an index kept) is stored as one more column
+    has_index = not frame.index.equals(pd.RangeIndex(len(frame)))
+    if has_index:
+        frame = frame.rename_axis(INDEX_COLUMN).reset_index()
+    columns = []
+    for col in frame.columns:
+        values = frame[col]
+        entry = {"name": col, "dtype": str(values.dtype), "file": f"{len(files):03d}.npy"}
+        if pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values):
+            array = values.to_numpy()
+        else:
+            # Text columns are stored as integer codes; the labels go in the manifest
+            codes, labels = pd.factorize(values, use_na_sentinel=True)
+            array, entry["categories"] = codes.astype(np.int32), [str(label) for label in labels]
+        np.save(os.path.join(directory, entry["file"]), np.ascontiguousarray(array))
+        files.append(entry["file"])
+        columns.append(entry)
+    return {"rows": len(frame), "columns": columns, "index": has_index}
+
+
+def publish(frames, objects, version=None, root=STORE_ROOT):
+    """Write `frames` ({name: DataFrame}) and `objects` ({name: picklable}) as the store for `version`.
+
+    The files are written to a private directory that is renamed into place only once
+    complete, so a reader never sees a partial version. Returns the version key.
+    """
+    version = content_version("data/*.csv") if version is None else version
+    key = store_key(version)
+    final = os.path.join(root, key)
+    if os.path.exists(os.path.join(final, "manifest.json")):
+        _point_current(root, key)
+        return key
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, f".{key}.{os.getpid()}")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    files = []
+    manifest = {"frames": {name: _save_frame(staging, name, frame, files) for name, frame in frames.items()},
+                "objects": {}, "version": [list(entry) for entry in version]}
+    for name, obj in objects.items():
+        manifest["objects"][name] = f"{len(files):03d}.pkl"
+        with open(os.path.join(staging, manifest["objects"][name]), "wb") as f:
+            pickle.dump(obj, f)
+        files.append(manifest["objects"][name])
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump(manifest, f)
+
+    try:
+        os.rename(staging, final)
+    except OSError:
+        # Another builder published the same version first
+        shutil.rmtree(staging, ignore_errors=True)
+    _point_current(root, key)
+    _prune(root, key)
+    return key
+
+
+def _point_current(root, key):
+    tmp = os.path.join(root, f".{CURRENT_FILE}.{os.getpid()}")
+    with open(tmp, "w") as f:
+        f.write(key)
+    os.replace(tmp, os.path.join(root, CURRENT_FILE))
+
+
+def _prune(root, keep):
+    # Oldest versions go first; a worker still mapping one keeps its files alive until it unmaps
+    versions = sorted((entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.startswith(".")),
+                      key=lambda entry: entry.stat().st_mtime)
+    for entry in versions[:-KEEP_VERSIONS]:
+        if entry.name != keep:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+def _create_lock(lock, root):
+    token = f"{os.getpid()} {time.time()} {os.urandom(8).hex()}"
+    try:
+        fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    _LOCK_TOKEN[root] = token
+    return True
+
+
+def _take_stale_lock(lock):
+    # The stale lock is renamed to a name only this process uses, so of several processes
+    # that found it stale exactly one moves it away. If the lock moved was not the one
+    # found stale (another process replaced it in between), it is put back untouched.
+    try:
+        stale = os.stat(lock)
+    except FileNotFoundError:
+        return True
+    if time.time() - stale.st_mtime <= LOCK_TIMEOUT:
+        return False
+    claimed = f"{lock}.{os.getpid()}.{os.urandom(4).hex()}"
+    try:
+        os.rename(lock, claimed)
+    except FileNotFoundError:
+        return False
+    moved = os.stat(claimed)
+    if (moved.st_ino, moved.st_mtime_ns) != (stale.st_ino, stale.st_mtime_ns):
+        try:
+            os.link(claimed, lock)
+        except FileExistsError:
+            pass
+        os.remove(claimed)
+        return False
+    os.remove(claimed)
+    return True
+
+
+def try_build_lock(root=STORE_ROOT):
+    """True if this process may build; only one process holds the lock at a time."""
+    os.makedirs(root, exist_ok=True)
+    lock = os.path.join(root, LOCK_FILE)
+    if _create_lock(lock, root):
+        return True
+    return _take_stale_lock(lock) and _create_lock(lock, root)
+
+
+def release_build_lock(root=STORE_ROOT):
+    # Only the lock this process created is removed, not one taken over after it went stale
+    lock = os.path.join(root, LOCK_FILE)
+    token = _LOCK_TOKEN.pop(root, None)
+    try:
+        with open(lock) as f:
+            if f.read() == token:
+                os.remove(lock)
+    except FileNotFoundError:
+        pass
+
+
+# === Reading ===
+
+def _map_frame(directory, spec):
+    columns = {}
+    for entry in spec["columns"]:
+        array = np.load(os.path.join(directory, entry["file"]), mmap_mode="r")
+        if "categories" in entry:
+            labels = pd.Categorical.from_codes(np.asarray(array), categories=entry["categories"])
+            columns[entry["name"]] = pd.Series(labels).astype(entry["dtype"])
+        else:
+            columns[entry["name"]] = array
+    # A frame without columns (e.g. a mask of an index that imputes nothing) keeps its row count
+    frame = pd.DataFrame(columns, index=None if columns else pd.RangeIndex(spec["rows"]), copy=False)
+    if spec.get("index"):
+        frame = frame.set_index(INDEX_COLUMN).rename_axis(None)
+    return frame
+
+
+def open_store(key, root=STORE_ROOT):
+    """{"frames", "objects"} of a published version, mapped read-only, or None if it is not published."""
+    if key in _MAPPED:
+        return _MAPPED[key]
+    directory = os.path.join(root, key)
+    try:
+        with open(os.path.join(directory, "manifest.json")) as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    store = {
+        "frames": {name: _map_frame(directory, spec) for name, spec in manifest["frames"].items()},
+        "objects": {name: os.path.join(directory, file) for name, file in manifest["objects"].items()},
+        "loaded": {},
+        "key": key,
+        "version": tuple(tuple(entry) for entry in manifest.get("version", [])),
+    }
+    _MAPPED[key] = store
+    if key == published_key(root):
+        # Once a version is current, older mappings are dropped so their files can be pruned
+        for old in [k for k in _MAPPED if k != key]:
+            del _MAPPED[old]
+    return store
+
+
+def published_key(root=STORE_ROOT):
+    """Key of the most recently published version, or None."""
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def build_in_progress(root=STORE_ROOT):
+    return os.path.exists(os.path.join(root, LOCK_FILE))
+
+
+def current_store(root=STORE_ROOT):
+    """The mapped store for the data as it is now, or None if no builder has published it yet.
+
+    While a builder is refreshing the store, the last published version is served instead,
+    so requests stay warm until the new version is swapped in.
+    """
+    store = open_store(current_key(), root)
+    if store is None and build_in_progress(root) and published_key(root):
+        store = open_store(published_key(root), root)
+    return store
+
+
+def mapped_frame(name):
+    """Frame `name` from the current store (columns backed by the mapped files), or None."""
+    store = current_store()
+    if store is None or name not in store["frames"]:
+        return None
+    return store["frames"][name].copy(deep=False)
+
+
+def mapped_object(name):
+    """Fitted object `name` from the current store, unpickled on first use, or None."""
+    store = current_store()
+    if store is None or name not in store["objects"]:
+        return None
+    return store_object(store, name)
+
+
+def store_object(store, name):
+    """Fitted object `name` of a mapped `store`, unpickled once per process."""
+    if name not in store["loaded"]:
+        try:
+            with open(store["objects"][name], "rb") as f:
+                store["loaded"][name] = pickle.load(f)
+        except FileNotFoundError:
+            # The version was pruned after this process mapped it
+            return None
+    return store["loaded"][name]
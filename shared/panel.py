@@ -0,0 +1,107 @@
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version, read_chunks
+from shared.index_series import CDI_FEATURES
+
+# State-level CDI. The state file has the national CDI columns plus a State column, one row
+# per (state, month). It is stacked into a (region, month, feature) array and every region's
+# standardisation and first component are fitted at once: one batched SVD instead of a PCA
+# per state. Each region is fitted on its own complete months, as the national CDI is.
+
+STATE_CDI_FILE = "data/State_Consumer_Demand.csv"
+REGION_COLUMN = "State"
+MIN_MONTHS = 12  # complete months a region needs before it is scored
+
+
+def panel_available(path=STATE_CDI_FILE):
+    return os.path.exists(path)
+
+
+def read_panel(path=STATE_CDI_FILE):
+    """The state file as one long frame: Date, State and the CDI inputs under their canonical names."""
+    frame = pd.concat(read_chunks("cdi", path, keys=(REGION_COLUMN,), canonical=True)).reset_index()
+    frame[REGION_COLUMN] = frame[REGION_COLUMN].astype(str).str.strip()
+    return frame
+
+
+def stack_panel(frame, inputs=CDI_FEATURES):
+    """(regions, dates, cube) with cube[r, t, k] the value of input k for region r in month t (NaN if absent)."""
+    values = frame.groupby([REGION_COLUMN, 'Date'])[inputs].mean()
+    regions = values.index.get_level_values(0).unique().sort_values()
+    dates = pd.DatetimeIndex(values.index.get_level_values(1).unique().sort_values(), name='Date')
+    full = pd.MultiIndex.from_product([regions, dates])
+    cube = values.reindex(full).to_numpy().reshape(len(regions), len(dates), len(inputs))
+    return list(regions), dates, cube
+
+
+def panel_pca(cube, min_months=MIN_MONTHS):
+    """Standardisation, loadings and scores of every region, from one batched SVD.
+
+    Each region uses only its complete months; incomplete months are zeroed after
+    standardising, which leaves the SVD's right singular vectors unchanged, and are not
+    scored. Signs follow sklearn's PCA (largest loading positive). Regions with fewer than
+    `min_months` complete months get NaN throughout.
+    """
+    complete = ~np.isnan(cube).any(axis=2)
+    n = complete.sum(axis=1)
+    rows = np.where(complete[:, :, None], cube, np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(rows, axis=1)
+        std = np.nanstd(rows, axis=1)
+    # Same convention as StandardScaler: population std, constant columns left unscaled
+    std = np.where(std > 0, std, 1.0)
+    scaled = (cube - mean[:, None, :]) / std[:, None, :]
+    z = np.where(complete[:, :, None], scaled, 0.0)
+
+    _, _, vt = np.linalg.svd(z, full_matrices=False)
+    loadings = vt[:, 0, :]
+    largest = np.take_along_axis(loadings, np.abs(loadings).argmax(axis=1)[:, None], axis=1)
+    loadings *= np.where(largest < 0, -1.0, 1.0)
+
+    contributions = z * loadings[:, None, :]
+    scores = np.where(complete, contributions.sum(axis=2), np.nan)
+    fitted = n >= min_months
+    loadings[~fitted] = np.nan
+    scores[~fitted] = np.nan
+    return {"mean": mean, "scale": std, "loadings": loadings, "scores": scores,
+            "contributions": np.where(complete[:, :, None], contributions, np.nan), "months": n}
+
+
+@st.cache_data
+def _cached_panel(version):
+    regions, dates, cube = stack_panel(read_panel())
+    return {"regions": regions, "dates": dates, "inputs": CDI_FEATURES, **panel_pca(cube)}
+
+
+def load_panel():
+    return _cached_panel(data_version("data/*.csv"))
+
+
+@st.cache_data
+def _cached_region(region, version):
+    panel = _cached_panel(version)
+    r = panel["regions"].index(region)
+    frame = pd.DataFrame(panel["contributions"][r], columns=panel["inputs"])
+    frame.insert(0, 'Date', panel["dates"])
+    frame.insert(1, 'Index', panel["scores"][r])
+    return frame.dropna(subset=['Index']).reset_index(drop=True)
+
+
+def region_cdi(region):
+    """Date, Index and each input's contribution (scaled value x loading) for one region."""
+    return _cached_region(region, data_version("data/*.csv"))
+
+
+def latest_by_region():
+    """Latest scored month and CDI of every region."""
+    panel = load_panel()
+    scores = pd.DataFrame(panel["scores"], index=panel["regions"], columns=panel["dates"])
+    last = scores.apply(pd.Series.last_valid_index, axis=1)
+    table = pd.DataFrame({
+        "Latest Month": last,
+        "CDI": [scores.at[r, d] if pd.notna(d) else np.nan for r, d in last.items()],
+        "Complete Months": panel["months"],
+    }, index=pd.Index(panel["regions"], name=REGION_COLUMN))
+    return table.sort_values("CDI", ascending=False)
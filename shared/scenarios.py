@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from shared.index_series import INDEX_REGISTRY, evaluate_index
+
+# What-if scenarios for the PCA composite indices (CDI, Retail). A scenario is a percentage
+# change per input relative to a base month; it is pushed through the fitted scaler and
+# loadings in closed form, so no refit is needed and any number of scenarios is one product.
+
+GRID_SPAN = 10
+GRID_STEP = 1
+
+
+def scenario_scores(name, shocks, date=None):
+    """Index value for each row of `shocks` (percent change per input, missing columns = 0).
+
+    The base is the latest scored month, or `date`.
+    """
+    spec = INDEX_REGISTRY[name]
+    if spec["transform"] != "pca_composite":
+        raise ValueError(f"{name} is not a PCA composite index")
+    result = evaluate_index(name)
+    frame, model = result["frame"].sort_values('Date'), result["model"]
+    row = frame.iloc[-1] if date is None else frame[frame['Date'] == date].iloc[0]
+
+    base = row[spec["inputs"]].to_numpy(dtype=float)
+    pct = shocks.reindex(columns=spec["inputs"], fill_value=0).to_numpy(dtype=float) / 100
+    scaler, pca = model["scaler"], model["pca"]
+    z = (base * (1 + pct) - scaler.mean_) / scaler.scale_
+    scores = (z - pca.mean_) @ pca.components_[0]
+    if "train_range" in model:
+        lo, hi = model["train_range"]
+        scores = np.clip((scores - lo) / (hi - lo), 0, 1)
+    return scores
+
+
+def shock_grid(feature_a, feature_b, span=GRID_SPAN, step=GRID_STEP):
+    """Every combination of two features' shocks in [-span, span] percent."""
+    steps = np.arange(-span, span + step / 2, step)
+    a, b = np.meshgrid(steps, steps, indexing='ij')
+    return pd.DataFrame({feature_a: a.ravel(), feature_b: b.ravel()})
+
+
+def scenario_panel(name, key, scale=1.0, suffix=""):
+    """Scenario editor and two-feature shock heatmap, shared by the CDI and Retail pages."""
+    inputs = INDEX_REGISTRY[name]["inputs"]
+    base = scenario_scores(name, pd.DataFrame([{}]))[0]
+
+    st.markdown("Enter percentage changes to the latest month's inputs; each row is one scenario.")
+    editor = st.data_editor(
+        pd.DataFrame([{"Scenario": "Scenario 1", **{col: 0.0 for col in inputs}}]),
+        num_rows="dynamic", hide_index=True, use_container_width=True, key=f"{key}-editor",
+    )
+    shocks = editor[inputs].astype(float).fillna(0)
+    result = editor[["Scenario"]].copy()
+    result["Index"] = scenario_scores(name, shocks) * scale
+    result["Change"] = result["Index"] - base * scale
+    st.dataframe(result.style.format({"Index": f"{{:.2f}}{suffix}", "Change": f"{{:+.2f}}{suffix}"}),
+                 hide_index=True, use_container_width=True)
+
+    col_a, col_b = st.columns(2)
+    feature_a = col_a.selectbox("Shock feature (rows)", inputs, index=0, key=f"{key}-a")
+    feature_b = col_b.selectbox("Shock feature (columns)", [c for c in inputs if c != feature_a], key=f"{key}-b")
+    grid = shock_grid(feature_a, feature_b)
+    surface = scenario_scores(name, grid).reshape(-1, int(np.sqrt(len(grid)))) * scale
+    steps = np.unique(grid[feature_a])
+    fig = go.Figure(go.Heatmap(
+        z=surface, x=steps, y=steps, colorscale='Viridis',
+        hovertemplate=f"{feature_a} %{{y:+.0f}}%<br>{feature_b} %{{x:+.0f}}%<br>Index %{{z:.2f}}{suffix}<extra></extra>",
+    ))
+    fig.update_layout(
+        xaxis_title=f"{feature_b} change (%)",
+        yaxis_title=f"{feature_a} change (%)",
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font_color='white',
+        height=420,
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"Latest month: {base * scale:.2f}{suffix}. Scored with the fitted scaler and PCA loadings, without refitting.")
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.feature_store import data_version
+from shared.forecast_models import load_forecast_table
+
+# Trailing windows in quarters; None scores the full history
+SCORE_WINDOWS = {"All": None, "Last 4Q": 4, "Last 8Q": 8}
+GROUP_KEYS = ["Workbook", "Sheet", "Horizon"]
+
+
+def score_forecasts(table, windows=SCORE_WINDOWS):
+    """MAPE, RMSE, bias and directional hit-rate per sheet, horizon and trailing window.
+
+    All sheets are scored together: errors are computed column-wise on the tidy table
+    and reduced with a single groupby over (sheet, horizon, window).
+    """
+    df = table.copy()
+    prev_actual = df.groupby(["Workbook", "Sheet"], sort=False)["Actual"].shift(1)
+    df = df[df["Actual"].notna() & df["Predicted"].notna()].copy()
+    prev_actual = prev_actual[df.index]
+
+    err = df["Predicted"] - df["Actual"]
+    df["APE"] = (err.abs() / df["Actual"].abs()).replace(np.inf, np.nan) * 100
+    df["SE"] = err ** 2
+    df["Error"] = err
+    # Did the prediction call the quarter-on-quarter direction right?
+    hit = np.sign(df["Predicted"] - prev_actual) == np.sign(df["Actual"] - prev_actual)
+    df["Hit"] = hit.astype(float).where(prev_actual.notna())
+
+    # Position from the most recent scored quarter, so windows are a simple mask
+    age = df.groupby(GROUP_KEYS, sort=False).cumcount(ascending=False)
+    stacked = pd.concat(
+        [df[age < size].assign(Window=label) if size else df.assign(Window=label)
+         for label, size in windows.items()],
+        ignore_index=True,
+    )
+
+    scores = stacked.groupby(GROUP_KEYS + ["Window"], sort=False).agg(
+        Quarters=("Error", "size"),
+        MAPE=("APE", "mean"),
+        RMSE=("SE", "mean"),
+        Bias=("Error", "mean"),
+        HitRate=("Hit", "mean"),
+    ).reset_index()
+    scores["RMSE"] = np.sqrt(scores["RMSE"])
+    scores["HitRate"] = scores["HitRate"] * 100
+    return scores.rename(columns={"MAPE": "MAPE (%)", "HitRate": "Hit Rate (%)"})
+
+
+@st.cache_data
+def _cached_scores(version):
+    return score_forecasts(load_forecast_table())
+
+
+def load_scoreboard(window="All"):
+    """Cached scoreboard for the current workbook version, filtered to one window."""
+    scores = _cached_scores(data_version("data/*.xlsx"))
+    return scores[scores["Window"] == window].drop(columns="Window").reset_index(drop=True)
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from shared.derived import evaluate_graph, graph_inputs
+from shared.feature_store import data_version
+from shared.index_series import RENEWABLE_CONSTANTS, RENEWABLE_GRAPH, evaluate_index
+
+# Plausible range for each Readiness Score assumption. The blend is swept through W_BUDGET,
+# with W_SHARE = 1 - W_BUDGET so the score stays on [0, 1].
+PARAM_RANGES = {
+    "CF_SOLAR": (0.15, 0.25),
+    "CF_WIND": (0.25, 0.35),
+    "CF_HYDRO": (0.35, 0.45),
+    "W_BUDGET": (0.3, 0.7),
+}
+BAND_LEVELS = (5, 50, 95)
+
+
+def latin_hypercube(ranges, n, seed=0):
+    """n samples with exactly one in each of n equal strata along every parameter."""
+    rng = np.random.default_rng(seed)
+    strata = rng.permuted(np.tile(np.arange(n), (len(ranges), 1)), axis=1)
+    u = (strata + rng.random(strata.shape)) / n
+    lo, hi = np.array(list(ranges.values()), dtype=float).T
+    return dict(zip(ranges, lo[:, None] + u * (hi - lo)[:, None]))
+
+
+def parameter_grid(ranges, points):
+    axes = [np.linspace(lo, hi, points) for lo, hi in ranges.values()]
+    return {name: mesh.ravel() for name, mesh in zip(ranges, np.meshgrid(*axes, indexing='ij'))}
+
+
+def sweep_scores(frame, samples):
+    """Readiness Score for every parameter sample (rows) and month (columns).
+
+    Sampled constants enter the Renewable node graph as column vectors, so all samples are
+    evaluated in one broadcast pass; unsampled constants keep their defaults.
+    """
+    n = len(next(iter(samples.values())))
+    constants = {**RENEWABLE_CONSTANTS, **{name: np.asarray(v, dtype=float)[:, None] for name, v in samples.items()}}
+    if "W_BUDGET" in samples:
+        constants["W_SHARE"] = 1 - constants["W_BUDGET"]
+    inputs = {col: frame[col].to_numpy(dtype=float) for col in graph_inputs(RENEWABLE_GRAPH, constants)}
+    nodes, _ = evaluate_graph(RENEWABLE_GRAPH, inputs, constants, targets=['Readiness Score'], cache=False)
+    return np.broadcast_to(nodes['Readiness Score'], (n, len(frame)))
+
+
+def tornado(frame, ranges=PARAM_RANGES):
+    """Latest-month score with each parameter at the ends of its range, the others at default."""
+    names = list(ranges)
+    base = np.array([RENEWABLE_CONSTANTS[name] for name in names], dtype=float)
+    # Row 0 is the baseline, then a low and a high row per parameter
+    rows = np.tile(base, (2 * len(names) + 1, 1))
+    for i, name in enumerate(names):
+        rows[1 + 2 * i, i], rows[2 + 2 * i, i] = ranges[name]
+    latest = sweep_scores(frame, dict(zip(names, rows.T)))[:, -1]
+    table = pd.DataFrame({
+        "Parameter": names,
+        "Low": [ranges[name][0] for name in names],
+        "High": [ranges[name][1] for name in names],
+        "Low Score": latest[1::2],
+        "High Score": latest[2::2],
+    })
+    table["Base Score"] = latest[0]
+    table["Swing"] = (table["High Score"] - table["Low Score"]).abs()
+    return table.sort_values("Swing").reset_index(drop=True)
+
+
+def score_bands(frame, samples, levels=BAND_LEVELS):
+    lower, median, upper = np.percentile(sweep_scores(frame, samples), levels, axis=0)
+    return pd.DataFrame({"Date": frame['Date'].to_numpy(), "lower": lower, "median": median, "upper": upper})
+
+
+@st.cache_data
+def _cached_sensitivity(version, method, n_samples, seed):
+    frame = evaluate_index("Renewable Transition Readiness Score")["frame"].sort_values('Date')
+    if method == "grid":
+        points = max(2, int(round(n_samples ** (1 / len(PARAM_RANGES)))))
+        samples = parameter_grid(PARAM_RANGES, points)
+    else:
+        samples = latin_hypercube(PARAM_RANGES, n_samples, seed)
+    return {"tornado": tornado(frame), "bands": score_bands(frame, samples),
+            "n_samples": len(samples["CF_SOLAR"])}
+
+
+def load_renewable_sensitivity(method="lhs", n_samples=2000, seed=0):
+    """Tornado table and score bands over PARAM_RANGES, cached per data version."""
+    return _cached_sensitivity(data_version("data/*.csv"), method, n_samples, seed)
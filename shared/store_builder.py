@@ -0,0 +1,139 @@
+import os
+import pandas as pd
+from shared.feature_store import FEATURES, SOURCES, content_version
+from shared.index_series import INDEX_REGISTRY, compute_index
+from shared.changes import change_matrix
+from shared.composite import COMPOSITE_NAME, COMPOSITE_SCALE, composite_index
+from shared.ev_index import STATE_EV_FILE, ev_frames, penetration_cube
+from shared.forecasting import fit_forecasts
+from shared.mapped_store import (current_store, open_store, publish, published_key,
+                                 release_build_lock, store_key, store_object, try_build_lock)
+
+# Builds the shared memory-mapped store (shared/mapped_store.py): every index's scored
+# frame, imputation mask and fitted model, the change matrix, the composite, the EV
+# penetration cube and the index forecasts (fitted here in a process pool). evaluate_index serves the default monthly results from it, so every
+# page reads whichever version is current. The first server process to find no store for
+# the current data builds it; the others compute in-process until it is published, then
+# map it. Later versions are refreshed by the data watcher (shared/watcher.py), recomputing
+# only what a changed file feeds. Run as `python -m shared.store_builder` to build ahead of
+# the servers.
+
+BUILD_ATTEMPTS = 3  # builds in a row to try before leaving a still-changing data set to the next poll
+
+
+def affected_sources(paths):
+    """Sources whose monthly view reads a feature published in any of `paths`."""
+    changed = {source for source, path in SOURCES.items() if os.path.normpath(path) in map(os.path.normpath, paths)}
+    features = [columns for _, columns in FEATURES.values() if any(s in changed for s, _ in columns)]
+    return changed | {s for columns in features for s, _ in columns}
+
+
+def affected_indices(paths):
+    sources = affected_sources(paths)
+    return [name for name, spec in INDEX_REGISTRY.items() if spec["source"] in sources]
+
+
+def _series_frame(series):
+    return pd.DataFrame({"Date": series.index, "Index": series.to_numpy()})
+
+
+def collect_results(previous=None, stale=None, ev_stale=True):
+    """({name: frame}, {name: object}) of everything the store holds.
+
+    With a `previous` store, only the indices in `stale` (and the EV cube if `ev_stale`)
+    are recomputed; the rest are carried over from it. Indices are computed directly,
+    never read back through evaluate_index from the store being replaced.
+    """
+    reuse = previous is not None and stale is not None
+    frames, objects, series = {}, {}, {}
+    for name in INDEX_REGISTRY:
+        prefix = f"results/{name}"
+        model = store_object(previous, f"{prefix}/model") if reuse and name not in stale else None
+        if model is not None and f"{prefix}/frame" in previous["frames"]:
+            frames[f"{prefix}/frame"] = previous["frames"][f"{prefix}/frame"]
+            frames[f"{prefix}/mask"] = previous["frames"][f"{prefix}/mask"]
+            objects[f"{prefix}/model"] = model
+        else:
+            result = compute_index(name)
+            frames[f"{prefix}/frame"], frames[f"{prefix}/mask"] = result["frame"], result["mask"]
+            objects[f"{prefix}/model"] = result["model"]
+        frame = frames[f"{prefix}/frame"]
+        series[name] = pd.Series(frame['Index'].to_numpy(), index=pd.DatetimeIndex(frame['Date']))
+
+    composite, _ = composite_index(series)
+    frames[f"series/{COMPOSITE_NAME}"] = _series_frame(composite)
+    frames["changes"] = change_matrix(series, {name: spec["scale"] for name, spec in INDEX_REGISTRY.items()})
+    frames["composite changes"] = change_matrix({COMPOSITE_NAME: composite}, {COMPOSITE_NAME: COMPOSITE_SCALE})
+    if reuse and not ev_stale and "ev penetration" in previous["frames"]:
+        frames["ev penetration"] = previous["frames"]["ev penetration"]
+    else:
+        frames["ev penetration"] = penetration_cube(ev_frames())
+
+    if reuse and "forecasts" in previous["frames"]:
+        kept = previous["frames"]["forecasts"]
+        kept = kept[~kept["Index"].isin(stale)]
+        refit = {name: series[name] for name in INDEX_REGISTRY if name in stale}
+        if refit:
+            kept = pd.concat([kept, fit_forecasts(refit, n_jobs=None)], ignore_index=True)
+        frames["forecasts"] = kept
+    else:
+        frames["forecasts"] = fit_forecasts(series, n_jobs=None)
+    return frames, objects
+
+
+def _publish_current(incremental=True):
+    # The data is hashed again once the results are built: a file that changed mid-build
+    # may have been read at either version, so the build is repeated for the new contents
+    version = content_version("data/*.csv")
+    for _ in range(BUILD_ATTEMPTS):
+        previous = open_store(published_key()) if incremental and published_key() else None
+        if previous is None:
+            results = collect_results()
+        else:
+            changed = [path for path, digest in version if dict(previous["version"]).get(path) != digest]
+            changed += [path for path in dict(previous["version"]) if path not in dict(version)]
+            ev_stale = ("ev" in affected_sources(changed)
+                        or os.path.normpath(STATE_EV_FILE) in map(os.path.normpath, changed))
+            results = collect_results(previous, affected_indices(changed), ev_stale)
+        latest = content_version("data/*.csv")
+        if latest == version:
+            return publish(*results, version)
+        version = latest
+    return None
+
+
+def build_store():
+    """Compute and publish the store for the data as it is now; returns its key, or None if it kept changing."""
+    return _publish_current(incremental=False)
+
+
+def refresh_store():
+    """Publish a store for the data as it is now, recomputing only what changed since the last one.
+
+    Returns the new key, or None if the store is already current, another process is
+    building, or the data kept changing while it was built. The caller must not hold the
+    build lock.
+    """
+    if open_store(store_key()) is not None or not try_build_lock():
+        return None
+    try:
+        return _publish_current()
+    finally:
+        release_build_lock()
+
+
+def ensure_store():
+    """The mapped store for the current data, building it first if no other process is.
+
+    Returns the last published version while another process builds, or None if there is
+    none yet; callers then compute in-process.
+    """
+    store = current_store()
+    if store is None:
+        refresh_store()
+        store = current_store()
+    return store
+
+
+if __name__ == "__main__":
+    print(build_store())
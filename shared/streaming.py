@@ -0,0 +1,76 @@
+import numpy as np
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+
+# Running statistics for the PCA indices. Rows arrive in batches; each batch's count, mean
+# and centred cross-product matrix are merged into the running ones (Chan et al.), so the
+# scaler and the first component can be fitted without holding the input matrix.
+
+BATCH_ROWS = 50_000
+
+
+def init_moments(n_features):
+    return {"n": 0, "mean": np.zeros(n_features), "comoment": np.zeros((n_features, n_features))}
+
+
+def update_moments(moments, batch):
+    """`moments` with the complete rows of `batch` (rows x features) merged in."""
+    batch = np.asarray(batch, dtype=float)
+    batch = batch[~np.isnan(batch).any(axis=1)]
+    if not len(batch):
+        return moments
+    n_a, n_b = moments["n"], len(batch)
+    mean_b = batch.mean(axis=0)
+    centred = batch - mean_b
+    delta = mean_b - moments["mean"]
+    n = n_a + n_b
+    return {
+        "n": n,
+        "mean": moments["mean"] + delta * n_b / n,
+        "comoment": moments["comoment"] + centred.T @ centred + np.outer(delta, delta) * n_a * n_b / n,
+    }
+
+
+def moments_from_rows(rows, batch_rows=BATCH_ROWS):
+    """Moments of a (rows x features) array or of an iterable of batches."""
+    if isinstance(rows, np.ndarray) or hasattr(rows, "to_numpy"):
+        matrix = np.asarray(rows, dtype=float)
+        rows = (matrix[i:i + batch_rows] for i in range(0, len(matrix), batch_rows))
+    moments = None
+    for batch in rows:
+        batch = np.asarray(batch, dtype=float)
+        moments = update_moments(moments or init_moments(batch.shape[1]), batch)
+    return moments
+
+
+def pca_from_moments(moments, feature_names=None):
+    """(StandardScaler, PCA) fitted from running moments, interchangeable with fitting on the rows.
+
+    Standardising is by the population standard deviation, as StandardScaler does; the
+    first component is the leading eigenvector of the correlation matrix, signed like
+    sklearn's PCA (largest loading positive).
+    """
+    n, mean, comoment = moments["n"], moments["mean"], moments["comoment"]
+    var = np.diag(comoment) / n
+    scale = np.where(var > 0, np.sqrt(var), 1.0)
+    # Covariance of the standardised rows, as PCA estimates it (n - 1 denominator)
+    cov = comoment / np.outer(scale, scale) / (n - 1)
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    order = np.argsort(eigvals)[::-1]
+    eigvals, eigvecs = eigvals[order], eigvecs[:, order]
+    component = eigvecs[:, 0] * np.sign(eigvecs[np.argmax(np.abs(eigvecs[:, 0])), 0])
+
+    scaler = StandardScaler()
+    scaler.mean_, scaler.var_, scaler.scale_ = mean, var, scale
+    scaler.n_samples_seen_, scaler.n_features_in_ = n, len(mean)
+    pca = PCA(n_components=1)
+    pca.components_ = component[None, :]
+    pca.mean_ = np.zeros(len(mean))
+    pca.explained_variance_ = eigvals[:1]
+    pca.explained_variance_ratio_ = eigvals[:1] / eigvals.sum()
+    pca.singular_values_ = np.sqrt(eigvals[:1] * (n - 1))
+    pca.noise_variance_ = eigvals[1:].mean() if len(eigvals) > 1 else 0.0
+    pca.n_components_, pca.n_samples_, pca.n_features_in_ = 1, n, len(mean)
+    if feature_names is not None:
+        scaler.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    return scaler, pca
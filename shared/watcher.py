@@ -0,0 +1,52 @@
+import time
+import threading
+from shared.feature_store import content_version
+from shared.mapped_store import open_store, store_key
+from shared.store_builder import refresh_store
+
+# Background watcher on data/. A daemon thread in each server process polls the files'
+# mtimes and sizes, re-hashing only files whose stat changed (a touched but unchanged file
+# is not a change). When the contents differ from the published store, it rebuilds the
+# store off the request path, recomputing only the indices fed by the changed files, and
+# publishes it with an atomic swap (shared/mapped_store.py). Requests keep reading the
+# previous version while it rebuilds. Only one process rebuilds; the pages of every process
+# read index results through the store, so they all pick up the swap without warming any
+# per-process cache.
+
+WATCH_INTERVAL = 5  # seconds between polls
+_WATCHER = {"thread": None, "version": None, "last_error": None}
+_LOCK = threading.Lock()
+
+
+def check_once():
+    """Rebuild the store if the data changed since the last check; returns the new key or None."""
+    version = content_version("data/*.csv")
+    if version == _WATCHER["version"]:
+        return None
+    key = refresh_store()
+    # If another process holds the build lock, poll again until its version is published
+    if open_store(store_key(version)) is not None:
+        _WATCHER["version"] = version
+    return key
+
+
+def _watch(interval):
+    while True:
+        try:
+            check_once()
+            _WATCHER["last_error"] = None
+        except Exception as e:
+            # A half-written file fails to parse; the next poll retries once it is complete
+            _WATCHER["version"] = None
+            _WATCHER["last_error"] = e
+            print("Data watcher error:", e)
+        time.sleep(interval)
+
+
+def start_watcher(interval=WATCH_INTERVAL):
+    """Start this process's watcher thread, once; later calls are no-ops."""
+    with _LOCK:
+        if _WATCHER["thread"] is None or not _WATCHER["thread"].is_alive():
+            _WATCHER["thread"] = threading.Thread(target=_watch, args=(interval,), name="data-watcher", daemon=True)
+            _WATCHER["thread"].start()
+    return _WATCHER["thread"]
@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import shared.forecast_models as fm
+
+QUARTERS = 12
+
+
+def sheet_table(actuals, quarters=QUARTERS + 1):
+    # One sheet laid out like read_forecast_workbooks(), with the quarters past the actuals blank
+    actual = np.full(quarters, np.nan)
+    actual[:len(actuals)] = actuals
+    return pd.DataFrame({
+        "Workbook": "Synthetic", "Sheet": "Sheet",
+        "Quarter": [f"Q{q % 4 + 1} {2015 + q // 4}" for q in range(quarters)],
+        "Actual": actual, "Predicted": 1.0, "Horizon": 1, "Source": "workbook",
+    })
+
+
+@pytest.fixture(scope="module")
+def history():
+    rng = np.random.default_rng(0)
+    growth = 0.02 + 0.05 * np.sin(np.arange(QUARTERS) * np.pi / 2) + 0.01 * rng.normal(size=QUARTERS)
+    return 100 * np.exp(np.cumsum(growth))
+
+
+def test_walk_forward_predicts_each_quarter_from_earlier_quarters_only(history):
+    table, state = fm.train_forecast_models(sheet_table(history), n_jobs=1)
+
+    model = table["Source"] == "model"
+    assert model.sum() == QUARTERS + 1 - fm.MIN_TRAIN_QUARTERS
+    assert table.index[model].tolist() == list(range(fm.MIN_TRAIN_QUARTERS, QUARTERS + 1))
+    assert (table.loc[~model, "Predicted"] == 1.0).all()
+    assert np.isfinite(table.loc[model, "Predicted"]).all() and (table.loc[model, "Predicted"] > 0).all()
+    assert len(state[("Synthetic", "Sheet")]["preds"]) == QUARTERS - fm.MIN_TRAIN_QUARTERS
+
+    # A quarter's prediction is unchanged when the later actuals are not yet known
+    early, _ = fm.train_forecast_models(sheet_table(history[:10]), n_jobs=1)
+    np.testing.assert_allclose(early.loc[8:10, "Predicted"], table.loc[8:10, "Predicted"], rtol=1e-6)
+
+
+def test_training_resumes_from_the_saved_state(history, monkeypatch):
+    _, state = fm.train_forecast_models(sheet_table(history[:10]), n_jobs=1)
+    fresh, _ = fm.train_forecast_models(sheet_table(history), n_jobs=1)
+
+    # Resuming extends the saved models by warm start and append; nothing is fitted from scratch
+    fits = []
+    sarimax = fm._sarimax
+    monkeypatch.setattr(fm, "_sarimax", lambda values: fits.append(len(values)) or sarimax(values))
+    resumed, new_state = fm.train_forecast_models(sheet_table(history), state, n_jobs=1)
+
+    assert fits == []
+    assert len(new_state[("Synthetic", "Sheet")]["history"]) == QUARTERS
+    np.testing.assert_allclose(resumed["Predicted"], fresh["Predicted"], rtol=1e-6)
+
+
+def test_sheets_below_the_training_minimum_keep_the_workbook_values(history):
+    table, state = fm.train_forecast_models(sheet_table(history[:fm.MIN_TRAIN_QUARTERS - 1]), n_jobs=1)
+    assert (table["Source"] == "workbook").all() and state == {}
+
+
+def test_model_state_is_one_shared_resource():
+    assert fm._model_state() is fm._model_state()
@@ -0,0 +1,139 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+import pytest
+
+import shared.mapped_store as ms
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    # Each test gets its own store directory, process mappings and data version
+    monkeypatch.setattr(ms, "_MAPPED", {})
+    monkeypatch.setattr(ms, "_CURRENT_KEY", {"checked": None, "key": None})
+    monkeypatch.setattr(ms, "_LOCK_TOKEN", {})
+    monkeypatch.setattr(ms, "KEY_CHECK_INTERVAL", 0)
+    return str(tmp_path / "store")
+
+
+def version(n):
+    return (("data/a.csv", f"digest-{n}"),)
+
+
+def test_publish_round_trips_frames_and_objects(root):
+    frame = pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=4, freq="MS"),
+        "Index": [0.5, np.nan, -1.0, 2.0],
+        "Region": ["A", "B", None, "A"],
+        "Flag": [True, False, True, True],
+    }, index=[3, 5, 8, 9])
+    empty = pd.DataFrame(index=pd.RangeIndex(4))
+    model = {"weights": np.array([0.2, 0.8]), "name": "ratio"}
+
+    key = ms.publish({"frame": frame, "empty": empty}, {"model": model}, version(1), root=root)
+    store = ms.open_store(key, root)
+
+    assert key == ms.store_key(version(1)) == ms.published_key(root)
+    assert store["version"] == version(1)
+    mapped = store["frames"]["frame"]
+    pd.testing.assert_index_equal(mapped.index, frame.index, exact=False)
+    pd.testing.assert_series_equal(mapped["Date"], frame["Date"], check_series_type=False)
+    np.testing.assert_array_equal(mapped["Index"], frame["Index"])
+    assert mapped["Region"].tolist()[:2] == ["A", "B"] and pd.isna(mapped["Region"].iloc[2])
+    assert mapped["Flag"].tolist() == frame["Flag"].tolist()
+    assert store["frames"]["empty"].shape == (4, 0)
+
+    loaded = ms.store_object(store, "model")
+    np.testing.assert_array_equal(loaded["weights"], model["weights"])
+    assert loaded["name"] == "ratio"
+    assert ms.store_object(store, "model") is loaded
+
+
+def test_prune_keeps_the_current_version(root):
+    keys = [ms.publish({"f": pd.DataFrame({"x": [n]})}, {}, version(n), root=root) for n in range(3)]
+    assert sorted(e.name for e in os.scandir(root) if e.is_dir()) == sorted(keys[-ms.KEEP_VERSIONS:])
+
+    # The current version survives even when it is the oldest on disk
+    old = time.time() - 3600
+    os.utime(os.path.join(root, keys[-1]), (old, old))
+    ms._point_current(root, keys[-1])
+    ms._prune(root, keys[-1])
+    assert os.path.isdir(os.path.join(root, keys[-1]))
+    assert ms.open_store(ms.published_key(root), root)["frames"]["f"]["x"].tolist() == [2]
+
+
+def test_build_lock_is_exclusive(root):
+    assert ms.try_build_lock(root)
+    assert not ms.try_build_lock(root)
+    ms.release_build_lock(root)
+    assert ms.try_build_lock(root)
+    ms.release_build_lock(root)
+    assert not ms.build_in_progress(root)
+
+
+def test_stale_lock_is_taken_over_and_not_released_by_its_old_holder(root):
+    assert ms.try_build_lock(root)
+    lock = os.path.join(root, ms.LOCK_FILE)
+    old = time.time() - ms.LOCK_TIMEOUT - 1
+    os.utime(lock, (old, old))
+
+    stale_token = ms._LOCK_TOKEN.pop(root)
+    assert ms.try_build_lock(root)
+    new_token = ms._LOCK_TOKEN[root]
+
+    # The presumed-dead builder finishing late leaves the new holder's lock in place
+    ms._LOCK_TOKEN[root] = stale_token
+    ms.release_build_lock(root)
+    with open(lock) as f:
+        assert f.read() == new_token
+
+
+def test_stale_lock_replaced_during_takeover_is_put_back(root, monkeypatch):
+    os.makedirs(root)
+    lock = os.path.join(root, ms.LOCK_FILE)
+    with open(lock, "w") as f:
+        f.write("dead builder")
+    old = time.time() - ms.LOCK_TIMEOUT - 1
+    os.utime(lock, (old, old))
+
+    # Another process takes over the stale lock between this one's stat and its rename
+    rename = os.rename
+    def racing_rename(src, dst):
+        os.remove(lock)
+        with open(lock, "w") as f:
+            f.write("live builder")
+        rename(src, dst)
+    monkeypatch.setattr(ms.os, "rename", racing_rename)
+
+    assert not ms.try_build_lock(root)
+    with open(lock) as f:
+        assert f.read() == "live builder"
+    assert os.listdir(root) == [ms.LOCK_FILE]
+
+
+def test_current_store_keeps_the_published_mapping_while_a_build_runs(root, monkeypatch):
+    data = {"version": version(1)}
+    monkeypatch.setattr(ms, "content_version", lambda pattern="data/*": data["version"])
+    first = ms.publish({"f": pd.DataFrame({"x": [1]})}, {}, version(1), root=root)
+    served = ms.current_store(root)
+    assert served["key"] == first
+
+    # New data, build under way: the published mapping is served and kept, not re-mapped
+    data["version"] = version(2)
+    assert ms.try_build_lock(root)
+    assert ms.current_store(root) is served
+    assert ms.current_store(root) is served
+
+    second = ms.publish({"f": pd.DataFrame({"x": [2]})}, {}, version(2), root=root)
+    ms.release_build_lock(root)
+    assert ms.current_store(root)["key"] == second
+    assert list(ms._MAPPED) == [second]
+
+
+def test_current_key_is_reused_within_the_check_interval(root, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ms, "KEY_CHECK_INTERVAL", 60)
+    monkeypatch.setattr(ms, "content_version", lambda pattern="data/*": calls.append(1) or version(1))
+    assert ms.current_key() == ms.current_key() == ms.store_key(version(1))
+    assert len(calls) == 1
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+
+from shared.index_series import CDI_FEATURES
+from shared.panel import MIN_MONTHS, REGION_COLUMN, panel_pca, stack_panel
+
+
+def synthetic_panel(seed=0):
+    # Regions of different lengths and scales, with gaps; "C" has too few complete months
+    rng = np.random.default_rng(seed)
+    frames = []
+    for region, months, start, scale in [("A", 40, "2019-01-01", 1.0), ("B", 30, "2020-06-01", 50.0),
+                                         ("C", MIN_MONTHS - 2, "2021-01-01", 3.0)]:
+        factor = rng.normal(size=(months, 1))
+        values = scale * (factor @ rng.normal(size=(1, len(CDI_FEATURES))) + 0.3 * rng.normal(size=(months, len(CDI_FEATURES))))
+        frame = pd.DataFrame(values + rng.uniform(-100, 100, len(CDI_FEATURES)), columns=CDI_FEATURES)
+        frame.insert(0, 'Date', pd.date_range(start, periods=months, freq='MS'))
+        frame.insert(1, REGION_COLUMN, region)
+        frame.iloc[rng.choice(months, 3, replace=False), rng.integers(2, 2 + len(CDI_FEATURES))] = np.nan
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_panel_pca_matches_a_per_region_sklearn_fit():
+    frame = synthetic_panel()
+    regions, dates, cube = stack_panel(frame)
+    panel = panel_pca(cube)
+
+    for r, region in enumerate(regions):
+        rows = frame[frame[REGION_COLUMN] == region].dropna(subset=CDI_FEATURES).sort_values('Date')
+        scored = pd.Series(panel["scores"][r], index=dates).dropna()
+        if len(rows) < MIN_MONTHS:
+            assert scored.empty and np.isnan(panel["loadings"][r]).all()
+            continue
+
+        scaler = StandardScaler().fit(rows[CDI_FEATURES])
+        pca = PCA(n_components=1).fit(scaler.transform(rows[CDI_FEATURES]))
+        expected = pca.transform(scaler.transform(rows[CDI_FEATURES]))[:, 0]
+
+        assert panel["months"][r] == len(rows)
+        # Same sign convention as sklearn, so loadings and scores match without flipping
+        np.testing.assert_allclose(panel["loadings"][r], pca.components_[0], atol=1e-10)
+        np.testing.assert_allclose(panel["mean"][r], scaler.mean_, rtol=1e-12)
+        np.testing.assert_allclose(panel["scale"][r], scaler.scale_, rtol=1e-12)
+        pd.testing.assert_index_equal(scored.index, pd.DatetimeIndex(rows['Date']), check_names=False)
+        np.testing.assert_allclose(scored.to_numpy(), expected, atol=1e-10)
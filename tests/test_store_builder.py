@@ -0,0 +1,98 @@
+import shutil
+import numpy as np
+import pytest
+
+import shared.mapped_store as ms
+import shared.store_builder as sb
+import shared.watcher as watcher
+from shared.feature_store import SOURCES, content_version
+from shared.index_series import compute_index
+
+RETAIL = "Retail Health Index"
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    # A private copy of data/ with its own store; the copies get fresh mtimes, so no cache
+    # keyed on the repository's files is reused
+    shutil.copytree("data", tmp_path / "data", copy_function=shutil.copy)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(ms, "_MAPPED", {})
+    monkeypatch.setattr(ms, "_CURRENT_KEY", {"checked": None, "key": None})
+    monkeypatch.setattr(ms, "_LOCK_TOKEN", {})
+    monkeypatch.setattr(ms, "KEY_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(watcher, "_WATCHER", {"thread": None, "version": None, "last_error": None})
+    return tmp_path / "data"
+
+
+def edit_retail():
+    path = SOURCES["retail"]
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+    with open(path, "w", encoding="utf-8-sig") as f:
+        f.write(text.replace("98.05", "90.00", 1))
+
+
+def stored_index(name):
+    store = ms.open_store(ms.published_key())
+    return np.asarray(store["frames"][f"results/{name}/frame"]["Index"])
+
+
+def test_data_changed_mid_build_is_rebuilt_under_the_new_key(data_dir, monkeypatch):
+    collect, builds = sb.collect_results, []
+
+    def racing_collect(*args, **kwargs):
+        results = collect(*args, **kwargs)
+        if not builds:
+            edit_retail()
+        builds.append(args)
+        return results
+    monkeypatch.setattr(sb, "collect_results", racing_collect)
+
+    key = sb.refresh_store()
+    assert len(builds) == 2
+    assert key == ms.published_key() == ms.store_key(content_version("data/*.csv"))
+    np.testing.assert_allclose(stored_index(RETAIL), compute_index(RETAIL)["frame"]["Index"])
+
+
+def test_data_that_keeps_changing_is_left_to_the_next_poll(data_dir, monkeypatch):
+    collect = sb.collect_results
+
+    def churning_collect(*args, **kwargs):
+        results = collect(*args, **kwargs)
+        with open(SOURCES["imp"], "a") as f:
+            f.write("\n")
+        return results
+    monkeypatch.setattr(sb, "collect_results", churning_collect)
+
+    assert sb.refresh_store() is None
+    assert ms.published_key() is None
+    assert not ms.build_in_progress()
+
+
+def test_incremental_rebuild_reuses_unaffected_indices(data_dir, monkeypatch):
+    sb.build_store()
+    before = {name: stored_index(name) for name in sb.INDEX_REGISTRY}
+
+    computed = []
+    monkeypatch.setattr(sb, "compute_index", lambda name: computed.append(name) or compute_index(name))
+    edit_retail()
+    sb.refresh_store()
+
+    assert sorted(computed) == sorted(sb.affected_indices([SOURCES["retail"]]))
+    assert RETAIL in computed and "IMP Index" not in computed
+    for name in sb.INDEX_REGISTRY:
+        if name not in computed:
+            np.testing.assert_array_equal(stored_index(name), before[name])
+    assert not np.allclose(stored_index(RETAIL), before[RETAIL], equal_nan=True)
+
+
+def test_check_once_publishes_each_new_version_once(data_dir):
+    first = watcher.check_once()
+    assert first == ms.published_key()
+    assert watcher.check_once() is None
+
+    edit_retail()
+    second = watcher.check_once()
+    assert second not in (None, first) and second == ms.published_key()
+    assert watcher._WATCHER["thread"] is None
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.index_series import INDEX_REGISTRY, evaluate_index, prepared_view, stream_index
+
+PCA_INDICES = ["Consumer Demand Index (CDI)", "Retail Health Index"]
+CHUNK_SIZES = [1, 7, 25, 100_000]
+
+
+def assert_agrees_on_scored_rows(streamed, expected):
+    # The file's incomplete rows are not scored; every row that is matches the in-memory fit
+    expected = expected.set_index('Date')['Index']
+    assert streamed['Date'].isin(expected.index).all()
+    np.testing.assert_allclose(streamed['Index'], expected.loc[streamed['Date']], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize("chunk_rows", CHUNK_SIZES)
+def test_stream_index_reads_the_source_file_and_matches_evaluate_index(chunk_rows):
+    streamed = pd.concat(stream_index(PCA_INDICES[1], chunk_rows=chunk_rows), ignore_index=True)
+    assert len(streamed) > 0
+    assert_agrees_on_scored_rows(streamed, evaluate_index(PCA_INDICES[1])["frame"])
+
+
+@pytest.mark.parametrize("chunk_rows", CHUNK_SIZES)
+def test_stream_index_file_matches_evaluate_index_given_the_stores_shared_features(tmp_path, chunk_rows):
+    # The store takes the CDI's UPI and power consumption from the Retail and Renewable
+    # files; the CDI file's own copies differ in a few months, and so do the scores
+    name, source = PCA_INDICES[0], "data/Consumer_Demand_Index.csv"
+    expected = evaluate_index(name)["frame"]
+    published = pd.concat(stream_index(name, source, chunk_rows=chunk_rows), ignore_index=True)
+    assert not np.allclose(published['Index'], expected.set_index('Date')['Index'].loc[published['Date']])
+
+    view, _ = prepared_view(INDEX_REGISTRY[name])
+    raw = pd.read_csv(source)
+    for col in ['UPI Transactions', 'Power Consumption']:
+        raw[col] = view[col].to_numpy()
+    path = tmp_path / "cdi.csv"
+    raw.to_csv(path, index=False)
+    streamed = pd.concat(stream_index(name, str(path), chunk_rows=chunk_rows), ignore_index=True)
+    assert len(streamed) == len(expected)
+    assert_agrees_on_scored_rows(streamed, expected)
+
+
+def test_stream_index_scores_a_file_with_region_keys(tmp_path):
+    # The same national file stacked for two regions scores each region identically
+    raw = pd.read_csv("data/Consumer_Demand_Index.csv")
+    path = tmp_path / "panel.csv"
+    pd.concat([raw.assign(State=s) for s in ["A", "B"]]).to_csv(path, index=False)
+    single = pd.concat(stream_index(PCA_INDICES[0], "data/Consumer_Demand_Index.csv", chunk_rows=10))
+    panel = pd.concat(stream_index(PCA_INDICES[0], str(path), chunk_rows=10, keys=("State",)))
+
+    for _, region in panel.groupby("State"):
+        # Stacking doubles every row, which leaves the standardised loadings unchanged
+        np.testing.assert_allclose(region['Index'].to_numpy(), single['Index'].to_numpy(), atol=1e-12)
+
+
+def test_stream_index_rejects_non_pca_indices():
+    with pytest.raises(ValueError):
+        next(stream_index("IMP Index"))
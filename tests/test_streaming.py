@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.decomposition import PCA
+from sklearn.preprocessing import StandardScaler
+
+import shared.feature_store as feature_store
+from shared.streaming import moments_from_rows, pca_from_moments
+
+
+@pytest.fixture
+def daily_renewable(tmp_path, monkeypatch):
+    """A daily file laid out like Renewable_Energy.csv, with a few gaps, as the renewable source."""
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2023-01-01", "2023-12-31", freq="D")
+    frame = pd.DataFrame({
+        "Date": dates.strftime("%m/%d/%Y"),
+        "Solar power plants Installed capacity": np.cumsum(rng.uniform(0, 5, len(dates))),
+        "Wind power plants Installed capacity": np.cumsum(rng.uniform(0, 3, len(dates))),
+        "Hydro power plants Installed capacity": np.cumsum(rng.uniform(0, 1, len(dates))),
+        "Budgetary allocation for MNRE sector ": rng.uniform(0, 1, len(dates)),
+        "Power Consumption": rng.uniform(2, 4, len(dates)),
+    })
+    frame.iloc[rng.choice(len(frame), 20, replace=False), 5] = np.nan
+    path = tmp_path / "renewable.csv"
+    frame.to_csv(path, index=False)
+    monkeypatch.setitem(feature_store.SOURCES, "renewable", str(path))
+    return frame
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 13, 45, 1000])
+def test_chunked_rollups_match_whole_file(daily_renewable, chunk_rows):
+    # 13 and 45 put chunk boundaries inside months, weeks and quarters
+    expected = feature_store.stream_rollups("renewable", chunk_rows=10_000)
+    rolled = feature_store.stream_rollups("renewable", chunk_rows=chunk_rows)
+    for freq, frame in expected.items():
+        pd.testing.assert_frame_equal(rolled[freq], frame, check_freq=False)
+
+
+def test_rollups_match_resample(daily_renewable):
+    frame = daily_renewable.assign(Date=pd.to_datetime(daily_renewable["Date"])).set_index("Date")
+    frame.columns = frame.columns.str.strip()
+    monthly = feature_store.stream_rollups("renewable", chunk_rows=13)["MS"]
+    groups = frame.resample("MS")
+
+    np.testing.assert_allclose(monthly["Power Consumption"], groups["Power Consumption"].sum())
+    np.testing.assert_allclose(monthly["Solar power plants Installed capacity"],
+                               groups["Solar power plants Installed capacity"].last())
+    np.testing.assert_allclose(monthly["Budgetary allocation for MNRE sector"],
+                               groups["Budgetary allocation for MNRE sector"].mean())
+    # Every day of the year is present, so each month holds all of its hours
+    np.testing.assert_allclose(monthly["Period Hours"], feature_store.period_hours(monthly.index))
+
+
+def test_weekly_grain_of_monthly_file_keeps_month_hours(tmp_path, monkeypatch):
+    dates = pd.date_range("2023-01-01", periods=12, freq="MS")
+    path = tmp_path / "monthly.csv"
+    pd.DataFrame({"Date": dates.strftime("%m/%d/%Y"), "Power Consumption": 100.0}).to_csv(path, index=False)
+    monkeypatch.setitem(feature_store.SOURCES, "renewable", str(path))
+    weekly = feature_store.stream_rollups("renewable", freqs=("W-MON",), chunk_rows=5)["W-MON"]
+    np.testing.assert_allclose(weekly["Period Hours"], feature_store.period_hours(dates))
+
+
+@pytest.mark.parametrize("batch_rows", [1, 7, 50, 10_000])
+def test_moments_pca_matches_sklearn(batch_rows):
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(500, 5)) @ rng.normal(size=(5, 5)) + rng.normal(size=5) * 10
+    scaler, pca = pca_from_moments(moments_from_rows(X, batch_rows))
+    ref_scaler = StandardScaler().fit(X)
+    ref_pca = PCA(n_components=1).fit(ref_scaler.transform(X))
+
+    np.testing.assert_allclose(scaler.mean_, ref_scaler.mean_, rtol=1e-12)
+    np.testing.assert_allclose(scaler.scale_, ref_scaler.scale_, rtol=1e-12)
+    np.testing.assert_allclose(pca.components_, ref_pca.components_, atol=1e-10)
+    np.testing.assert_allclose(pca.transform(scaler.transform(X)),
+                               ref_pca.transform(ref_scaler.transform(X)), atol=1e-9)
+
+
+def test_moments_skip_incomplete_rows():
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(200, 3))
+    X[::9, 1] = np.nan
+    complete = X[~np.isnan(X).any(axis=1)]
+    moments = moments_from_rows(X, 17)
+    assert moments["n"] == len(complete)
+    np.testing.assert_allclose(moments["mean"], complete.mean(axis=0))
+    np.testing.assert_allclose(moments["comoment"] / (moments["n"] - 1), np.cov(complete, rowvar=False))